@@ -1,12 +1,35 @@
 import socketio
 import cv2
-import base64
+import struct
+import sys
 import numpy as np
 
 # ⚠️ CHANGE THIS to the local IP address of the laptop running the game
 # Example: 'http://192.168.1.5:5000'
 SERVER_URL = 'http://localhost:5000'
 
+# Display mode:  'video' = full JPEG frames  |  'pose' = skeleton only
+# (pose costs a few hundred bytes per frame instead of tens of kilobytes)
+# Run with:  python Motion_tracking.py pose
+VIEW_MODE = sys.argv[1] if len(sys.argv) > 1 else 'video'
+
+# Skeleton canvas size for 'pose' mode
+CANVAS_W, CANVAS_H = 960, 720
+
+# Must match backend/streaming/pose.py (POSE_STREAM_SCALE in config.py)
+POSE_STREAM_SCALE = 10000
+POSE_HEADER = struct.Struct('<IBB')
+
+# MediaPipe 33-joint skeleton edges (face outline skipped)
+POSE_CONNECTIONS = [
+    (11, 12), (11, 13), (13, 15), (12, 14), (14, 16),          # shoulders + arms
+    (15, 17), (15, 19), (15, 21), (16, 18), (16, 20), (16, 22),  # hands
+    (11, 23), (12, 24), (23, 24),                                # torso
+    (23, 25), (25, 27), (27, 29), (29, 31), (27, 31),            # left leg
+    (24, 26), (26, 28), (28, 30), (30, 32), (28, 32),            # right leg
+    (0, 7), (0, 8),                                              # head
+]
+
 print(f"📡 INITIALIZING SECURE LINK TO {SERVER_URL}...")
 
 # Initialize the Socket.IO client
@@ -14,7 +37,13 @@ sio = socketio.Client()
 
 @sio.event
 def connect():
-    print("✅ NEURAL LINK ESTABLISHED. INTERCEPTING VIDEO FEED...")
+    if VIEW_MODE == 'pose':
+        print("✅ NEURAL LINK ESTABLISHED. INTERCEPTING SKELETON FEED...")
+        sio.emit('subscribe_pose')
+    else:
+        print("✅ NEURAL LINK ESTABLISHED. INTERCEPTING VIDEO FEED...")
+        # The server only encodes video while at least one viewer is subscribed
+        sio.emit('subscribe_video')
 
 @sio.event
 def disconnect():
@@ -23,27 +52,65 @@ def disconnect():
 @sio.on('video_frame')
 def on_video_frame(data):
     try:
-        # 1. Decode the Base64 text string back into raw bytes
-        img_bytes = base64.b64decode(data)
+        # 1. The payload is a binary attachment holding raw JPEG bytes
+        np_arr = np.frombuffer(data, np.uint8)
         
-        # 2. Convert bytes to a numpy array
-        np_arr = np.frombuffer(img_bytes, np.uint8)
-        
-        # 3. Decode the array into an OpenCV image
+        # 2. Decode the array into an OpenCV image
         frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
 
-        # 4. Display the image
+        # 3. Display the image
         cv2.imshow("RAW TELEMETRY", frame)
         
-        # Press 'ESC' or 'q' to close the window
-        key = cv2.waitKey(1) & 0xFF
-        if key == 27 or key == ord('q'):
-            sio.disconnect()
-            cv2.destroyAllWindows()
+        _handle_keys()
             
     except Exception as e:
         print(f"Error decoding frame: {e}")
 
+    # Acknowledge the frame — the server uses ack latency to pick our
+    # quality / frame rate, so a slow display never backs up the stream
+    return True
+
+# Reused canvas — cleared every packet instead of re-allocated
+_canvas = np.zeros((CANVAS_H, CANVAS_W, 3), np.uint8)
+
+@sio.on('pose_stream')
+def on_pose_stream(data):
+    """Reference renderer: decodes the int16 skeleton packet and draws it."""
+    try:
+        _seq, n, _flags = POSE_HEADER.unpack_from(data)
+        _canvas[:] = 0
+
+        if n:
+            values = struct.unpack_from(f'<{n * 3}h{n}B', data, POSE_HEADER.size)
+            pts = [
+                (int(values[i * 3] / POSE_STREAM_SCALE * CANVAS_W),
+                 int(values[i * 3 + 1] / POSE_STREAM_SCALE * CANVAS_H))
+                for i in range(n)
+            ]
+            vis = values[n * 3:]
+            for a, b in POSE_CONNECTIONS:
+                if a < n and b < n and vis[a] > 127 and vis[b] > 127:
+                    cv2.line(_canvas, pts[a], pts[b], (255, 255, 0), 6, cv2.LINE_AA)
+            for i, p in enumerate(pts):
+                if vis[i] > 127:
+                    cv2.circle(_canvas, p, 7, (0, 255, 136), -1, cv2.LINE_AA)
+        else:
+            cv2.putText(_canvas, "NO PLAYER", (CANVAS_W // 2 - 120, CANVAS_H // 2),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 2)
+
+        cv2.imshow("RAW TELEMETRY", _canvas)
+        _handle_keys()
+
+    except Exception as e:
+        print(f"Error decoding pose: {e}")
+
+def _handle_keys():
+    # Press 'ESC' or 'q' to close the window
+    key = cv2.waitKey(1) & 0xFF
+    if key == 27 or key == ord('q'):
+        sio.disconnect()
+        cv2.destroyAllWindows()
+
 if __name__ == '__main__':
     try:
         # Create a named window and force it to be FULLSCREEN
@@ -56,4 +123,4 @@ if __name__ == '__main__':
         # Keep the script running and listening for frames
         sio.wait()
     except Exception as e:
-        print(f"❌ Failed to connect to server: {e}")
\ No newline at end of file
+        print(f"❌ Failed to connect to server: {e}")
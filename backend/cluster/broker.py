@@ -0,0 +1,100 @@
+# =============================================================================
+#  broker.py  —  Minimal pub/sub message queue over a Unix socket
+#
+#  In-repo stand-in for Redis when scaling server.py out to several worker
+#  processes on one machine.  Every frame a client sends is fanned out to all
+#  connected clients (the sender included — socketio.PubSubManager drops its
+#  own messages by host_id).
+#
+#  Frame format:  uint32 big-endian length | payload (UTF-8 JSON)
+#
+#  The broker runs on plain threads inside cluster/run.py; it is not imported
+#  by the (monkey-patched) workers, which only use read_frame / write_frame.
+# =============================================================================
+import os
+import socket
+import struct
+import threading
+
+_LEN = struct.Struct('>I')
+MAX_FRAME = 16 * 1024 * 1024  # a JPEG spectator frame is ~30 KB; anything this big is a bug
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError('peer closed')
+        buf += chunk
+    return bytes(buf)
+
+
+def read_frame(sock):
+    (n,) = _LEN.unpack(_recv_exact(sock, _LEN.size))
+    if n > MAX_FRAME:
+        raise ConnectionError(f'frame too large ({n} bytes)')
+    return _recv_exact(sock, n)
+
+
+def write_frame(sock, payload):
+    sock.sendall(_LEN.pack(len(payload)) + payload)
+
+
+class Broker:
+    """Accepts clients on `path` and relays every frame to all of them."""
+
+    def __init__(self, path):
+        self.path = path
+        self._clients = {}  # socket → send lock
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            os.unlink(path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen(64)
+
+    def start(self):
+        threading.Thread(target=self._accept_loop, name='mq-accept', daemon=True).start()
+        return self
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return  # closed
+            with self._lock:
+                self._clients[conn] = threading.Lock()
+            threading.Thread(target=self._client_loop, args=(conn,), name='mq-client',
+                             daemon=True).start()
+
+    def _client_loop(self, conn):
+        try:
+            while True:
+                self._fan_out(read_frame(conn))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self._lock:
+                self._clients.pop(conn, None)
+            conn.close()
+
+    def _fan_out(self, payload):
+        with self._lock:
+            targets = list(self._clients.items())
+        for conn, send_lock in targets:
+            try:
+                with send_lock:
+                    write_frame(conn, payload)
+            except OSError:
+                pass  # its reader thread will notice and clean up
+
+    def close(self):
+        self._server.close()
+        with self._lock:
+            for conn in self._clients:
+                conn.close()
+            self._clients.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
@@ -0,0 +1,120 @@
+# =============================================================================
+#  manager.py  —  Socket.IO client managers for multi-process server.py
+#
+#  A client manager relays emits / room changes / ack callbacks between the
+#  worker processes, so `sio.emit('telemetry', ..., room='telemetry')` in the
+#  pipeline-owning worker reaches clients connected to every worker.
+#
+#      MESSAGE_QUEUE = 'redis://localhost:6379/0'   → socketio.RedisManager
+#      MESSAGE_QUEUE = 'unix:///tmp/motionlink.sock' → UnixSocketManager
+#                                                     (cluster/broker.py)
+#
+#  Both also carry "commands": small {name, payload} messages that are not
+#  Socket.IO emits, e.g. a worker forwarding 'recalibrate' to the process
+#  that owns the trackers.  They reuse the queue channel with their own
+#  method name, which stock PubSubManager listeners ignore.
+# =============================================================================
+import json
+import logging
+import socket
+import threading
+import time
+
+import socketio
+
+from cluster.broker import read_frame, write_frame
+
+log = logging.getLogger(__name__)
+
+COMMAND_METHOD = 'motion_command'
+
+
+class _CommandMixin:
+    """Adds send_command() / on_command to a socketio.PubSubManager subclass."""
+
+    on_command = None  # callable(name, payload), set by server.py
+
+    def send_command(self, name, payload=None):
+        self._publish({'method': COMMAND_METHOD, 'name': name, 'payload': payload,
+                       'host_id': self.host_id})
+
+    def _listen(self):
+        for message in super()._listen():
+            data = message
+            if not isinstance(data, dict):
+                try:
+                    data = json.loads(message)
+                except (TypeError, ValueError):
+                    yield message
+                    continue
+            if isinstance(data, dict) and data.get('method') == COMMAND_METHOD:
+                if data.get('host_id') != self.host_id and self.on_command is not None:
+                    try:
+                        self.on_command(data.get('name'), data.get('payload'))
+                    except Exception as e:
+                        log.warning(f"⚠️  [CLUSTER] Command {data.get('name')!r} failed: {e}")
+                continue
+            yield data
+
+
+class _UnixSocketManager(socketio.PubSubManager):
+    """PubSubManager over the Unix-socket broker (reconnects if the broker restarts)."""
+
+    name = 'unix'
+
+    def __init__(self, url, channel='socketio', write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.path = url[len('unix://'):]
+        self._pub_sock = None
+        self._pub_lock = threading.Lock()  # green lock once monkey-patched
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.path)
+        return sock
+
+    def _publish(self, data):
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        with self._pub_lock:
+            for attempt in (1, 2):
+                try:
+                    if self._pub_sock is None:
+                        self._pub_sock = self._connect()
+                    write_frame(self._pub_sock, payload)
+                    return
+                except OSError:
+                    if self._pub_sock is not None:
+                        self._pub_sock.close()
+                    self._pub_sock = None
+                    if attempt == 2:
+                        raise
+
+    def _listen(self):
+        while True:
+            try:
+                sock = self._connect()
+            except OSError:
+                time.sleep(1.0)
+                continue
+            try:
+                while True:
+                    yield read_frame(sock)
+            except (ConnectionError, OSError):
+                sock.close()
+                time.sleep(0.5)
+
+
+class UnixSocketManager(_CommandMixin, _UnixSocketManager):
+    pass
+
+
+class RedisCommandManager(_CommandMixin, socketio.RedisManager):
+    pass
+
+
+def make_client_manager(url):
+    if url.startswith('unix://'):
+        return UnixSocketManager(url)
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisCommandManager(url)
+    raise ValueError(f"Unsupported MESSAGE_QUEUE url: {url!r} (expected unix:// or redis://)")
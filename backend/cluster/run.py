@@ -0,0 +1,83 @@
+# =============================================================================
+#  run.py  —  Launch server.py as several worker processes
+#
+#      cd backend
+#      python -m cluster.run                    # CLUSTER_WORKERS, MESSAGE_QUEUE
+#      python -m cluster.run --workers 8 --queue redis://localhost:6379/0
+#
+#  All workers listen on SERVER_PORT (SO_REUSEPORT) and share emits through
+#  the message queue.  Worker 0 is the primary: it opens the camera, runs the
+#  pose pipeline and owns the trackers; the others serve sockets, questions,
+#  sessions and the leaderboard.  For a unix:// queue the broker runs inside
+#  this launcher.  Clients must use the websocket transport (the frontend
+#  does by default) — long-polling is not sticky across workers.
+# =============================================================================
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from config import CLUSTER_WORKERS, MESSAGE_QUEUE, SERVER_PORT
+from cluster.broker import Broker
+
+
+def spawn_worker(index, queue):
+    env = dict(os.environ, MOTION_WORKER_INDEX=str(index), MOTION_MESSAGE_QUEUE=queue)
+    return subprocess.Popen([sys.executable, os.path.join(BACKEND_DIR, 'server.py')],
+                            cwd=BACKEND_DIR, env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run server.py as a multi-process cluster.')
+    parser.add_argument('--workers', type=int, default=CLUSTER_WORKERS)
+    parser.add_argument('--queue', default=MESSAGE_QUEUE,
+                        help='unix:///path/to.sock (built-in broker) or redis://host:port/db')
+    args = parser.parse_args()
+
+    broker = None
+    if args.queue.startswith('unix://'):
+        broker = Broker(args.queue[len('unix://'):]).start()
+        print(f"✅ [CLUSTER] Broker listening on {args.queue}")
+
+    workers = []
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        for i in range(max(1, args.workers)):
+            workers.append(spawn_worker(i, args.queue))
+        print(f"✅ [CLUSTER] {len(workers)} workers on port {SERVER_PORT} (primary pid {workers[0].pid})")
+
+        while not stopping:
+            for i, proc in enumerate(workers):
+                if proc.poll() is not None:
+                    print(f"⚠️  [CLUSTER] Worker {i} exited ({proc.returncode}); restarting")
+                    workers[i] = spawn_worker(i, args.queue)
+            time.sleep(1.0)
+    finally:
+        print("🛑 [CLUSTER] Stopping workers...")
+        for proc in workers:
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in workers:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if broker is not None:
+            broker.close()
+
+
+if __name__ == '__main__':
+    main()
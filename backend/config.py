@@ -38,10 +38,15 @@ MOMENTUM_DECAY     = 0.92   # Multiplicative friction when not bouncing
 
 # Auto-calibration clamps for the computed BOUNCE_THRESHOLD
 CALIB_FRAMES_NEEDED     = 60     # Number of frames to sample noise
-CALIB_NOISE_MULTIPLIER  = 1.5    # Scale factor applied to max observed noise
+CALIB_NOISE_SIGMAS      = 3.0    # Robust "max" noise = median + SIGMAS × (1.4826 × MAD)
+CALIB_NOISE_MULTIPLIER  = 1.5    # Scale factor applied to that robust noise ceiling
 CALIB_THRESHOLD_MIN     = 0.0015 # Hard floor for calibrated threshold
 CALIB_THRESHOLD_MAX     = 0.01   # Hard ceiling for calibrated threshold
 
+# Background recalibration while playing (idle frames only)
+CALIB_BACKGROUND_FRAMES = 300    # Idle frames per refinement window (0 = off)
+CALIB_BACKGROUND_BLEND  = 0.25   # Weight of each new window's threshold
+
 
 # ─── 5. ARM DETECTION  (Gesture / answer selection) ──────────────────────────
 # Used inside gesture_detection.calculate_arm_angle()
@@ -49,13 +54,33 @@ ARM_LIFT_OFFSET       = 0.4    # Shifts T-pose (diff ≈ 0) to ~90 °
 ARM_DEADZONE          = 0.30   # lift_raw below this → angle reported as 0
 ARM_ANGLE_MULTIPLIER  = 240    # Scales the normalised lift to degrees (0-180)
 
+# Server-side quiz answers (motion_logic/answer_gesture.py → 'answer_gesture')
+ANSWER_ARM_THRESHOLD     = 60    # Arm angle (°) that counts as raised
+ANSWER_RELEASE_THRESHOLD = 40    # Both arms below this re-arm the recognizer
+ANSWER_MIN_CONFIDENCE    = 0.5   # Minimum arm confidence for a raise to count
+ANSWER_DWELL             = 0.25  # Seconds an arm must stay raised
+
+# Confidence gating (motion_logic/landmark_filter.py)
+LANDMARK_MIN_VISIBILITY = 0.5  # Joints scoring below this hold their last good value
+LANDMARK_HOLD_DECAY     = 0.85 # Per-frame confidence decay of a held joint
+
 
 # ─── 6. SERVER / CAMERA ───────────────────────────────────────────────────────
 SERVER_HOST        = ''       # Bind to all interfaces
 SERVER_PORT        = 5000
 CAMERA_INDEX       = 0        # OpenCV VideoCapture index (0 = default webcam)
 LOOP_SLEEP         = 0.03     # Seconds between game-loop ticks (~33 fps cap)
+MIRROR_INPUT       = True     # Selfie view: mirror landmarks (x → 1-x, L/R swapped)
 CALIB_PROGRESS_FRAMES = 60   # Denominator for calib progress 0.0 → 1.0
+LEADERBOARD_FILE   = 'leaderboard.json'  # Relative to backend/ (absolute paths allowed)
+
+# 'camera' = webcam + MediaPipe; 'synthetic' = vision/synthetic.py generated
+# poses, no camera or model needed (load tests, CI, headless dev boxes)
+FRAME_SOURCE       = 'camera'
+SYNTHETIC_FPS      = 30       # Frame rate of the synthetic source
+# Looped motion script for the synthetic source (grammar: vision/synthetic.py)
+SYNTHETIC_SCRIPT   = ('idle:4, walk:8@120, lean_left:2, walk:4@150, lean_right:2, '
+                      'idle:2, raise_right:1.5, idle:1, raise_left:1.5, occlude:1@player')
 
 
 # ─── 7. DEVELOPER MODE ────────────────────────────────────────────────────────
@@ -65,3 +90,144 @@ CALIB_PROGRESS_FRAMES = 60   # Denominator for calib progress 0.0 → 1.0
 #
 # ✅ To go back to live AI questions:  set DEV_SKIP_AI_QUESTIONS = False
 DEV_SKIP_AI_QUESTIONS = False
+
+
+# ─── 8. VISION PIPELINE  (ROI cropping before pose inference) ────────────────
+# After the first detection the detector only sees a padded box around the
+# previous pose, downscaled so its longest side is ROI_INFERENCE_SIZE pixels.
+# The detector runs in IMAGE mode while cropping (see vision/pipeline.py).
+ROI_ENABLED         = True
+ROI_INFERENCE_SIZE  = 256    # Longest side (px) of the image fed to MediaPipe
+ROI_PADDING         = 0.35   # Padding added around the pose box (fraction of box)
+ROI_MIN_FRACTION    = 0.25   # Smallest crop side as a fraction of the frame
+ROI_LOST_FRAMES     = 3      # Frames without a pose before reverting to full frame
+ROI_MIN_VISIBILITY  = 0.5    # Joints below this visibility don't shape the box
+
+
+# ─── 9. POSE MODEL TIERS  (Automatic downgrade under load) ───────────────────
+# Drop the .task files into backend/models/.  Missing tiers are skipped.
+POSE_MODEL_FILES = {
+    'lite':  'pose_landmarker_lite.task',
+    'full':  'pose_landmarker_full.task',
+    'heavy': 'pose_landmarker_heavy.task',
+}
+POSE_MODEL_TIER       = 'lite'           # Highest tier the controller may use
+AUTO_TIER_ENABLED     = True             # False → stay on POSE_MODEL_TIER
+INFERENCE_BUDGET_MS   = 25.0             # Mean inference above this → step down
+TIER_HEADROOM_RATIO   = 0.5              # Mean below budget × ratio → step up
+TIER_WINDOW_FRAMES    = 30               # Latency samples per decision
+TIER_SWITCH_COOLDOWN  = 3.0              # Seconds between two switches
+TIER_INPUT_SIZES      = (192, 160)       # Extra rungs below ROI_INFERENCE_SIZE
+
+
+# ─── 10. FRAME SKIPPING  (Inference on a subset of frames) ───────────────────
+# Skipped ticks reuse a constant-velocity extrapolation of the last pose.
+# Modes: 'off' | 'fixed' (every FRAME_SKIP_N frames) | 'adaptive'
+FRAME_SKIP_MODE     = 'off'
+FRAME_SKIP_N        = 2      # 'fixed': run inference every Nth frame
+FRAME_SKIP_MAX      = 2      # 'adaptive': most frames skipped in a row
+MOTION_ENERGY_LOW   = 0.05   # Mean joint speed (frame widths/s) → max skipping
+MOTION_ENERGY_HIGH  = 0.60   # Mean joint speed at/above which every frame runs
+
+
+# ─── 11. SPECTATOR VIDEO  (Binary JPEG stream for Motion_tracking.py) ────────
+# Viewers start at level 0 and drop one level when they fall behind.
+VIDEO_STREAM_WIDTH   = 480     # Width (px) of streamed frames
+VIDEO_QUALITY_LEVELS = ((80, 30), (65, 20), (50, 12), (35, 6))  # (JPEG quality, max fps)
+VIDEO_MAX_IN_FLIGHT  = 2       # Unacknowledged frames before a viewer is skipped
+VIDEO_ACK_SLOW       = 0.25    # Ack round-trip (s) that counts as "falling behind"
+VIDEO_ACK_TIMEOUT    = 2.0     # Seconds before lost acks are forgiven
+VIDEO_UPGRADE_ACKS   = 60      # Consecutive fast acks before moving up a level
+
+
+# ─── 12. POSE STREAM  (Quantised skeleton for remote displays) ───────────────
+POSE_STREAM_SCALE = 10000   # Normalised coord × scale → int16 (±3.27 range)
+
+
+# ─── 13. HOT RELOAD  (config.json overrides) ─────────────────────────────────
+# Values in backend/config.json override the tunables above at runtime
+# (see runtime_config.SCHEMA for which ones).  Edits are picked up without
+# a restart; invalid files are rejected and the previous values kept.
+CONFIG_WATCH_INTERVAL = 1.0   # Seconds between config.json change checks
+
+
+# ─── 14. MULTI-PERSON  (Player locking + two-player mode) ────────────────────
+# 'single': one player, bystanders ignored.  'duo': two players side by side,
+# each driving its own telemetry channel ('telemetry' / 'telemetry_p2').
+PLAYER_MODE         = 'single'
+MAX_POSES           = 3             # Poses MediaPipe may return per frame
+DUO_LANE_CENTERS    = (0.25, 0.75)  # Nose-X centre of each duo player's lane
+TRACK_MIN_IOU       = 0.2           # Torso-box IoU needed to continue a track
+TRACK_MAX_DISTANCE  = 0.15          # Centroid fallback match radius (frame units)
+TRACK_MAX_MISSED    = 10            # Frames a track survives unseen (slot stays locked)
+
+
+# ─── 15. QUESTION POOL  (Validation + de-duplication of LLM batches) ─────────
+# Served questions are remembered per topic so a returning player doesn't see
+# repeats; surplus valid questions are cached to top up short batches.
+QUESTION_BATCH_SIZE   = 10    # Questions sent per 'questions_ready'
+QUESTION_MIN_BATCH    = 9     # Fewer usable questions than this → request fails
+QUESTION_HISTORY_SIZE = 300   # Served-question keys remembered per topic
+QUESTION_CACHE_SIZE   = 200   # Spare validated questions kept per topic
+QUESTION_MAX_TEXT     = 160   # Longer question text is rejected (won't fit the overlay)
+
+
+# ─── 16. QUESTION BANK  (Offline SQLite / FTS5 fallback) ──────────────────────
+# Queried by topic similarity when there's no GEMINI_API_KEY or generation
+# fails / times out.  Fill it with `python -m questions.bank load <file.json>`.
+QUESTION_BANK_FILE       = 'question_bank.db'    # SQLite file in backend/
+QUESTION_BANK_SEED       = 'question_bank.json'  # Loaded automatically into an empty bank
+QUESTION_BANK_CANDIDATES = 40     # Ranked matches fetched before de-duplication
+QUESTION_LLM_TIMEOUT     = 12.0   # Seconds before a slow Gemini call falls back to the bank
+
+
+# ─── 17. STATIC ASSETS  (In-memory frontend serving) ─────────────────────────
+# Frontend files are compressed once and served from memory with ETags.
+# URLs carrying ?v=<hash> (added to page references automatically) are
+# cached for STATIC_MAX_AGE; everything else revalidates with a cheap 304.
+STATIC_CHECK_INTERVAL = 2.0        # Seconds between on-disk change checks per file
+STATIC_MAX_AGE        = 31536000   # Cache lifetime (s) for versioned URLs (1 year)
+STATIC_MIN_COMPRESS   = 512        # Smaller files are served uncompressed
+
+
+# ─── 18. SESSIONS  (Reconnect without regenerating questions) ────────────────
+SESSION_GRACE_PERIOD = 300.0   # Seconds a disconnected player's session can be resumed
+SESSION_MAX          = 500     # Sessions kept in memory (oldest detached evicted first)
+
+
+# ─── 19. SCALE-OUT  (Several server.py workers behind one port) ──────────────
+# Started by `python -m cluster.run`.  Worker 0 owns the camera + pose
+# pipeline; every worker serves Socket.IO clients and emits are relayed
+# through MESSAGE_QUEUE.  Clients must use the websocket transport (the
+# kernel spreads connections across workers, so HTTP long-polling would
+# land on the wrong process).
+CLUSTER_WORKERS    = 4
+MESSAGE_QUEUE      = 'unix:///tmp/motionlink-mq.sock'   # or 'redis://localhost:6379/0'
+SESSION_STORE_FILE = 'sessions.db'   # Shared session store (SQLite, backend/) when clustered
+
+
+# ─── 20. LATENCY TRACING  (Capture → client render, see latency.py) ──────────
+# Every telemetry frame carries 'seq' + 'cap_ms'; every Nth is marked
+# 'trace' and echoed back by clients with CONFIG.LATENCY_ECHO enabled.
+LATENCY_TRACE_EVERY     = 15      # Trace one frame in N (~2/s at 30 fps; 0 = off)
+LATENCY_REPORT_INTERVAL = 60.0    # Seconds between [LATENCY] log lines (0 = never)
+LATENCY_BUCKETS_MS      = (1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 250, 500, 1000)
+
+
+# ─── 21. LOGGING  (Queue-backed, see logs.py) ────────────────────────────────
+# Handlers and the game loop only enqueue records; a background OS thread
+# formats and writes them, so a slow console or log file never stalls a frame.
+LOG_LEVEL        = 'INFO'     # DEBUG | INFO | WARNING | ERROR
+LOG_FORMAT       = 'text'     # 'text' (emoji lines, as before) | 'json' (one object per line)
+LOG_FILE         = ''         # '' = stdout; otherwise a path (relative to backend/)
+LOG_QUEUE_SIZE   = 10000      # Records waiting for the writer; overflow is dropped + counted
+LOG_RATE_BURST   = 5          # Lines per opt-in rate_key (logs.py) allowed per LOG_RATE_WINDOW ...
+LOG_RATE_WINDOW  = 10.0       # ... seconds; the rest are summarised as 'suppressed'
+
+
+# ─── 22. LLM BATCHING  (Several topics per Gemini call) ──────────────────────
+# Question requests arriving within LLM_BATCH_WINDOW of each other share one
+# Gemini round-trip (questions/batcher.py); the response is split and
+# validated per topic.
+LLM_BATCH_WINDOW       = 0.25   # Seconds to gather pending topics (0 = one call per request)
+LLM_BATCH_MAX_REQUESTS = 4      # Requests per call; a full batch is sent immediately
@@ -0,0 +1,547 @@
+# =============================================================================
+#  game_server.py  —  Socket.IO event logic shared by both server modes
+#
+#  GameServer owns the game state (trackers, player registry, sessions,
+#  question service, leaderboard, latency tracer, runtime config) and every
+#  event handler, written once as coroutines that only await its transport
+#  hooks:
+#
+#      emit / enter_room / leave_room   Socket.IO calls
+#      sleep                            yield to the hub / loop
+#      run_in_threads(*calls)           blocking calls, in parallel, off the hub / loop
+#      run_in_pipeline(fn)              a call on the thread that owns the pipeline
+#      request_llm(topic)               raw questions via the batcher, with timeout
+#
+#  server.py (GreenGameServer) implements the hooks with blocking eventlet
+#  calls and drives each coroutine with run_blocking() — nothing ever
+#  suspends, so no event loop is needed.  server_async.py (AsyncGameServer)
+#  awaits the AsyncServer / executor equivalents.
+#
+#  Config updates are applied between frames: the game loop switches the
+#  RuntimeConfig to deferred mode and rewrites module globals right after
+#  pipeline.read() returns, while the pipeline thread is idle.
+# =============================================================================
+import hmac
+import importlib
+import itertools
+import logging
+import os
+import sys
+import time
+
+from motion_logic.tracker import PlayerTracker
+from questions import gemini
+from questions.service import QuestionService, FALLBACK_QUESTIONS, DEV_QUESTIONS
+from streaming.pose import PoseStream
+from leaderboard import Leaderboard
+from latency import LatencyTracer
+from runtime_config import CONFIG_JSON, RuntimeConfig, ConfigError
+from config import (
+    LOOP_SLEEP, MIRROR_INPUT,
+    DEV_SKIP_AI_QUESTIONS,
+    CONFIG_WATCH_INTERVAL,
+    PLAYER_MODE, DUO_LANE_CENTERS,
+    SESSION_GRACE_PERIOD,
+    LEADERBOARD_FILE, FRAME_SOURCE,
+    LATENCY_REPORT_INTERVAL,
+)
+
+log = logging.getLogger(__name__)
+
+# Modules below read tunables as plain globals; runtime_config rewrites them
+# in place when config.json changes or a client sends 'update_config'.
+HOT_MODULES = (
+    'motion_logic.gesture_detection', 'motion_logic.walking', 'motion_logic.turning',
+    'motion_logic.calibration', 'motion_logic.tracker', 'motion_logic.landmark_filter',
+    'motion_logic.answer_gesture',
+    'vision.roi', 'vision.frame_skip',
+    __name__,
+)
+
+# FRAME_SOURCE → (module, class) that start_pipeline() builds
+PIPELINES = {
+    'camera':    ('vision.pipeline', 'PosePipeline'),
+    'synthetic': ('vision.pipeline', 'SyntheticPipeline'),
+}
+
+# Slot N's telemetry goes out on TELEMETRY_EVENTS[N]
+TELEMETRY_EVENTS = ('telemetry', 'telemetry_p2')
+# Every client gets telemetry by default; quiz-mode clients can swap it for
+# the sparse 'answer_gesture' stream (see subscribe_answers)
+TELEMETRY_ROOM = 'telemetry'
+ANSWER_ROOM = 'answers'
+
+# 'update_config' rewrites tunables for everyone and the socket allows any
+# origin, so only operators may send it: clients that connect with
+# auth={'operator_token': ...} matching MOTION_OPERATOR_TOKEN, or — when no
+# token is set — clients on this machine.
+OPERATOR_TOKEN = os.environ.get('MOTION_OPERATOR_TOKEN', '').strip()
+LOOPBACK_ADDRS = ('127.0.0.1', '::1', '::ffff:127.0.0.1')
+
+
+def client_address(environ):
+    """Peer IP of a Socket.IO connection (engineio's ASGI environ fakes REMOTE_ADDR)."""
+    scope = environ.get('asgi.scope')
+    if scope is not None:
+        return (scope.get('client') or ('',))[0]
+    return environ.get('REMOTE_ADDR', '')
+
+
+def is_operator(environ, auth):
+    if OPERATOR_TOKEN:
+        token = auth.get('operator_token') if isinstance(auth, dict) else None
+        return isinstance(token, str) and hmac.compare_digest(token, OPERATOR_TOKEN)
+    return client_address(environ) in LOOPBACK_ADDRS
+
+
+def run_blocking(coro):
+    """
+    Runs a GameServer coroutine to completion on the calling (green)thread.
+    Only valid when every hook it awaits blocks instead of suspending.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("GameServer hook suspended outside an event loop")
+
+
+class GameServer:
+    """Transport-independent game state + Socket.IO handlers (see module header)."""
+
+    # Socket.IO events the adapters register, each handled by the method of that name
+    EVENTS = (
+        'connect', 'disconnect',
+        'subscribe_video', 'unsubscribe_video', 'subscribe_answers', 'unsubscribe_answers',
+        'subscribe_pose', 'unsubscribe_pose',
+        'request_questions', 'resume_session', 'submit_score', 'request_leaderboard',
+        'reset_session', 'recalibrate', 'new_player',
+        'telemetry_echo', 'request_latency', 'get_config', 'update_config',
+    )
+
+    def __init__(self, base_dir, sessions, video_stream=None, is_primary=True, config_path=CONFIG_JSON):
+        self.base_dir = base_dir
+        self.models_dir = os.path.join(base_dir, 'models')
+        self.is_primary = is_primary
+        self.pipeline = None
+        self.server_status = {'stage': 'STARTING', 'detail': ''}
+
+        self.runtime_config = RuntimeConfig(config_path)
+        try:
+            overrides = self.runtime_config.load()
+            if overrides:
+                log.info(f"✅ config.json overrides: {overrides}")
+        except ConfigError as e:
+            log.warning(f"⚠️  Ignoring config.json: {e}")
+
+        # All per-player motion state lives on the tracker (motion_logic/tracker.py)
+        if PLAYER_MODE == 'duo':
+            self.player_trackers = [
+                PlayerTracker(on_calibrated=self._on_calibrated, center_x=cx, name=f"P{i + 1}")
+                for i, cx in enumerate(DUO_LANE_CENTERS)
+            ]
+        else:
+            self.player_trackers = [PlayerTracker(on_calibrated=self._on_calibrated)]
+
+        self.video_stream = video_stream            # binary JPEG spectators (eventlet only)
+        self.pose_stream = PoseStream(self)         # emits through the hooks below
+        self.latency = LatencyTracer()
+        self._frame_seq = itertools.count(1)
+
+        self.player_registry = {}   # { sid: { name, class, topic } }
+        self.operators = set()      # sids allowed to send 'update_config'
+        self.sessions = sessions    # resumable registry entries + delivered questions
+        self.questions = QuestionService(base_dir)  # validation/de-dup pool + offline bank
+        self.leaderboard = Leaderboard(os.path.join(base_dir, LEADERBOARD_FILE))
+        self.bind_loaded_modules()
+
+    # ── Transport hooks ───────────────────────────────────────────────────────
+    async def emit(self, event, data, to=None, room=None):
+        raise NotImplementedError
+
+    async def enter_room(self, sid, room):
+        raise NotImplementedError
+
+    async def leave_room(self, sid, room):
+        raise NotImplementedError
+
+    async def sleep(self, seconds):
+        raise NotImplementedError
+
+    async def run_in_threads(self, *calls):
+        """Runs blocking calls in parallel; returns each result (or exception) in order."""
+        raise NotImplementedError
+
+    async def run_in_pipeline(self, fn):
+        """Runs fn where pipeline.read() runs, never concurrently with it."""
+        raise NotImplementedError
+
+    async def request_llm(self, topic):
+        """Raw question list for `topic` from the batcher; raises on failure or timeout."""
+        raise NotImplementedError
+
+    async def on_primary(self, name, payload=None):
+        """Runs a pipeline / tracker / stream command (server.py forwards it when clustered)."""
+        await self.run_primary(name, payload)
+
+    # ── State helpers ─────────────────────────────────────────────────────────
+    def bind_loaded_modules(self):
+        for name in HOT_MODULES:
+            if name in sys.modules:
+                self.runtime_config.bind(sys.modules[name])
+
+    def _on_calibrated(self, tracker):
+        stats = tracker.noise_calibrator.stats
+        log.info(
+            f"✅ [{tracker.name}] CALIBRATED! Threshold: {tracker.bounce_threshold:.5f} "
+            f"(noise mean {stats.mean:.5f} ± {stats.std:.5f}, "
+            f"robust ceiling {tracker.noise_calibrator.noise_level():.5f})"
+        )
+
+    def config_state(self):
+        return {'values': self.runtime_config.values, 'overrides': self.runtime_config.overrides}
+
+    async def set_status(self, stage, detail=''):
+        self.server_status['stage'] = stage
+        self.server_status['detail'] = detail
+        await self.emit('server_status', self.server_status)
+
+    # ── Connection + subscriptions ────────────────────────────────────────────
+    async def connect(self, sid, environ, auth=None):
+        log.info(f"✅ CLIENT CONNECTED: {sid}", extra={'sid': sid})
+        if is_operator(environ, auth):
+            self.operators.add(sid)
+        await self.enter_room(sid, TELEMETRY_ROOM)
+        await self.emit('server_status', self.server_status, to=sid)
+
+    async def disconnect(self, sid, reason=None):
+        log.info(f"❌ CLIENT DISCONNECTED: {sid}", extra={'sid': sid})
+        self.player_registry.pop(sid, None)
+        self.operators.discard(sid)
+        if self.sessions.detach(sid) is not None:
+            log.info(f"[SESSION] [{sid}] Held for {SESSION_GRACE_PERIOD:.0f}s ({len(self.sessions)} sessions).")
+        await self.on_primary('unsubscribe_video', sid)
+        await self.on_primary('unsubscribe_pose', sid)
+        await self.on_primary('latency_forget', sid)
+
+    async def subscribe_video(self, sid, data=None):
+        """Socket.IO event: 'subscribe_video' — start receiving binary 'video_frame' JPEGs."""
+        if self.video_stream is None:
+            log.info(f"📺 [{sid}] Video streaming is only available in server.py (eventlet) mode.")
+            return
+        log.info(f"📺 Video viewer subscribed: {sid}")
+        await self.on_primary('subscribe_video', sid)
+
+    async def unsubscribe_video(self, sid, data=None):
+        await self.on_primary('unsubscribe_video', sid)
+
+    async def subscribe_answers(self, sid, data=None):
+        """
+        Socket.IO event: 'subscribe_answers'
+        Payload (optional): { telemetry: bool } — false also drops the full telemetry stream.
+        Emits 'answer_gesture' { player, choice: "A"|"B", confidence, dwell_ms } per answer.
+        """
+        await self.enter_room(sid, ANSWER_ROOM)
+        if isinstance(data, dict) and data.get('telemetry') is False:
+            await self.leave_room(sid, TELEMETRY_ROOM)
+
+    async def unsubscribe_answers(self, sid, data=None):
+        await self.leave_room(sid, ANSWER_ROOM)
+        await self.enter_room(sid, TELEMETRY_ROOM)
+
+    async def subscribe_pose(self, sid, data=None):
+        """Socket.IO event: 'subscribe_pose' — receive quantised 'pose_stream' skeleton packets."""
+        log.info(f"🦴 Pose viewer subscribed: {sid}")
+        await self.on_primary('subscribe_pose', sid)
+
+    async def unsubscribe_pose(self, sid, data=None):
+        await self.on_primary('unsubscribe_pose', sid)
+
+    # ── Questions + sessions ──────────────────────────────────────────────────
+    async def generate_questions(self, topic):
+        """
+        QUESTION_BATCH_SIZE quiz dicts [{text, optA, optB, answer}, ...] from
+        Gemini (batched with other pending topics), after validation /
+        de-duplication by the question pool.  Without an API key, serves the
+        offline bank (or FALLBACK_QUESTIONS); other failures raise so
+        request_questions can fall back to the bank.
+        """
+        if not gemini.API_KEY:
+            log.info("[LLM] No API key — using offline question bank.")
+            return self.questions.from_bank(topic) or FALLBACK_QUESTIONS
+
+        return self.questions.from_llm(topic, await self.request_llm(topic))
+
+    async def request_questions(self, sid, data):
+        """
+        Socket.IO event: 'request_questions'
+        Payload: { name: str, classId: str, topic: str }
+        Emits 'questions_ready' with 10-question array, or 'questions_error' on failure.
+        """
+        name    = str(data.get('name',    'Player')).strip()
+        class_id= str(data.get('classId', 'Unknown')).strip()
+        topic   = str(data.get('topic',   'General Knowledge')).strip()
+
+        log.info(f"[LLM] [{sid}] Request — Player: '{name}' | Class: '{class_id}' | Topic: '{topic}'",
+                 extra={'sid': sid, 'topic': topic})
+
+        # Store player info (and open a resumable session for it)
+        self.player_registry[sid] = {'name': name, 'class': class_id, 'topic': topic}
+        self.sessions.create(sid, self.player_registry[sid])
+
+        # ── DEV MODE: skip Gemini API ──────────────────────────────────────────
+        if DEV_SKIP_AI_QUESTIONS:
+            log.warning(f"[LLM] [{sid}] ⚠️ DEV_SKIP_AI_QUESTIONS=True — returning fallback questions.")
+            await self._deliver_questions(sid, self.questions.from_bank(topic) or DEV_QUESTIONS)
+            return
+        # ───────────────────────────────────────────────────────────────────────
+
+        try:
+            questions = await self.generate_questions(topic)
+        except Exception as e:
+            log.error(f"[LLM] [{sid}] ❌ Generation failed ({e!r}) — trying offline question bank.")
+            questions = self.questions.from_bank(topic)
+
+        if questions:
+            log.info(f"[LLM] [{sid}] ✅ Sending {len(questions)} questions.")
+            await self._deliver_questions(sid, questions)
+        else:
+            await self.emit('questions_error', {'message': 'Failed to generate questions. Please try again.'}, to=sid)
+
+    async def _deliver_questions(self, sid, questions):
+        """Emits 'session_token' then 'questions_ready', keeping the set for resume_session."""
+        session = self.sessions.set_questions(sid, questions)
+        if session is not None:
+            await self.emit('session_token', {'token': session.token, 'grace': SESSION_GRACE_PERIOD}, to=sid)
+        await self.emit('questions_ready', questions, to=sid)
+
+    async def resume_session(self, sid, data):
+        """
+        Socket.IO event: 'resume_session'
+        Payload: { token: str }  (from an earlier 'session_token')
+        Emits 'session_resumed' { name, classId, topic, questions } — no LLM call —
+        or 'session_expired' when the token is unknown or past its grace period.
+        """
+        token = data.get('token') if isinstance(data, dict) else None
+        session = self.sessions.attach(token, sid)
+        if session is None:
+            log.info(f"[SESSION] [{sid}] Resume rejected (unknown or expired token).")
+            await self.emit('session_expired', {}, to=sid)
+            return
+
+        self.player_registry[sid] = session.info
+        log.info(f"[SESSION] [{sid}] Resumed '{session.info['name']}' "
+                 f"({len(session.questions or [])} questions kept).")
+        await self.emit('session_resumed', {
+            'name':      session.info['name'],
+            'classId':   session.info['class'],
+            'topic':     session.info['topic'],
+            'questions': session.questions,
+        }, to=sid)
+
+    # ── Leaderboard ───────────────────────────────────────────────────────────
+    async def submit_score(self, sid, data):
+        """
+        Socket.IO event: 'submit_score'
+        Payload: { time_ms: int, time_str: str }
+        """
+        time_ms = data.get('time_ms')
+        time_str = data.get('time_str')
+
+        if time_ms is None or not time_str:
+            return
+
+        # Small read-modify-write with no await inside: submissions can't interleave
+        player_info = self.player_registry.get(sid, {'name': 'Unknown', 'class': 'N/A'})
+        entry, board = self.leaderboard.submit(player_info, time_ms, time_str)
+        log.info(f"🏆 Score submitted by {entry['name']} - {entry['time_str']}",
+                 extra={'sid': sid, 'time_ms': entry['time_ms']})
+        await self.emit('leaderboard_update', board)
+
+    async def request_leaderboard(self, sid, data=None):
+        await self.emit('leaderboard_update', self.leaderboard.load(), to=sid)
+
+    # ── Session lifecycle ─────────────────────────────────────────────────────
+    # Operators (or the kiosk UI) can restart tracking without restarting the
+    # process — the pose model and camera stay loaded.
+    #   reset_session : same player, new run   (steps / momentum cleared)
+    #   recalibrate   : same player, re-measure body noise
+    #   new_player    : recalibrate + forget ROI / extrapolation state
+    async def reset_tracking(self, mode):
+        for tracker in self.player_trackers:
+            if mode == 'reset_session':
+                tracker.reset_run()
+            else:
+                tracker.recalibrate()
+        if mode == 'new_player' and self.pipeline is not None:
+            # ROI / extrapolation state belongs to the pipeline thread
+            await self.run_in_pipeline(self.pipeline.reset_tracking)
+        state = self.player_trackers[0].system_state
+        log.info(f"🔄 Session {mode.upper()} — state: {state}")
+        await self.emit('session_reset', {'mode': mode, 'state': state})
+
+    async def reset_session(self, sid, data=None):
+        await self.on_primary('reset_tracking', 'reset_session')
+
+    async def recalibrate(self, sid, data=None):
+        await self.on_primary('reset_tracking', 'recalibrate')
+
+    async def new_player(self, sid, data=None):
+        await self.on_primary('reset_tracking', 'new_player')
+
+    # ── Primary commands ──────────────────────────────────────────────────────
+    # Requests that touch pipeline / tracker / stream state.  Clustered
+    # server.py workers forward them to the primary over the message queue.
+    PRIMARY_COMMANDS = (
+        'subscribe_video', 'unsubscribe_video', 'subscribe_pose', 'unsubscribe_pose',
+        'reset_tracking', 'latency_echo', 'latency_forget', 'latency_report',
+    )
+
+    async def run_primary(self, name, payload):
+        if name == 'subscribe_video':
+            if self.video_stream is not None:
+                self.video_stream.subscribe(payload)
+        elif name == 'unsubscribe_video':
+            if self.video_stream is not None:
+                self.video_stream.unsubscribe(payload)
+        elif name == 'subscribe_pose':
+            await self.pose_stream.subscribe(payload)
+        elif name == 'unsubscribe_pose':
+            await self.pose_stream.unsubscribe(payload)
+        elif name == 'reset_tracking':
+            await self.reset_tracking(payload)
+        elif name == 'latency_echo':
+            self.latency.echo(*payload)
+        elif name == 'latency_forget':
+            self.latency.forget(payload)
+        elif name == 'latency_report':
+            await self.emit('latency_report', self.latency.report(), to=payload)
+
+    # ── Game loop ─────────────────────────────────────────────────────────────
+    async def game_loop(self):
+        pipeline = self.pipeline
+        # From here on config updates wait for the gap between two frames
+        self.runtime_config.deferred = True
+        while True:
+            ret, players = await self.run_in_pipeline(pipeline.read)
+            self.runtime_config.apply_pending()
+            if not ret:
+                await self.sleep(0.1)
+                continue
+
+            if self.video_stream is not None and self.video_stream.active:
+                self.video_stream.publish(pipeline.frame_bgr, mirror=MIRROR_INPUT)
+
+            # --- BROADCAST ---
+            now = time.time()
+            seq = next(self._frame_seq)
+            frame_info = {'seq': seq, 'cap_ms': round(pipeline.timing[1] * 1000, 1)}
+            if self.latency.should_trace(seq):
+                frame_info['trace'] = True  # clients echo this one (telemetry_echo)
+            await self.pose_stream.publish(players[0], mirrored=MIRROR_INPUT)
+            for slot, (tracker, landmarks) in enumerate(zip(self.player_trackers, players)):
+                telemetry = tracker.update(landmarks, now)
+                telemetry.update(frame_info)
+                await self.emit(TELEMETRY_EVENTS[slot], telemetry, room=TELEMETRY_ROOM)
+
+                answer = tracker.answer_recognizer.update(telemetry, now)
+                if answer:
+                    answer['player'] = slot + 1
+                    await self.emit('answer_gesture', answer, room=ANSWER_ROOM)
+            self.latency.record_frame(seq, pipeline.timing, time.monotonic())
+
+            slept = time.monotonic()
+            await self.sleep(LOOP_SLEEP)
+            self.latency.record_sleep(time.monotonic() - slept)
+
+    async def start_pipeline(self):
+        """
+        Background startup: imports the vision stack, then loads the pose model
+        and opens the camera in parallel off the hub / loop (both calls block
+        in C code).  Runs the game loop once ready.
+        """
+        await self.set_status('LOADING', 'Loading pose model and camera')
+        started = time.perf_counter()
+        errors = []
+        try:
+            module_name, class_name = PIPELINES[FRAME_SOURCE]
+            module, = await self.run_in_threads(lambda: importlib.import_module(module_name))
+            if isinstance(module, Exception):
+                raise module
+            p = getattr(module, class_name)(self.models_dir)
+            results = await self.run_in_threads(p.load_model, p.open_camera)
+            errors = [str(r) for r in results if isinstance(r, Exception)]
+        except Exception as e:
+            errors.append(str(e))
+
+        if errors:
+            for err in errors:
+                log.error(f"❌ FATAL: Pipeline startup failed: {err}")
+            await self.set_status('ERROR', '; '.join(errors))
+            return
+
+        self.pipeline = p
+        self.bind_loaded_modules()   # vision modules are imported only now
+        log.info(f"✅ Pipeline ready in {time.perf_counter() - started:.2f}s")
+        await self.set_status('READY')
+        await self.game_loop()
+
+    # ── Latency tracing (see latency.py) ──────────────────────────────────────
+    async def telemetry_echo(self, sid, data):
+        """
+        Socket.IO event: 'telemetry_echo'
+        Payload: { seq: int, client_ms: float }  — reply to a frame marked 'trace'
+        """
+        if isinstance(data, dict):
+            await self.on_primary('latency_echo', [sid, data.get('seq'), data.get('client_ms'), time.monotonic()])
+
+    async def request_latency(self, sid, data=None):
+        """Emits 'latency_report' { server: {stage: histogram}, clients: {sid: {stage: histogram}} }."""
+        await self.on_primary('latency_report', sid)
+
+    async def log_latency(self):
+        while True:
+            await self.sleep(LATENCY_REPORT_INTERVAL)
+            line = self.latency.log_line()
+            if line:
+                log.info(f"⏱️  [LATENCY] {line}")
+
+    # ── Config events ─────────────────────────────────────────────────────────
+    async def get_config(self, sid, data=None):
+        await self.emit('config_state', self.config_state(), to=sid)
+
+    async def update_config(self, sid, data):
+        """
+        Socket.IO event: 'update_config'
+        Payload: { NAME: value, ... }  — validated as a whole, persisted to config.json.
+        Operators only (see OPERATOR_TOKEN).
+        """
+        if sid not in self.operators:
+            log.warning(f"⚠️  [CONFIG] [{sid}] Update refused: not an operator")
+            await self.emit('config_error', {'message': "update_config needs an operator connection"}, to=sid)
+            return
+        try:
+            changed = self.runtime_config.update(data)
+        except (ConfigError, OSError) as e:
+            log.warning(f"⚠️  [CONFIG] [{sid}] Rejected update: {e}")
+            await self.emit('config_error', {'message': str(e)}, to=sid)
+            return
+        log.info(f"🔧 [CONFIG] [{sid}] Updated: {changed}")
+        await self.emit('config_updated', self.config_state())
+
+    async def watch_config(self):
+        """Polls config.json and hot-applies edits made on disk."""
+        while True:
+            await self.sleep(CONFIG_WATCH_INTERVAL)
+            if not self.runtime_config.changed_on_disk():
+                continue
+            try:
+                changed = self.runtime_config.load()
+            except ConfigError as e:
+                log.warning(f"⚠️  [CONFIG] config.json rejected, keeping previous values: {e}")
+                continue
+            if changed:
+                log.info(f"🔧 [CONFIG] Reloaded config.json: {changed}")
+                if self.is_primary:  # one broadcast per edit, not one per worker
+                    await self.emit('config_updated', self.config_state())
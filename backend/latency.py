@@ -0,0 +1,130 @@
+# =============================================================================
+#  latency.py  —  Capture → client render latency tracing
+#
+#  Every telemetry frame carries 'seq' (per-process counter) and 'cap_ms'
+#  (monotonic capture time).  One frame in LATENCY_TRACE_EVERY is also
+#  marked 'trace': true; clients with CONFIG.LATENCY_ECHO answer it with
+#  'telemetry_echo' { seq, client_ms } once the frame has been rendered
+#  (client_ms = receipt → next animation frame, measured in the browser).
+#
+#  Stages (ms):
+#      capture     waiting for the camera frame
+#      inference   frame captured → landmarks ready (detector + tracking)
+#      loop        landmarks ready → telemetry emitted (trackers, streams)
+#      sleep       LOOP_SLEEP actually slept after the emit
+#      transport   one-way Socket.IO estimate: (echo back − emit − client) / 2
+#      client      browser receipt → rendered
+#      round_trip  frame captured → echo back at the server
+#  The first four are recorded for every frame; the last three per client.
+#  All server times are time.monotonic(), shared by every process on a host.
+# =============================================================================
+import bisect
+from collections import OrderedDict
+
+from config import LATENCY_BUCKETS_MS, LATENCY_TRACE_EVERY
+
+SERVER_STAGES = ('capture', 'inference', 'loop', 'sleep')
+CLIENT_STAGES = ('transport', 'client', 'round_trip')
+FRAME_HISTORY = 256   # traced frames remembered for matching echoes (~2 min)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; percentiles resolve to bucket upper edges."""
+
+    def __init__(self, edges=LATENCY_BUCKETS_MS):
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)   # last bucket: above the top edge
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(self.edges, ms)] += 1
+        self.n += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q):
+        if not self.n:
+            return None
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= q * self.n:
+                return self.edges[i] if i < len(self.edges) else round(self.max, 1)
+
+    def summary(self):
+        return {
+            'n': self.n,
+            'mean': round(self.total / self.n, 1) if self.n else None,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': round(self.max, 1),
+            'edges': self.edges,
+            'counts': list(self.counts),
+        }
+
+
+class LatencyTracer:
+    """Collects per-stage histograms; owned by the process running the game loop."""
+
+    def __init__(self):
+        self._frames = OrderedDict()   # traced seq → (captured, emitted)
+        self.server = {stage: Histogram() for stage in SERVER_STAGES}
+        self.clients = {}              # sid → {stage: Histogram}
+
+    @staticmethod
+    def should_trace(seq):
+        return LATENCY_TRACE_EVERY > 0 and seq % LATENCY_TRACE_EVERY == 0
+
+    def record_frame(self, seq, timing, emitted):
+        """`timing` = pipeline.timing (capture start, captured, landmarks ready)."""
+        capture_start, captured, inferred = timing
+        self.server['capture'].add((captured - capture_start) * 1000)
+        self.server['inference'].add((inferred - captured) * 1000)
+        self.server['loop'].add((emitted - inferred) * 1000)
+        if self.should_trace(seq):
+            self._frames[seq] = (captured, emitted)
+            while len(self._frames) > FRAME_HISTORY:
+                self._frames.popitem(last=False)
+
+    def record_sleep(self, seconds):
+        self.server['sleep'].add(seconds * 1000)
+
+    def echo(self, sid, seq, client_ms, received):
+        """Matches a client echo to its frame; False if unknown, stale or malformed."""
+        frame = self._frames.get(seq) if isinstance(seq, int) else None
+        if frame is None or not isinstance(client_ms, (int, float)) or client_ms < 0:
+            return False
+        captured, emitted = frame
+        stages = self.clients.get(sid)
+        if stages is None:
+            stages = self.clients[sid] = {stage: Histogram() for stage in CLIENT_STAGES}
+        stages['client'].add(client_ms)
+        stages['transport'].add(max(0.0, ((received - emitted) * 1000 - client_ms) / 2))
+        stages['round_trip'].add((received - captured) * 1000)
+        return True
+
+    def forget(self, sid):
+        self.clients.pop(sid, None)
+
+    def report(self):
+        return {
+            'server': {stage: h.summary() for stage, h in self.server.items()},
+            'clients': {sid: {stage: h.summary() for stage, h in stages.items()}
+                        for sid, stages in self.clients.items()},
+        }
+
+    def log_line(self):
+        """One-line summary for the periodic [LATENCY] log (None before any frame)."""
+        if not self.server['capture'].n:
+            return None
+        parts = [f"{stage} {h.percentile(0.5)}/{h.percentile(0.95)}"
+                 for stage, h in self.server.items()]
+        round_trips = [stages['round_trip'] for stages in self.clients.values()]
+        if round_trips:
+            worst = max(round_trips, key=lambda h: h.percentile(0.95) or 0)
+            parts.append(f"round_trip (worst of {len(round_trips)} clients) "
+                         f"{worst.percentile(0.5)}/{worst.percentile(0.95)}")
+        return "p50/p95 ms: " + ", ".join(parts)
@@ -0,0 +1,66 @@
+# =============================================================================
+#  leaderboard.py  —  Fastest-run leaderboard persisted to leaderboard.json
+#
+#  Shared by both server modes; the file is small (top LEADERBOARD_SIZE runs)
+#  so it is simply re-read and rewritten on every submission.  Submissions
+#  hold an exclusive lock on leaderboard.json.lock and replace the file
+#  atomically, so several worker processes (cluster/run.py) can share it.
+# =============================================================================
+import json
+import logging
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+LEADERBOARD_SIZE = 100  # Keep top 100 to prevent infinite growth
+
+
+class Leaderboard:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            log.warning(f"⚠️ Error loading leaderboard: {e}")
+            return []
+
+    def save(self, data):
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)  # readers never see a half-written file
+        except Exception as e:
+            log.warning(f"⚠️ Error saving leaderboard: {e}")
+
+    def submit(self, player_info, time_ms, time_str):
+        """Adds one run and returns (entry, updated board)."""
+        entry = {
+            'name': player_info['name'],
+            'class': player_info['class'],
+            'time_ms': time_ms,
+            'time_str': time_str,
+            'timestamp': int(time.time() * 1000)
+        }
+
+        with open(self.path + '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # serialises workers' read-modify-write
+            board = self.load()
+            board.append(entry)
+            board.sort(key=lambda x: x['time_ms'])
+            board = board[:LEADERBOARD_SIZE]
+
+            self.save(board)
+        return entry, board
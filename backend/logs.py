@@ -0,0 +1,198 @@
+# =============================================================================
+#  logs.py  —  Non-blocking structured logging
+#
+#  Standard `logging` calls (log = logging.getLogger(__name__)) go through a
+#  QueueingHandler: the caller only rate-limits, merges the message and puts
+#  the record on a bounded queue.  A background OS thread formats and writes
+#  it — as the emoji text lines the servers always printed, or as one JSON
+#  object per line (LOG_FORMAT = 'json').  A full queue drops the record and
+#  counts it instead of blocking; the writer reports the count later.
+#
+#  Under eventlet the writer must be a real thread with a real queue (not
+#  their monkey-patched green versions), otherwise a slow write would still
+#  stall the hub.  It also never takes a logging.Handler lock, since those
+#  are green locks once eventlet has patched threading.
+#
+#  Rate limiting is opt-in: a hot-loop call site that could flood the log
+#  passes extra={'rate_key': ...}, and records sharing that key are let
+#  through LOG_RATE_BURST times per LOG_RATE_WINDOW seconds; the next one
+#  after the window carries suppressed=N.  Messages are f-strings, so the
+#  key, not the text, decides what counts as "the same" line.  Everything
+#  else — connects, per-request lines, errors — is always written.
+#
+#  Extra structured fields ride on `extra`, e.g.
+#      log.info("Score submitted", extra={'sid': sid, 'time_ms': 61234})
+#  and appear as keys in JSON output.
+# =============================================================================
+import atexit
+import json
+import logging
+import os
+import sys
+
+from config import (
+    LOG_LEVEL, LOG_FORMAT, LOG_FILE, LOG_QUEUE_SIZE,
+    LOG_RATE_BURST, LOG_RATE_WINDOW,
+)
+
+
+def _native_modules():
+    """(threading, queue) — the unpatched ones if eventlet has monkey-patched them."""
+    patcher = sys.modules.get('eventlet.patcher')
+    if patcher is not None and patcher.is_monkey_patched('thread'):
+        return patcher.original('threading'), patcher.original('queue')
+    import queue
+    import threading
+    return threading, queue
+
+
+_threading, _queue = _native_modules()
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The servers' original console style: just the message (+ suppressed count)."""
+
+    def format(self, record):
+        line = record.getMessage()
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            line += f"  (+{suppressed} similar suppressed)"
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+class RateLimiter:
+    """Burst limit per rate_key; records without one pass.  Thread-unsafe by design (one hub)."""
+
+    def __init__(self, burst=LOG_RATE_BURST, window=LOG_RATE_WINDOW):
+        self.burst = burst
+        self.window = window
+        self._state = {}   # key → [window_start, count, suppressed]
+
+    def allow(self, record):
+        key = getattr(record, 'rate_key', None)
+        if key is None or self.burst <= 0:
+            return True
+        now = record.created
+        state = self._state.get(key)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state else 0
+            self._state[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            if len(self._state) > 4096:  # forget stale keys
+                self._state = {k: v for k, v in self._state.items() if now - v[0] < self.window}
+            return True
+        if state[1] < self.burst:
+            state[1] += 1
+            return True
+        state[2] += 1
+        return False
+
+
+class QueueingHandler(logging.Handler):
+    """Enqueues records for the writer thread; never blocks, never formats."""
+
+    def __init__(self, records):
+        super().__init__()
+        self.records = records
+        self.limiter = RateLimiter()
+        self.dropped = 0
+
+    def handle(self, record):
+        # Skips Handler.handle's lock: emit() is a non-blocking put
+        if self.filter(record) and self.limiter.allow(record):
+            self.emit(record)
+            return True
+        return False
+
+    def emit(self, record):
+        # f-string / %-args are merged now, so later mutation can't change the line
+        if record.args:
+            record.msg, record.args = record.getMessage(), None
+        try:
+            self.records.put_nowait(record)
+        except _queue.Full:
+            self.dropped += 1
+
+
+class LogWriter:
+    """Owns the queue, the writer thread and the output stream."""
+
+    def __init__(self, stream, formatter, size=LOG_QUEUE_SIZE):
+        self.records = _queue.Queue(maxsize=size)
+        self.stream = stream
+        self.formatter = formatter
+        self.handler = QueueingHandler(self.records)
+        self._reported_drops = 0
+        self._thread = _threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            record = self.records.get()
+            if record is None:
+                break
+            try:
+                self.stream.write(self.formatter.format(record) + '\n')
+                dropped = self.handler.dropped
+                if dropped != self._reported_drops and self.records.empty():
+                    self.stream.write(f"⚠️  [LOG] {dropped - self._reported_drops} records dropped "
+                                      f"(queue full)\n")
+                    self._reported_drops = dropped
+                if self.records.empty():
+                    self.stream.flush()
+            except Exception:
+                pass  # nowhere left to report it
+
+    def close(self, timeout=2.0):
+        try:
+            self.records.put(None, timeout=timeout)
+        except _queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+_writer = None
+
+
+def setup_logging(level=LOG_LEVEL, fmt=LOG_FORMAT, path=LOG_FILE):
+    """Routes the root logger through the queue; safe to call more than once."""
+    global _writer
+    if _writer is not None:
+        return _writer
+    if path:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        stream = open(os.path.join(base_dir, path), 'a', encoding='utf-8', buffering=1 << 16)
+    else:
+        stream = sys.stdout
+    _writer = LogWriter(stream, JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_writer.handler)
+    root.setLevel(level)
+    logging.captureWarnings(True)
+    atexit.register(_writer.close)
+    return _writer
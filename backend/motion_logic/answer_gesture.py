@@ -0,0 +1,75 @@
+# =============================================================================
+#  answer_gesture.py  —  Debounced quiz answer recognition (server side)
+#
+#  Instead of every client re-deriving "is an arm raised?" from 30 Hz
+#  telemetry, the server turns arm angles into sparse 'answer_gesture'
+#  events:
+#      right arm raised (r_arm) → "A"      left arm raised (l_arm) → "B"
+#  (same mapping as QuizManager).  An answer fires once an arm has stayed
+#  above ANSWER_ARM_THRESHOLD — with confidence ≥ ANSWER_MIN_CONFIDENCE and
+#  the other arm down — for ANSWER_DWELL seconds.  After firing, the
+#  recognizer is latched until both arms drop below ANSWER_RELEASE_THRESHOLD.
+# =============================================================================
+from config import (
+    ANSWER_ARM_THRESHOLD, ANSWER_RELEASE_THRESHOLD,
+    ANSWER_MIN_CONFIDENCE, ANSWER_DWELL,
+)
+
+
+class AnswerGestureRecognizer:
+    """Per-player dwell + hysteresis state machine over l_arm / r_arm."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._candidate = None      # "A" / "B" currently being held
+        self._since = 0.0
+        self._conf_sum = 0.0
+        self._conf_n = 0
+        self._latched = False
+
+    def _raised(self, angle, conf):
+        return angle > ANSWER_ARM_THRESHOLD and conf >= ANSWER_MIN_CONFIDENCE
+
+    def update(self, telemetry, now):
+        """
+        Feeds one telemetry dict (l_arm, r_arm, *_conf).  Returns
+        {'choice', 'confidence', 'dwell_ms'} when an answer fires, else None.
+        """
+        l_arm, r_arm = telemetry['l_arm'], telemetry['r_arm']
+        l_conf = telemetry.get('l_arm_conf', 1.0)
+        r_conf = telemetry.get('r_arm_conf', 1.0)
+
+        if self._latched:
+            if l_arm < ANSWER_RELEASE_THRESHOLD and r_arm < ANSWER_RELEASE_THRESHOLD:
+                self._latched = False
+            return None
+
+        left, right = self._raised(l_arm, l_conf), self._raised(r_arm, r_conf)
+        if left == right:
+            # Neither, or both (ambiguous) — nothing to dwell on
+            self._candidate = None
+            return None
+
+        choice, conf = ("B", l_conf) if left else ("A", r_conf)
+        if choice != self._candidate:
+            self._candidate = choice
+            self._since = now
+            self._conf_sum = 0.0
+            self._conf_n = 0
+        self._conf_sum += conf
+        self._conf_n += 1
+
+        dwell = now - self._since
+        if dwell < ANSWER_DWELL:
+            return None
+
+        event = {
+            'choice': choice,
+            'confidence': round(self._conf_sum / self._conf_n, 2),
+            'dwell_ms': int(dwell * 1000),
+        }
+        self._candidate = None
+        self._latched = True
+        return event
@@ -0,0 +1,190 @@
+# =============================================================================
+#  calibration.py  —  Streaming, constant-memory noise calibration
+#
+#  The bounce threshold is derived from the player's idle shoulder jitter.
+#  Instead of storing every delta and taking max() (one outlier frame ruins
+#  it, and the list grows forever), deltas are folded into:
+#    • RunningStats  — Welford mean / variance (for logging + sanity)
+#    • P2Quantile    — Jain & Chlamtac P² estimates of the median and of the
+#                      median absolute deviation (MAD) from it
+#  All use O(1) memory.  The robust noise ceiling is
+#      median + CALIB_NOISE_SIGMAS × 1.4826 × MAD
+#  (≈ the max of clean noise over a calibration window, but a single 100×
+#  outlier moves it by well under 2×).  threshold = ceiling ×
+#  CALIB_NOISE_MULTIPLIER, clamped to [CALIB_THRESHOLD_MIN, CALIB_THRESHOLD_MAX].
+#  A high quantile (p95+) is not used directly: P² is unstable in the tails
+#  for windows as short as CALIB_FRAMES_NEEDED.
+#
+#  BackgroundRecalibrator keeps refining the threshold during play from
+#  frames where the player is standing still.
+# =============================================================================
+from config import (
+    CALIB_NOISE_SIGMAS, CALIB_NOISE_MULTIPLIER,
+    CALIB_THRESHOLD_MIN, CALIB_THRESHOLD_MAX,
+    CALIB_BACKGROUND_FRAMES, CALIB_BACKGROUND_BLEND,
+)
+
+
+class RunningStats:
+    """Welford's online mean / variance."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+class P2Quantile:
+    """P² single-quantile estimator — five markers, no sample storage."""
+
+    def __init__(self, p):
+        self.p = p
+        self._initial = []
+        self._q = None                      # marker heights
+        self._n = None                      # marker positions
+        self._np = None                     # desired positions
+        self._dn = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x):
+        if self._q is None:
+            self._initial.append(x)
+            if len(self._initial) == 5:
+                self._initial.sort()
+                p = self.p
+                self._q = list(self._initial)
+                self._n = [0, 1, 2, 3, 4]
+                self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+            return
+
+        q, n = self._q, self._n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        for i in (1, 2, 3):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def value(self):
+        if self._q is not None:
+            return self._q[2]
+        if not self._initial:
+            return None
+        ordered = sorted(self._initial)
+        return ordered[int(round(self.p * (len(ordered) - 1)))]
+
+
+class NoiseCalibrator:
+    """Turns a stream of idle shoulder deltas into a bounce threshold."""
+
+    def __init__(self, sigmas=None, multiplier=None):
+        # None → follow the (hot-reloadable) config value at use time
+        self._sigmas = sigmas
+        self._multiplier = multiplier
+        self.reset()
+
+    @property
+    def sigmas(self):
+        return CALIB_NOISE_SIGMAS if self._sigmas is None else self._sigmas
+
+    @property
+    def multiplier(self):
+        return CALIB_NOISE_MULTIPLIER if self._multiplier is None else self._multiplier
+
+    def reset(self):
+        self.stats = RunningStats()
+        self._median = P2Quantile(0.5)
+        self._mad = P2Quantile(0.5)
+
+    @property
+    def frames(self):
+        return self.stats.n
+
+    def add(self, delta):
+        self.stats.add(delta)
+        # Deviation from the median estimate so far (streaming MAD approximation)
+        median = self._median.value()
+        self._mad.add(abs(delta - median) if median is not None else 0.0)
+        self._median.add(delta)
+
+    def noise_level(self):
+        """Robust noise ceiling: median + sigmas × scaled MAD (None before any sample)."""
+        median = self._median.value()
+        if median is None:
+            return None
+        return median + self.sigmas * 1.4826 * self._mad.value()
+
+    def threshold(self):
+        noise = self.noise_level()
+        if noise is None:
+            return None
+        return max(CALIB_THRESHOLD_MIN, min(CALIB_THRESHOLD_MAX, noise * self.multiplier))
+
+
+class BackgroundRecalibrator:
+    """
+    Refines the threshold during play.  Idle deltas are collected into a fresh
+    NoiseCalibrator; every CALIB_BACKGROUND_FRAMES samples its threshold is
+    blended into the live one and the window restarts.
+    """
+
+    def __init__(self, window=None, blend=None):
+        self._window = window
+        self._blend = blend
+        self._calibrator = NoiseCalibrator()
+
+    @property
+    def window(self):
+        return CALIB_BACKGROUND_FRAMES if self._window is None else self._window
+
+    @property
+    def blend(self):
+        return CALIB_BACKGROUND_BLEND if self._blend is None else self._blend
+
+    def reset(self):
+        self._calibrator.reset()
+
+    def observe(self, delta, current_threshold):
+        """Feeds one idle delta; returns the updated threshold when a window completes."""
+        if self.window <= 0:
+            return None
+        self._calibrator.add(delta)
+        if self._calibrator.frames < self.window:
+            return None
+        fresh = self._calibrator.threshold()
+        self._calibrator.reset()
+        return current_threshold + self.blend * (fresh - current_threshold)
@@ -0,0 +1,54 @@
+from vision.landmarks import Landmark
+from config import LANDMARK_MIN_VISIBILITY, LANDMARK_HOLD_DECAY
+
+
+def _score(lm):
+    vis = lm.visibility if lm.visibility is not None else 1.0
+    presence = getattr(lm, 'presence', None)
+    return vis if presence is None else min(vis, presence)
+
+
+class LandmarkFilter:
+    """
+    Gates every joint on its visibility / presence score.
+
+    A joint scoring at least LANDMARK_MIN_VISIBILITY is passed through and
+    remembered.  Below that, the last good position is held and its
+    confidence decays by LANDMARK_HOLD_DECAY per frame, so an off-screen
+    wrist keeps its last plausible angle but reports it with fading
+    confidence instead of garbage.  Output landmarks carry that confidence
+    in .visibility.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._held = None     # list[Landmark] — last good value per joint
+
+    def apply(self, landmarks):
+        held = self._held
+        if held is None or len(held) != len(landmarks):
+            held = self._held = [None] * len(landmarks)
+
+        out = []
+        for i, lm in enumerate(landmarks):
+            score = _score(lm)
+            if score >= LANDMARK_MIN_VISIBILITY:
+                good = Landmark(lm.x, lm.y, lm.z or 0.0, score, score)
+                held[i] = good
+                out.append(good)
+            elif held[i] is not None:
+                prev = held[i]
+                conf = prev.visibility * LANDMARK_HOLD_DECAY
+                held[i] = Landmark(prev.x, prev.y, prev.z, conf, conf)
+                out.append(held[i])
+            else:
+                # Never seen well — pass through with its (low) score
+                out.append(Landmark(lm.x, lm.y, lm.z or 0.0, score, score))
+        return out
+
+
+def joint_confidence(landmarks, *indices):
+    """Confidence of a derived value = weakest of the joints it uses."""
+    return min(landmarks[i].visibility for i in indices)
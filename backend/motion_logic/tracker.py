@@ -0,0 +1,155 @@
+# =============================================================================
+#  tracker.py  —  Per-player motion state machine
+#
+#  Turns one landmark list per tick into one telemetry dict:
+#      CALIBRATING → ACTIVE
+#  All state lives on a PlayerTracker instance, so a new player / a
+#  recalibration is a reset() in place — no model reload, no camera reopen.
+# =============================================================================
+from config import (
+    CENTER_LEFT_LIMIT, CENTER_RIGHT_LIMIT,
+    CALIB_FRAMES_NEEDED, CALIB_PROGRESS_FRAMES,
+    BOUNCE_THRESHOLD,
+)
+from motion_logic.calibration import NoiseCalibrator, BackgroundRecalibrator
+from motion_logic.walking import WalkState
+from motion_logic.turning import calculate_turn_signal
+from motion_logic.gesture_detection import calculate_arm_angle, calculate_wiper_angle
+from motion_logic.landmark_filter import LandmarkFilter, joint_confidence
+from motion_logic.answer_gesture import AnswerGestureRecognizer
+
+
+class PlayerTracker:
+    """Calibration + walk + turn + arm logic for one tracked player."""
+
+    def __init__(self, on_calibrated=None, center_x=0.5, name="P1"):
+        # on_calibrated(tracker) is called once each time calibration completes
+        self.on_calibrated = on_calibrated
+        # Lane centre: lock / turn limits are applied relative to it, so a
+        # duo player standing at x=0.25 leans exactly like a solo one at 0.5
+        self.center_x = center_x
+        self.name = name
+        self.noise_calibrator = NoiseCalibrator()            # streaming, O(1) memory
+        self.background_calibrator = BackgroundRecalibrator()  # refines threshold during play
+        self.walk = WalkState()
+        self.landmark_filter = LandmarkFilter()  # visibility gating between MediaPipe and gestures
+        self.answer_recognizer = AnswerGestureRecognizer()  # telemetry → debounced quiz answers
+        self.recalibrate()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def recalibrate(self):
+        """Back to CALIBRATING with a fresh noise estimate; run state cleared."""
+        self.system_state = "CALIBRATING"   # CALIBRATING -> ACTIVE
+        self.bounce_threshold = BOUNCE_THRESHOLD  # Overwritten after calibration
+        self.calibration_frames = 0
+        self.noise_calibrator.reset()
+        self.background_calibrator.reset()
+        self.reset_run()
+
+    def reset_run(self):
+        """Clears steps / momentum but keeps the calibrated threshold."""
+        self.prev_y = 0
+        self.center_lock_active = False
+        self.walk.reset()
+        self.landmark_filter.reset()
+        self.answer_recognizer.reset()
+
+    # ── Per-tick ──────────────────────────────────────────────────────────────
+    def update(self, landmarks, now):
+        # Default Values
+        status_msg = "NO PLAYER"
+        turn_signal = "CENTER"
+        calib_progress = 0.0
+        left_arm = 0
+        right_arm = 0
+        left_wave = 0
+        right_wave = 0
+        confidence = {'l_arm': 0.0, 'r_arm': 0.0, 'l_wave': 0.0, 'r_wave': 0.0}
+
+        if landmarks:
+            landmarks = self.landmark_filter.apply(landmarks)
+            nose_x = landmarks[0].x - self.center_x + 0.5
+
+            # --- 1. PLAYER LOCK (Initial Check) ---
+            # During calibration, strictly enforce center.
+            # During game, allow leaning (wider zone).
+            calibrating = self.system_state == "CALIBRATING"
+            lock_limit_l = CENTER_LEFT_LIMIT if calibrating else 0.1
+            lock_limit_r = CENTER_RIGHT_LIMIT if calibrating else 0.9
+
+            if nose_x < lock_limit_l or nose_x > lock_limit_r:
+                self.center_lock_active = False
+                status_msg = "STEP CENTER"
+            else:
+                self.center_lock_active = True
+
+                # Get Shoulders (for walking)
+                shoulder_y = (landmarks[11].y + landmarks[12].y) / 2
+                delta = abs(shoulder_y - self.prev_y)
+
+                # --- 2. AUTO-CALIBRATION PHASE ---
+                if calibrating:
+                    self.calibration_frames += 1
+                    self.noise_calibrator.add(delta)
+                    calib_progress = min(1.0, self.calibration_frames / CALIB_PROGRESS_FRAMES)
+                    status_msg = "CALIBRATING"
+
+                    if self.calibration_frames > CALIB_FRAMES_NEEDED:
+                        self.bounce_threshold = self.noise_calibrator.threshold()
+                        self.system_state = "ACTIVE"
+                        if self.on_calibrated:
+                            self.on_calibrated(self)
+
+                # --- 3. ACTIVE GAME PHASE ---
+                else:
+                    status_msg = "IDLE"
+
+                    # A. WALK LOGIC
+                    walk = self.walk
+                    walk.update(shoulder_y, self.prev_y, delta, self.bounce_threshold, now)
+
+                    # Background recalibration from standing-still frames
+                    if walk.is_idle:
+                        refined = self.background_calibrator.observe(delta, self.bounce_threshold)
+                        if refined is not None:
+                            self.bounce_threshold = refined
+
+                    if walk.is_walking: status_msg = "WALKING"
+
+                    # B. TURN LOGIC (Leaning)
+                    turn_signal = calculate_turn_signal(nose_x)
+
+                    # C. ARM LOGIC (Shadow Man)
+                    left_arm = calculate_arm_angle(landmarks[11], landmarks[15])
+                    right_arm = calculate_arm_angle(landmarks[12], landmarks[16])
+
+                    # Wave (Elbow -> Wrist Vector)
+                    # Left: 13->15. Right: 14->16.
+                    left_wave = calculate_wiper_angle(landmarks[13], landmarks[15])
+                    right_wave = calculate_wiper_angle(landmarks[14], landmarks[16])
+
+                    # D. CONFIDENCE (weakest joint behind each angle)
+                    confidence = {
+                        'l_arm': joint_confidence(landmarks, 11, 15),
+                        'r_arm': joint_confidence(landmarks, 12, 16),
+                        'l_wave': joint_confidence(landmarks, 13, 15),
+                        'r_wave': joint_confidence(landmarks, 14, 16),
+                    }
+
+                self.prev_y = shoulder_y
+
+        return {
+            'status': status_msg,
+            'steps': self.walk.step_count,
+            'momentum': round(self.walk.momentum, 2),
+            'turn': turn_signal,     # LEFT, RIGHT, or CENTER
+            'l_arm': int(left_arm),
+            'r_arm': int(right_arm),
+            'l_wave': int(left_wave),
+            'r_wave': int(right_wave),
+            'l_arm_conf': round(confidence['l_arm'], 2),
+            'r_arm_conf': round(confidence['r_arm'], 2),
+            'l_wave_conf': round(confidence['l_wave'], 2),
+            'r_wave_conf': round(confidence['r_wave'], 2),
+            'calibration': round(calib_progress, 2)
+        }
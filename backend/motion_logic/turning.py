@@ -0,0 +1,11 @@
+from config import TURN_LEFT_TRIGGER, TURN_RIGHT_TRIGGER
+
+
+def calculate_turn_signal(nose_x):
+    """Lean direction from nose X: "LEFT", "RIGHT" or "CENTER" """
+    # Simple X-Axis check on Nose
+    if nose_x < TURN_LEFT_TRIGGER:
+        return "LEFT"
+    if nose_x > TURN_RIGHT_TRIGGER:
+        return "RIGHT"
+    return "CENTER"
@@ -0,0 +1,42 @@
+from config import (
+    STARTUP_STEPS_REQUIRED, STOP_TIMEOUT,
+    STEP_COOLDOWN, MOMENTUM_GAIN, MOMENTUM_DECAY,
+)
+
+
+class WalkState:
+    """Walking-in-place detector: shoulder bounce → steps + momentum (0 … 1)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.momentum = 0
+        self.last_step_time = 0
+        self.step_count = 0
+        self.consecutive_steps = 0
+        self.is_walking = False
+
+    def update(self, shoulder_y, prev_y, delta, threshold, now):
+        if delta > threshold:
+            self.momentum += MOMENTUM_GAIN
+            is_moving_down = shoulder_y > prev_y
+            if is_moving_down and (now - self.last_step_time > STEP_COOLDOWN):
+                self.step_count += 1
+                self.consecutive_steps += 1
+                self.last_step_time = now
+                if self.consecutive_steps >= STARTUP_STEPS_REQUIRED:
+                    self.is_walking = True
+        else:
+            self.momentum *= MOMENTUM_DECAY
+            if (now - self.last_step_time) > STOP_TIMEOUT:
+                self.consecutive_steps = 0
+                self.is_walking = False
+
+        # Clamp Momentum
+        self.momentum = max(0, min(1, self.momentum))
+
+    @property
+    def is_idle(self):
+        """Standing still — safe to sample for background recalibration"""
+        return not self.is_walking and self.consecutive_steps == 0
@@ -0,0 +1,145 @@
+# =============================================================================
+#  bank.py  —  Offline question bank (SQLite + FTS5 topic search)
+#
+#  Used when there's no GEMINI_API_KEY, or when generation fails or runs over
+#  QUESTION_LLM_TIMEOUT.  Questions are stored with their topic and indexed by
+#  an FTS5 table over (topic, text), so a request for "planets" also finds
+#  questions filed under "Solar System" that mention planets — ranked by
+#  bm25 with topic matches weighted above text matches.
+#
+#  Bulk load from JSON (run from backend/):
+#      python -m questions.bank load my_questions.json
+#  Accepted shapes:
+#      [{"topic": ..., "text": ..., "correct_answer": ..., "wrong_answer": ...}, ...]
+#      {"<topic>": [{"text": ..., "correct_answer": ..., "wrong_answer": ...}, ...], ...}
+# =============================================================================
+import json
+import os
+import sqlite3
+import sys
+
+from questions.pool import normalize_text, question_key, validate_item
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id      INTEGER PRIMARY KEY,
+    key     TEXT NOT NULL UNIQUE,
+    topic   TEXT NOT NULL,
+    text    TEXT NOT NULL,
+    correct TEXT NOT NULL,
+    wrong   TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    topic, text, content='questions', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS questions_ai AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts(rowid, topic, text) VALUES (new.id, new.topic, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_ad AFTER DELETE ON questions BEGIN
+    INSERT INTO questions_fts(questions_fts, rowid, topic, text)
+    VALUES ('delete', old.id, old.topic, old.text);
+END;
+"""
+
+# bm25 column weights: (topic, text) — lower score = better match
+_SEARCH = """
+SELECT q.text, q.correct, q.wrong
+FROM questions_fts JOIN questions q ON q.id = questions_fts.rowid
+WHERE questions_fts MATCH ?
+ORDER BY bm25(questions_fts, 4.0, 1.0)
+LIMIT ?
+"""
+
+
+def _fts_query(topic):
+    """'Solar System!' → '"solar" OR "system"' (quoted: no FTS operator injection)."""
+    tokens = [t for t in normalize_text(topic).split() if len(t) > 1]
+    return ' OR '.join(f'"{t}"' for t in dict.fromkeys(tokens))
+
+
+def _iter_json_items(data):
+    """Flattens either accepted JSON shape into (topic, raw_item) pairs."""
+    if isinstance(data, dict):
+        for topic, items in data.items():
+            for item in items if isinstance(items, list) else ():
+                yield topic, item
+    elif isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                yield item.get('topic', ''), item
+
+
+class QuestionBank:
+    """Thin wrapper over one SQLite file; all methods are millisecond-scale."""
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def count(self):
+        return self._db.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def add(self, pairs):
+        """
+        Inserts (topic, raw_item) pairs in one transaction.  Items failing
+        validate_item() or already present (same normalised text) are skipped.
+        Returns the number of rows inserted.
+        """
+        rows = []
+        for topic, raw in pairs:
+            item = validate_item(raw)
+            topic = str(topic).strip()
+            if item is None or not topic:
+                continue
+            rows.append((question_key(item['text']), topic,
+                         item['text'], item['correct'], item['wrong']))
+        with self._db:
+            cur = self._db.executemany(
+                "INSERT OR IGNORE INTO questions (key, topic, text, correct, wrong) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+        return max(cur.rowcount, 0)
+
+    def load_json(self, path):
+        """Bulk-loads a JSON file (see module header for accepted shapes)."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.add(_iter_json_items(json.load(f)))
+
+    def search(self, topic, limit):
+        """
+        Best `limit` matches for `topic` as raw items ({text, correct_answer,
+        wrong_answer}, the LLM's shape) so they go through QuestionPool the same
+        way generated batches do.  Only real matches — may return fewer.
+        """
+        query = _fts_query(topic)
+        rows = self._db.execute(_SEARCH, (query, limit)).fetchall() if query else []
+        return [{'text': t, 'correct_answer': c, 'wrong_answer': w} for t, c, w in rows]
+
+    def sample(self, limit, exclude=()):
+        """Up to `limit` random rows from any topic, skipping texts in `exclude`."""
+        exclude = set(exclude)
+        rows = self._db.execute(
+            "SELECT text, correct, wrong FROM questions ORDER BY random() LIMIT ?",
+            (limit + len(exclude),)).fetchall()
+        return [{'text': t, 'correct_answer': c, 'wrong_answer': w}
+                for t, c, w in rows if t not in exclude][:limit]
+
+    def close(self):
+        self._db.close()
+
+
+if __name__ == '__main__':
+    from config import QUESTION_BANK_FILE
+
+    if len(sys.argv) < 3 or sys.argv[1] != 'load':
+        print("usage: python -m questions.bank load <file.json> [...]")
+        sys.exit(2)
+
+    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           QUESTION_BANK_FILE)
+    bank = QuestionBank(db_path)
+    for json_path in sys.argv[2:]:
+        added = bank.load_json(json_path)
+        print(f"[BANK] {json_path}: {added} questions added.")
+    print(f"[BANK] {bank.count()} questions in {db_path}")
+    bank.close()
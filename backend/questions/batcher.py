@@ -0,0 +1,174 @@
+# =============================================================================
+#  batcher.py  —  Coalesces question requests into multi-topic Gemini calls
+#
+#  A classroom signing up at once sends a burst of request_questions, each
+#  with its own topic.  Instead of one Gemini round-trip per request, the
+#  first request opens a LLM_BATCH_WINDOW-second window; every request
+#  arriving inside it joins the same call:
+#
+#      request(topic) ─► pending ──(window ends, or LLM_BATCH_MAX_REQUESTS)──►
+#          one generate_batch({topic: QUESTIONS_PER_TOPIC × requests})
+#          ─► {topic: raw list} ─► each waiter gets its topic's raw list
+#
+#  Requests for the same topic share one entry with a larger question count,
+#  so each of them still gets fresh questions through QuestionPool.  A failed
+#  call fails every waiter in it; a topic missing from the response fails
+#  only its own waiters — either way the handler falls back to the bank as
+#  before.
+#
+#  GreenBatcher serves server.py (eventlet), AsyncBatcher server_async.py.
+# =============================================================================
+import asyncio
+import logging
+import time
+
+from config import LLM_BATCH_WINDOW, LLM_BATCH_MAX_REQUESTS
+from questions.gemini import QUESTIONS_PER_TOPIC
+
+log = logging.getLogger(__name__)
+
+
+class _Batcher:
+    """Pending-request bookkeeping shared by both server modes."""
+
+    def __init__(self, fetch, window=LLM_BATCH_WINDOW, max_requests=LLM_BATCH_MAX_REQUESTS):
+        self.fetch = fetch              # {topic: count} → {topic: raw list}
+        self.window = window
+        self.max_requests = max(1, max_requests)
+        self._pending = []              # (topic, waiter) in arrival order
+        self.calls = 0
+        self.requests = 0
+
+    def _take(self):
+        """Empties the pending list → ({topic: count}, {topic: [waiters]})."""
+        waiters = {}
+        for topic, waiter in self._pending:
+            waiters.setdefault(topic, []).append(waiter)
+        self._pending = []
+        counts = {topic: QUESTIONS_PER_TOPIC * len(w) for topic, w in waiters.items()}
+        return counts, waiters
+
+    def _log_call(self, counts, waiters, started):
+        self.calls += 1
+        self.requests += sum(len(w) for w in waiters.values())
+        log.info(f"[LLM] Batched {sum(len(w) for w in waiters.values())} request(s) over "
+                 f"{len(counts)} topic(s) into one call ({time.perf_counter() - started:.2f}s; "
+                 f"{self.requests} requests in {self.calls} calls so far)")
+
+    @staticmethod
+    def _missing(topic):
+        return ValueError(f"Batched response had no questions for '{topic}'")
+
+
+class GreenBatcher(_Batcher):
+    """Eventlet version: request() blocks the calling greenthread only."""
+
+    def __init__(self, fetch, **kwargs):
+        super().__init__(fetch, **kwargs)
+        self._timer = None
+
+    def request(self, topic):
+        """Raw question list for `topic` (raises if the call or the topic failed)."""
+        from eventlet import hubs
+        from eventlet.event import Event
+
+        if self.window <= 0:
+            return self.fetch({topic: QUESTIONS_PER_TOPIC})[topic]
+        waiter = Event()
+        self._pending.append((topic, waiter))
+        if len(self._pending) >= self.max_requests:
+            self._cancel_timer()
+            self._spawn_send()
+        elif self._timer is None:
+            # A plain hub timer: unlike GreenThread.cancel(), cancelling it never yields
+            self._timer = hubs.get_hub().schedule_call_global(self.window, self._on_window_end)
+        return waiter.wait()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_window_end(self):
+        self._timer = None
+        if self._pending:
+            self._spawn_send()
+
+    def _spawn_send(self):
+        import eventlet
+        eventlet.spawn_n(self._send, *self._take())
+
+    def _send(self, counts, waiters):
+        started = time.perf_counter()
+        try:
+            result = self.fetch(counts)
+        except Exception as e:
+            result, error = {}, e
+        else:
+            error = None
+            self._log_call(counts, waiters, started)
+        for topic, group in waiters.items():
+            for waiter in group:
+                if error is not None:
+                    waiter.send_exception(error)
+                elif topic in result:
+                    waiter.send(result[topic])
+                else:
+                    waiter.send_exception(self._missing(topic))
+
+
+class AsyncBatcher(_Batcher):
+    """asyncio version: `fetch` is a coroutine function."""
+
+    def __init__(self, fetch, **kwargs):
+        super().__init__(fetch, **kwargs)
+        self._timer = None
+        self._sending = set()           # strong refs: the loop only keeps weak ones
+
+    async def request(self, topic):
+        if self.window <= 0:
+            return (await self.fetch({topic: QUESTIONS_PER_TOPIC}))[topic]
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._pending.append((topic, waiter))
+        if len(self._pending) >= self.max_requests:
+            self._cancel_timer()
+            self._spawn_send()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._on_window_end)
+        return await waiter
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_window_end(self):
+        self._timer = None
+        if self._pending:
+            self._spawn_send()
+
+    def _spawn_send(self):
+        task = asyncio.get_running_loop().create_task(self._send(*self._take()))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, counts, waiters):
+        started = time.perf_counter()
+        try:
+            result = await self.fetch(counts)
+        except Exception as e:
+            result, error = {}, e
+        else:
+            error = None
+            self._log_call(counts, waiters, started)
+        for topic, group in waiters.items():
+            for waiter in group:
+                if waiter.done():       # its handler timed out (wait_for cancelled it)
+                    continue
+                if error is not None:
+                    waiter.set_exception(error)
+                elif topic in result:
+                    waiter.set_result(result[topic])
+                else:
+                    waiter.set_exception(self._missing(topic))
@@ -0,0 +1,162 @@
+# =============================================================================
+#  gemini.py  —  Gemini REST calls for quiz generation
+#
+#  Direct HTTP — no SDK version issues.  gemini-2.5-flash on the free tier via
+#  v1beta; the API key goes in a header, not the URL, to keep it out of logs.
+#  generate() is the blocking `requests` version used by the eventlet server
+#  (monkey-patched, so it yields); generate_async() uses aiohttp for the
+#  asyncio server.  Both return the raw parsed list — validation is
+#  QuestionPool's job.
+#
+#  generate_batch() / generate_batch_async() ask for several topics in one
+#  call ({topic: question count} → {topic: raw list}); questions/batcher.py
+#  decides when.  A topic the model left out is simply missing from the
+#  result.
+# =============================================================================
+import json
+import os
+import re
+
+API_KEY = os.environ.get("GEMINI_API_KEY", "").strip()
+# GEMINI_API_URL points the servers at a stand-in (tools/load_test.py runs one)
+URL = os.environ.get("GEMINI_API_URL", "").strip() or (
+    "https://generativelanguage.googleapis.com"
+    "/v1beta/models/gemini-2.5-flash:generateContent"
+)
+HTTP_TIMEOUT = 30  # seconds; callers apply their own, shorter QUESTION_LLM_TIMEOUT
+QUESTIONS_PER_TOPIC = 15
+
+_ITEM_SCHEMA = ('{"text": "Question text?", "correct_answer": "the correct answer text only", '
+                '"wrong_answer": "one plausible but wrong answer text only"}')
+_ITEM_RULES = (
+    '- Do NOT include "A)" or "B)" prefixes — just plain answer text.\n'
+    '- The correct_answer must be factually accurate.\n'
+    '- The wrong_answer must be plausible but clearly incorrect.\n'
+    '- Output raw JSON only.'
+)
+
+
+def _request(prompt):
+    headers = {"x-goog-api-key": API_KEY}
+    payload = {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {"temperature": 0.7}
+    }
+    return URL, headers, payload
+
+
+def build_request(topic):
+    """(url, headers, json payload) for one 15-question batch about `topic`."""
+    prompt = (
+        f'Generate exactly {QUESTIONS_PER_TOPIC} trivia questions about the topic: "{topic}".\n'
+        'Return ONLY a valid JSON array — no markdown, no explanation, no code fences.\n'
+        'Each element must strictly follow this schema exactly:\n'
+        f'[{_ITEM_SCHEMA}]\n'
+        'Rules:\n'
+        f'- Exactly {QUESTIONS_PER_TOPIC} elements.\n'
+        + _ITEM_RULES
+    )
+    return _request(prompt)
+
+
+def build_batch_request(counts):
+    """(url, headers, json payload) for several topics at once; counts = {topic: questions}."""
+    topics = [{"id": i, "topic": topic, "count": count}
+              for i, (topic, count) in enumerate(counts.items(), 1)]
+    prompt = (
+        'Generate trivia questions for each of these topics:\n'
+        f'Topics: {json.dumps(topics, ensure_ascii=False)}\n'
+        'Return ONLY a valid JSON array with one element per topic — no markdown, no explanation, no code fences.\n'
+        'Each element must strictly follow this schema exactly:\n'
+        f'[{{"id": 1, "questions": [{_ITEM_SCHEMA}]}}]\n'
+        'Rules:\n'
+        '- "id" is the topic\'s id; "questions" has exactly "count" elements, all about that topic only.\n'
+        + _ITEM_RULES
+    )
+    return _request(prompt)
+
+
+def _response_json(data):
+    try:
+        raw = data["candidates"][0]["content"]["parts"][0]["text"].strip()
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Unexpected API response structure: {e}") from e
+
+    # Strip markdown fences if the model adds them despite instructions
+    raw = re.sub(r'^```(?:json)?\s*', '', raw, flags=re.IGNORECASE)
+    raw = re.sub(r'\s*```$', '', raw)
+    return json.loads(raw)
+
+
+def parse_response(data):
+    """Gemini response JSON → list of raw question dicts (ValueError if malformed)."""
+    questions_raw = _response_json(data)
+    if not isinstance(questions_raw, list):
+        raise ValueError(f"Expected a JSON array, got {type(questions_raw).__name__}")
+    return questions_raw
+
+
+def parse_batch_response(data, counts):
+    """Batch response → {topic: raw question list}; malformed or missing topics are left out."""
+    entries = _response_json(data)
+    if not isinstance(entries, list):
+        raise ValueError(f"Expected a JSON array, got {type(entries).__name__}")
+    topics = list(counts)
+    result = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("questions"), list):
+            continue
+        topic_id = entry.get("id")
+        if isinstance(topic_id, int) and 1 <= topic_id <= len(topics):
+            result.setdefault(topics[topic_id - 1], entry["questions"])
+    return result
+
+
+def generate(topic):
+    import requests  # deferred: keeps it off the startup path
+
+    url, headers, payload = build_request(topic)
+    resp = requests.post(url, json=payload, headers=headers, timeout=HTTP_TIMEOUT)
+    resp.raise_for_status()
+    return parse_response(resp.json())
+
+
+def generate_batch(counts):
+    """{topic: question count} → {topic: raw list}; one 15-question topic uses the plain prompt."""
+    if len(counts) == 1 and next(iter(counts.values())) <= QUESTIONS_PER_TOPIC:
+        topic = next(iter(counts))
+        return {topic: generate(topic)}
+    import requests
+
+    url, headers, payload = build_batch_request(counts)
+    resp = requests.post(url, json=payload, headers=headers, timeout=HTTP_TIMEOUT)
+    resp.raise_for_status()
+    return parse_batch_response(resp.json(), counts)
+
+
+async def generate_async(topic, session=None):
+    """aiohttp version of generate(); pass a shared ClientSession to reuse connections."""
+    import aiohttp
+
+    url, headers, payload = build_request(topic)
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+    try:
+        async with session.post(url, json=payload, headers=headers) as resp:
+            resp.raise_for_status()
+            return parse_response(await resp.json())
+    finally:
+        if own_session:
+            await session.close()
+
+
+async def generate_batch_async(counts, session):
+    """aiohttp version of generate_batch(); `session` is the caller's ClientSession."""
+    if len(counts) == 1 and next(iter(counts.values())) <= QUESTIONS_PER_TOPIC:
+        topic = next(iter(counts))
+        return {topic: await generate_async(topic, session)}
+    url, headers, payload = build_batch_request(counts)
+    async with session.post(url, json=payload, headers=headers) as resp:
+        resp.raise_for_status()
+        return parse_batch_response(await resp.json(), counts)
@@ -0,0 +1,154 @@
+# =============================================================================
+#  pool.py  —  Post-generation validation and de-duplication of quiz questions
+#
+#  Gemini batches regularly contain near-duplicates ("What is 7×8?" / "What
+#  is 7 x 8") or degenerate items where both answers are the same.  Every raw
+#  item is normalised, validated and keyed by a hash of its normalised text:
+#
+#      raw batch ─► validate ─► drop keys seen in this batch / topic history
+#                                   │
+#                     first QUESTION_BATCH_SIZE ─► served (keys → history)
+#                     the rest                  ─► per-topic cache
+#
+#  A batch that comes up short is topped up from the topic cache (unseen items
+#  first, then the least recently served) instead of failing the request.
+#  Off-topic filler (the offline bank's random rows) comes last and is never
+#  cached, so it can't resurface later as a spare for the topic.
+# =============================================================================
+import hashlib
+import re
+import unicodedata
+from collections import OrderedDict
+
+from config import (
+    QUESTION_BATCH_SIZE, QUESTION_MIN_BATCH, QUESTION_HISTORY_SIZE,
+    QUESTION_CACHE_SIZE, QUESTION_MAX_TEXT,
+)
+
+_OPTION_PREFIX = re.compile(r'^\s*[\(\[]?[ab][\)\]\.:]\s+', re.IGNORECASE)
+_NON_WORD = re.compile(r'[^\w]+')
+_MULTIPLY = re.compile(r'(?<=\d)\s*[x×*]\s*(?=\d)')
+
+
+def normalize_text(text):
+    """Case/width/punctuation-insensitive form used for comparisons and keys."""
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    text = _OPTION_PREFIX.sub('', text)
+    text = _MULTIPLY.sub(' times ', text)
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+def question_key(text):
+    """Stable 16-hex-digit key of a question's normalised text."""
+    return hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def validate_item(raw):
+    """
+    Returns a clean {text, correct, wrong} dict, or None for degenerate items
+    (missing/empty fields, over-long text, or identical answers).
+    """
+    if not isinstance(raw, dict):
+        return None
+    try:
+        text = str(raw['text']).strip()
+        correct = _OPTION_PREFIX.sub('', str(raw['correct_answer'])).strip()
+        wrong = _OPTION_PREFIX.sub('', str(raw['wrong_answer'])).strip()
+    except KeyError:
+        return None
+
+    if not text or not correct or not wrong:
+        return None
+    if len(text) > QUESTION_MAX_TEXT:
+        return None
+    norm_correct, norm_wrong = normalize_text(correct), normalize_text(wrong)
+    if not normalize_text(text) or not norm_correct or norm_correct == norm_wrong:
+        return None
+    return {'text': text, 'correct': correct, 'wrong': wrong}
+
+
+class QuestionPool:
+    """Per-topic served-history and spare-question cache, keyed by question_key()."""
+
+    def __init__(self):
+        self._history = {}  # topic -> OrderedDict{key: None}, oldest first
+        self._cache = {}    # topic -> OrderedDict{key: item}, oldest first
+
+    @staticmethod
+    def _topic(topic):
+        return normalize_text(topic) or 'general knowledge'
+
+    def build_batch(self, topic, raw_items, filler=()):
+        """
+        Validates and de-duplicates one raw LLM batch for `topic`.
+
+        Returns (questions, stats) where questions is a list of {text, correct,
+        wrong} dicts.  `filler` (off-topic rows) only fills what is still
+        missing after the topic cache, and is never cached for `topic`.
+        Raises ValueError only when fewer than QUESTION_MIN_BATCH usable
+        questions exist even after topping up.
+        """
+        topic = self._topic(topic)
+        history = self._history.setdefault(topic, OrderedDict())
+        cache = self._cache.setdefault(topic, OrderedDict())
+        stats = {'received': len(raw_items), 'invalid': 0, 'duplicate': 0, 'topped_up': 0, 'filler': 0}
+
+        fresh = self._fresh(raw_items, history, (), stats)
+        batch = list(fresh.items())[:QUESTION_BATCH_SIZE]
+        for key, item in list(fresh.items())[QUESTION_BATCH_SIZE:]:
+            self._cache_put(cache, key, item)
+
+        if len(batch) < QUESTION_BATCH_SIZE:
+            chosen = {key for key, _ in batch}
+            # Unseen cached items first, then recycle the least recently served
+            unseen = [(k, v) for k, v in cache.items() if k not in history and k not in chosen]
+            served = [(k, cache[k]) for k in history if k in cache and k not in chosen]
+            extra = (unseen + served)[:QUESTION_BATCH_SIZE - len(batch)]
+            batch.extend(extra)
+            stats['topped_up'] = len(extra)
+
+        extra = []
+        if len(batch) < QUESTION_BATCH_SIZE and filler:
+            extra = list(self._fresh(filler, history, {key for key, _ in batch}, stats).items())
+            extra = extra[:QUESTION_BATCH_SIZE - len(batch)]
+            stats['filler'] = len(extra)
+
+        if len(batch) + len(extra) < QUESTION_MIN_BATCH:
+            raise ValueError(
+                f"Only {len(batch) + len(extra)} usable questions for '{topic}' "
+                f"(need {QUESTION_MIN_BATCH}; {stats['invalid']} invalid, {stats['duplicate']} duplicate)"
+            )
+
+        for key, item in batch:
+            history.pop(key, None)
+            history[key] = None
+            self._cache_put(cache, key, item)
+        for key, _ in extra:                 # remembered, so not repeated — but not cached
+            history.pop(key, None)
+            history[key] = None
+        while len(history) > QUESTION_HISTORY_SIZE:
+            history.popitem(last=False)
+
+        return [item for _, item in batch + extra], stats
+
+    @staticmethod
+    def _fresh(raw_items, history, taken, stats):
+        """Valid items whose keys are new to this batch and to `history`, in order."""
+        fresh = OrderedDict()
+        for raw in raw_items:
+            item = validate_item(raw)
+            if item is None:
+                stats['invalid'] += 1
+                continue
+            key = question_key(item['text'])
+            if key in fresh or key in history or key in taken:
+                stats['duplicate'] += 1
+                continue
+            fresh[key] = item
+        return fresh
+
+    def _cache_put(self, cache, key, item):
+        cache.pop(key, None)
+        cache[key] = item
+        while len(cache) > QUESTION_CACHE_SIZE:
+            cache.popitem(last=False)
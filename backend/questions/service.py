@@ -0,0 +1,124 @@
+# =============================================================================
+#  service.py  —  Turns raw question batches into quiz payloads
+#
+#  Shared by both server modes (server.py / server_async.py): owns the
+#  QuestionPool (validation, de-dup, top-up) and the offline QuestionBank,
+#  and does the A/B option assignment.  No I/O besides SQLite, so it is safe
+#  to call straight from an event handler in either mode.
+# =============================================================================
+import logging
+import os
+import random
+import time
+
+from config import (
+    QUESTION_BANK_FILE, QUESTION_BANK_SEED, QUESTION_BANK_CANDIDATES, QUESTION_BATCH_SIZE,
+)
+from questions.bank import QuestionBank
+from questions.pool import QuestionPool
+
+log = logging.getLogger(__name__)
+
+# Last resort when the bank can't fill a batch
+FALLBACK_QUESTIONS = [
+    {"text": "What is 8 × 7?",                  "optA": "A) 54",   "optB": "B) 56",  "answer": "B"},
+    {"text": "Which is a prime number?",          "optA": "A) 9",    "optB": "B) 11", "answer": "B"},
+    {"text": "What is 144 ÷ 12?",                "optA": "A) 12",   "optB": "B) 13", "answer": "A"},
+    {"text": "Square root of 81?",               "optA": "A) 9",    "optB": "B) 7",  "answer": "A"},
+    {"text": "15% of 200 = ?",                   "optA": "A) 30",   "optB": "B) 25", "answer": "A"},
+    {"text": "True or False: 2³ = 8",            "optA": "A) True",  "optB": "B) False", "answer": "A"},
+    {"text": "How many sides has a hexagon?",     "optA": "A) 5",    "optB": "B) 6",  "answer": "B"},
+    {"text": "0.5 × 0.5 = ?",                   "optA": "A) 0.25", "optB": "B) 0.5", "answer": "A"},
+    {"text": "If f(x) = x² – 4, f(3) = ?",      "optA": "A) 5",    "optB": "B) 9",  "answer": "A"},
+    {"text": "log₂(64) = ?",                     "optA": "A) 5",    "optB": "B) 6",  "answer": "B"},
+]
+
+# DEV_SKIP_AI_QUESTIONS fallback when the bank is empty
+DEV_QUESTIONS = [
+    {"text": "What is the powerhouse of the cell?",  "optA": "A) Mitochondria",    "optB": "B) Nucleus",       "answer": "A"},
+    {"text": "What planet is closest to the Sun?",   "optA": "A) Venus",           "optB": "B) Mercury",      "answer": "B"},
+    {"text": "How many sides does a hexagon have?",  "optA": "A) 6",               "optB": "B) 8",            "answer": "A"},
+    {"text": "What is the chemical symbol for water?", "optA": "A) H2O",           "optB": "B) CO2",          "answer": "A"},
+    {"text": "Who wrote Romeo and Juliet?",           "optA": "A) Shakespeare",     "optB": "B) Dickens",      "answer": "A"},
+    {"text": "What is 7 × 8?",                       "optA": "A) 54",              "optB": "B) 56",           "answer": "B"},
+    {"text": "What gas do plants absorb?",           "optA": "A) Oxygen",          "optB": "B) Carbon Dioxide","answer": "B"},
+    {"text": "What is the largest ocean on Earth?",  "optA": "A) Pacific",         "optB": "B) Atlantic",     "answer": "A"},
+    {"text": "What colour is the sky?",              "optA": "A) Blue",            "optB": "B) Green",        "answer": "A"},
+    {"text": "How many continents are there?",        "optA": "A) 6",               "optB": "B) 7",            "answer": "B"},
+]
+
+
+def assign_options(items):
+    """
+    [{text, correct, wrong}, ...] → [{text, optA, optB, answer}, ...]
+    Backend owns A/B assignment — randomly place correct answer in A or B for each question.
+    This fully eliminates any AI-side answer position bias.
+    """
+    questions = []
+    for q in items:
+        if random.random() < 0.5:
+            # Correct answer is on the left arm (Option A)
+            questions.append({
+                'text':   q['text'],
+                'optA':   f'A) {q["correct"]}',
+                'optB':   f'B) {q["wrong"]}',
+                'answer': 'A'
+            })
+        else:
+            # Correct answer is on the right arm (Option B)
+            questions.append({
+                'text':   q['text'],
+                'optA':   f'A) {q["wrong"]}',
+                'optB':   f'B) {q["correct"]}',
+                'answer': 'B'
+            })
+
+    return questions
+
+
+class QuestionService:
+    def __init__(self, base_dir):
+        self.pool = QuestionPool()  # per-topic served history + spare-question cache
+
+        # Offline question bank (SQLite/FTS5) — fallback when Gemini is missing, slow or failing
+        try:
+            self.bank = QuestionBank(os.path.join(base_dir, QUESTION_BANK_FILE))
+            seed_path = os.path.join(base_dir, QUESTION_BANK_SEED)
+            if self.bank.count() == 0 and os.path.exists(seed_path):
+                log.info(f"[BANK] Seeded {self.bank.load_json(seed_path)} questions from {QUESTION_BANK_SEED}.")
+            log.info(f"[BANK] {self.bank.count()} questions available offline.")
+        except Exception as e:
+            log.warning(f"[BANK] ⚠️ Question bank unavailable: {e}")
+            self.bank = None
+
+    def from_llm(self, topic, questions_raw):
+        """Validated, de-duplicated quiz payload from one raw LLM batch (ValueError if too short)."""
+        items, stats = self.pool.build_batch(topic, questions_raw)
+        log.info(f"[LLM] Batch '{topic}': {stats['received']} received, {stats['invalid']} invalid, "
+                 f"{stats['duplicate']} duplicate, {stats['topped_up']} topped up from cache.")
+
+        if self.bank is not None:
+            self.bank.add((topic, q) for q in questions_raw)  # grows the offline bank
+
+        return assign_options(items)
+
+    def from_bank(self, topic):
+        """Topic-matched questions from the offline bank, or None if it can't fill a batch."""
+        if self.bank is None:
+            return None
+        t0 = time.perf_counter()
+        raw = self.bank.search(topic, QUESTION_BANK_CANDIDATES)
+        # Off-topic rows go in as filler: they only plug the gap to one batch
+        # and are never cached as spares for this topic
+        off_topic = []
+        if len(raw) < QUESTION_BATCH_SIZE:
+            off_topic = self.bank.sample(QUESTION_BATCH_SIZE - len(raw), (q['text'] for q in raw))
+        try:
+            items, stats = self.pool.build_batch(topic, raw, filler=off_topic)
+        except ValueError as e:
+            log.error(f"[BANK] ❌ {e}")
+            return None
+        log.info(f"[BANK] '{topic}': {len(items)} questions in {(time.perf_counter() - t0) * 1000:.1f} ms "
+                 f"({len(raw)} matched, {stats['filler']} random from other topics, "
+                 f"{stats['duplicate']} already served).")
+        return assign_options(items)
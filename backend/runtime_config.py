@@ -0,0 +1,200 @@
+# =============================================================================
+#  runtime_config.py  —  Hot-reloadable overrides for config.py tunables
+#
+#  config.py stays the source of defaults.  backend/config.json holds
+#  on-site overrides ({"TURN_LEFT_TRIGGER": 0.42, ...}) and is re-read when
+#  it changes on disk or when a client sends 'update_config'.
+#
+#  How values reach the hot path
+#  ─────────────────────────────
+#  Modules keep doing `from config import NAME` and reading NAME as a plain
+#  module global — zero extra cost per frame.  RuntimeConfig.bind(module)
+#  registers such a module; every accepted update rewrites those globals.
+#  Updates are validated as a whole first (types, ranges, cross-field
+#  ordering), written to config.json, and only then applied, all at once, so
+#  the game loop never sees a half-applied config and a failed write changes
+#  nothing.  Once the game loop runs, the config is `deferred`:
+#  accepted values wait in .values until the loop calls apply_pending()
+#  between two frames — in server_async.py pipeline.read() runs on another
+#  thread, and its globals must not change mid-frame.
+#
+#  Only names in SCHEMA are hot-reloadable.  Camera / server / model settings
+#  still need a restart.
+# =============================================================================
+import json
+import os
+
+import config
+
+# name → (type, min, max)   (None = unbounded)
+SCHEMA = {
+    # 1-2. Player lock + turn triggers
+    'CENTER_LEFT_LIMIT':      (float, 0.0, 1.0),
+    'CENTER_RIGHT_LIMIT':     (float, 0.0, 1.0),
+    'TURN_LEFT_TRIGGER':      (float, 0.0, 1.0),
+    'TURN_RIGHT_TRIGGER':     (float, 0.0, 1.0),
+    # 3. Hysteresis
+    'STARTUP_STEPS_REQUIRED': (int,   1, 20),
+    'STOP_TIMEOUT':           (float, 0.0, 5.0),
+    # 4. Physics + calibration
+    'STEP_COOLDOWN':          (float, 0.0, 2.0),
+    'MOMENTUM_GAIN':          (float, 0.0, 1.0),
+    'MOMENTUM_DECAY':         (float, 0.0, 1.0),
+    'BOUNCE_THRESHOLD':       (float, 0.0, 0.1),
+    'CALIB_FRAMES_NEEDED':    (int,   5, 600),
+    'CALIB_PROGRESS_FRAMES':  (int,   1, 600),
+    'CALIB_NOISE_SIGMAS':     (float, 0.0, 10.0),
+    'CALIB_NOISE_MULTIPLIER': (float, 0.1, 10.0),
+    'CALIB_THRESHOLD_MIN':    (float, 0.0, 0.1),
+    'CALIB_THRESHOLD_MAX':    (float, 0.0, 0.1),
+    'CALIB_BACKGROUND_FRAMES': (int,  0, 10000),
+    'CALIB_BACKGROUND_BLEND': (float, 0.0, 1.0),
+    # 5. Arm detection
+    'ARM_LIFT_OFFSET':        (float, -1.0, 1.0),
+    'ARM_DEADZONE':           (float, 0.0, 2.0),
+    'ARM_ANGLE_MULTIPLIER':   (float, 1.0, 1000.0),
+    'ANSWER_ARM_THRESHOLD':   (float, 0.0, 180.0),
+    'ANSWER_RELEASE_THRESHOLD': (float, 0.0, 180.0),
+    'ANSWER_MIN_CONFIDENCE':  (float, 0.0, 1.0),
+    'ANSWER_DWELL':           (float, 0.0, 5.0),
+    'LANDMARK_MIN_VISIBILITY': (float, 0.0, 1.0),
+    'LANDMARK_HOLD_DECAY':    (float, 0.0, 1.0),
+    # 6. Loop
+    'LOOP_SLEEP':             (float, 0.0, 0.5),
+    # 8. ROI
+    'ROI_PADDING':            (float, 0.0, 2.0),
+    'ROI_MIN_FRACTION':       (float, 0.0, 1.0),
+    'ROI_LOST_FRAMES':        (int,   1, 300),
+    'ROI_MIN_VISIBILITY':     (float, 0.0, 1.0),
+    # 10. Frame skipping
+    'MOTION_ENERGY_LOW':      (float, 0.0, None),
+    'MOTION_ENERGY_HIGH':     (float, 0.0, None),
+}
+
+# (lower, upper) pairs that must stay strictly ordered
+_ORDERING = [
+    ('CENTER_LEFT_LIMIT', 'TURN_LEFT_TRIGGER'),
+    ('TURN_LEFT_TRIGGER', 'TURN_RIGHT_TRIGGER'),
+    ('TURN_RIGHT_TRIGGER', 'CENTER_RIGHT_LIMIT'),
+    ('CALIB_THRESHOLD_MIN', 'CALIB_THRESHOLD_MAX'),
+    ('MOTION_ENERGY_LOW', 'MOTION_ENERGY_HIGH'),
+    ('ANSWER_RELEASE_THRESHOLD', 'ANSWER_ARM_THRESHOLD'),
+]
+
+CONFIG_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+
+class ConfigError(ValueError):
+    """Raised when an override set fails validation; nothing is applied."""
+
+
+def validate(values):
+    """Checks a complete {name: value} mapping; returns it with types coerced."""
+    clean = {}
+    for name, value in values.items():
+        if name not in SCHEMA:
+            raise ConfigError(f"{name} is not a hot-reloadable setting")
+        kind, lo, hi = SCHEMA[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ConfigError(f"{name} must be a number, got {value!r}")
+        if kind is int:
+            if value != int(value):
+                raise ConfigError(f"{name} must be an integer, got {value!r}")
+            value = int(value)
+        else:
+            value = float(value)
+        if (lo is not None and value < lo) or (hi is not None and value > hi):
+            raise ConfigError(f"{name}={value} is outside [{lo}, {hi}]")
+        clean[name] = value
+
+    for lower, upper in _ORDERING:
+        if lower in clean and upper in clean and not clean[lower] < clean[upper]:
+            raise ConfigError(f"{lower} ({clean[lower]}) must be < {upper} ({clean[upper]})")
+    return clean
+
+
+class RuntimeConfig:
+    """Validated, atomically-applied overrides on top of config.py."""
+
+    def __init__(self, path=CONFIG_JSON):
+        self.path = path
+        self.defaults = {name: getattr(config, name) for name in SCHEMA}
+        self.values = dict(self.defaults)
+        self.deferred = False     # True: bound globals only change in apply_pending()
+        self._pending = False
+        self._modules = []
+        self._mtime = None
+
+    @property
+    def overrides(self):
+        return {k: v for k, v in self.values.items() if v != self.defaults[k]}
+
+    def bind(self, module):
+        """Registers a module whose `from config import NAME` globals follow updates."""
+        if module not in self._modules:
+            self._modules.append(module)
+            self._apply_to(module)
+
+    def load(self):
+        """Re-reads config.json.  An empty or missing file means no overrides."""
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, 'r') as f:
+                text = f.read().strip()
+        except FileNotFoundError:
+            self._mtime = None
+            text = ''
+        try:
+            overrides = json.loads(text) if text else {}
+        except json.JSONDecodeError as e:
+            raise ConfigError(f"config.json is not valid JSON: {e}") from e
+        if not isinstance(overrides, dict):
+            raise ConfigError("config.json must contain a JSON object")
+        return self._commit(validate({**self.defaults, **overrides}))
+
+    def update(self, changes, persist=True):
+        """Applies a partial {name: value} update (e.g. from a socket client)."""
+        if not isinstance(changes, dict):
+            raise ConfigError("Config update must be an object")
+        clean = validate({**self.values, **changes})
+        if persist:
+            self._save(clean)                # an OSError here leaves the old values live
+        return self._commit(clean)
+
+    def apply_pending(self):
+        """Rewrites bound globals with values accepted since the last call (deferred mode)."""
+        if self._pending:
+            self._pending = False
+            for module in self._modules:
+                self._apply_to(module)
+
+    def changed_on_disk(self):
+        try:
+            return os.path.getmtime(self.path) != self._mtime
+        except FileNotFoundError:
+            return self._mtime is not None
+
+    # ── internals ─────────────────────────────────────────────────────────────
+    def _commit(self, clean):
+        changed = {k: v for k, v in clean.items() if self.values.get(k) != v}
+        self.values = clean
+        if self.deferred:
+            self._pending = True
+        else:
+            for module in self._modules:
+                self._apply_to(module)
+        return changed
+
+    def _apply_to(self, module):
+        for name, value in self.values.items():
+            if hasattr(module, name):
+                setattr(module, name, value)
+
+    def _save(self, values):
+        # Write-then-rename so the file watcher never reads a partial file
+        overrides = {k: v for k, v in values.items() if v != self.defaults[k]}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(overrides, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
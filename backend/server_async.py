@@ -0,0 +1,139 @@
+# =============================================================================
+#  server_async.py  —  asyncio server mode (alternative to server.py)
+#
+#  Same Socket.IO events and payloads as server.py — both adapt the shared
+#  handlers in game_server.py — but on socketio.AsyncServer behind uvicorn
+#  (ASGI) instead of eventlet.monkey_patch():
+#
+#    • capture + inference (PosePipeline.read) run on a dedicated executor
+#      thread via run_in_executor, so cv2 / MediaPipe never block the loop
+#    • model load / camera open run on the default executor in parallel
+#    • Gemini calls use aiohttp (questions.gemini.generate_batch_async)
+#
+#  Run from backend/:   python server_async.py      (needs uvicorn + aiohttp)
+#  Not available in this mode yet: the binary spectator video stream
+#  ('subscribe_video') — use server.py for Motion_tracking.py video viewers.
+# =============================================================================
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from logs import setup_logging
+setup_logging()  # queue-backed writer thread (logs.py); before anything logs
+log = logging.getLogger('server_async')
+
+# Load .env file — find_dotenv() walks UP the directory tree until it finds .env
+try:
+    from dotenv import load_dotenv, find_dotenv
+    _dotenv_path = find_dotenv(usecwd=False)  # searches from this file upward
+    if _dotenv_path:
+        load_dotenv(_dotenv_path)
+        log.info(f"✅ .env loaded from: {_dotenv_path}")
+    else:
+        log.warning("⚠️  No .env file found — relying on system environment variables.")
+except ImportError:
+    pass  # python-dotenv not installed; rely on system env vars
+
+import socketio
+
+from questions import gemini
+from questions.batcher import AsyncBatcher
+from game_server import GameServer
+from config import (
+    SERVER_HOST, SERVER_PORT,
+    QUESTION_LLM_TIMEOUT,
+    LATENCY_REPORT_INTERVAL,
+)
+from static_assets import StaticAssets
+from sessions import SessionStore
+
+# --- 0. SERVER SETUP ---
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+
+if gemini.API_KEY:
+    log.info("✅ Gemini REST API ready (gemini-2.5-flash / v1beta, aiohttp).")
+else:
+    log.warning("⚠️  GEMINI_API_KEY not set. Personalization will return fallback questions.")
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+static_files = {
+    '/': '../frontend/index.html',
+    '/leaderboard.html': '../frontend/leaderboard.html',
+    '/assets': '../frontend/assets',
+    '/game': '../frontend/game',
+}
+app = socketio.ASGIApp(sio, other_asgi_app=StaticAssets(static_files, current_dir).asgi)
+
+
+class AsyncGameServer(GameServer):
+    """GameServer hooks on asyncio: AsyncServer calls and executor threads."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # One thread owns the pipeline: capture + inference are serialised
+        # there and never run on the event loop
+        self.pipeline_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pipeline')
+        self.llm_batcher = AsyncBatcher(self._fetch_questions)  # several topics per Gemini call
+        self.http = None  # aiohttp.ClientSession, created on first Gemini call
+
+    async def emit(self, event, data, to=None, room=None):
+        await sio.emit(event, data, to=to, room=room)
+
+    async def enter_room(self, sid, room):
+        await sio.enter_room(sid, room)
+
+    async def leave_room(self, sid, room):
+        await sio.leave_room(sid, room)
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+    async def run_in_threads(self, *calls):
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(loop.run_in_executor(None, call) for call in calls),
+                                    return_exceptions=True)
+
+    async def run_in_pipeline(self, fn):
+        return await asyncio.get_running_loop().run_in_executor(self.pipeline_executor, fn)
+
+    async def request_llm(self, topic):
+        return await asyncio.wait_for(self.llm_batcher.request(topic), QUESTION_LLM_TIMEOUT)
+
+    async def _fetch_questions(self, counts):
+        """{topic: count} → {topic: raw list} over the shared aiohttp session."""
+        if self.http is None or self.http.closed:
+            import aiohttp
+            self.http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=gemini.HTTP_TIMEOUT))
+        return await gemini.generate_batch_async(counts, self.http)
+
+
+game = AsyncGameServer(current_dir, sessions=SessionStore())
+
+for _event in GameServer.EVENTS:
+    sio.on(_event, getattr(game, _event))
+
+log.info("✅ SERVER RUNNING (asyncio)... (Waiting for Dashboard)")
+
+
+async def main():
+    import uvicorn
+
+    # log_config=None: uvicorn's loggers propagate to the root queue handler (logs.py)
+    server = uvicorn.Server(uvicorn.Config(app, host=SERVER_HOST, port=SERVER_PORT,
+                                           log_level='warning', log_config=None))
+    background = [asyncio.create_task(game.start_pipeline()), asyncio.create_task(game.watch_config())]
+    if LATENCY_REPORT_INTERVAL > 0:
+        background.append(asyncio.create_task(game.log_latency()))
+    try:
+        await server.serve()
+    finally:
+        for task in background:
+            task.cancel()
+        if game.http is not None:
+            await game.http.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+# =============================================================================
+#  sessions.py  —  Resumable player sessions
+#
+#  A Socket.IO sid only lives as long as one connection, so a Wi-Fi blip used
+#  to lose the player's registry entry and force another Gemini round-trip.
+#  Each personalised player now gets a random token (sent to the client as
+#  'session_token'); the session keeps the player info and the question set
+#  that was delivered.  After a disconnect it survives SESSION_GRACE_PERIOD
+#  seconds, and 'resume_session' { token } re-attaches it to the new sid.
+#
+#  SessionStore keeps sessions in process memory.  SqliteSessionStore has the
+#  same interface but lives in a SQLite file, so a player can resume on any
+#  worker when server.py is scaled out to several processes (cluster/run.py).
+# =============================================================================
+import json
+import secrets
+import sqlite3
+import time
+
+from config import SESSION_GRACE_PERIOD, SESSION_MAX
+
+
+class Session:
+    __slots__ = ('token', 'info', 'questions', 'sid', 'detached_at')
+
+    def __init__(self, token, info, sid):
+        self.token = token
+        self.info = info            # { name, class, topic }
+        self.questions = None       # last 'questions_ready' payload
+        self.sid = sid
+        self.detached_at = None     # wall-clock time of disconnect, None while connected
+
+
+class SessionStore:
+    def __init__(self):
+        self._sessions = {}  # token → Session
+        self._by_sid = {}    # sid → token
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, sid, info):
+        """New session bound to `sid`; replaces any session the sid already had."""
+        self._expire()
+        old = self._by_sid.pop(sid, None)
+        if old is not None:
+            self._sessions.pop(old, None)
+        while len(self._sessions) >= SESSION_MAX:
+            self._evict_oldest()
+        session = Session(secrets.token_urlsafe(16), info, sid)
+        self._sessions[session.token] = session
+        self._by_sid[sid] = session.token
+        return session
+
+    def get(self, sid):
+        token = self._by_sid.get(sid)
+        return self._sessions.get(token) if token else None
+
+    def set_questions(self, sid, questions):
+        """Stores the delivered question set; returns the session (None if the sid has none)."""
+        session = self.get(sid)
+        if session is not None:
+            session.questions = questions
+        return session
+
+    def attach(self, token, sid):
+        """Re-binds a live or within-grace session to `sid`; None if unknown/expired."""
+        self._expire()
+        session = self._sessions.get(token) if isinstance(token, str) else None
+        if session is None:
+            return None
+        if session.sid is not None:
+            self._by_sid.pop(session.sid, None)
+        session.sid = sid
+        session.detached_at = None
+        self._by_sid[sid] = token
+        return session
+
+    def detach(self, sid):
+        """Starts the grace period for the session bound to `sid` (if any)."""
+        token = self._by_sid.pop(sid, None)
+        session = self._sessions.get(token) if token else None
+        if session is not None:
+            session.sid = None
+            session.detached_at = time.time()
+        self._expire()
+        return session
+
+    def _expire(self):
+        cutoff = time.time() - SESSION_GRACE_PERIOD
+        for token in [t for t, s in self._sessions.items()
+                      if s.detached_at is not None and s.detached_at < cutoff]:
+            del self._sessions[token]
+
+    def _evict_oldest(self):
+        # Detached sessions go first (oldest disconnect), then the oldest created
+        detached = [s for s in self._sessions.values() if s.detached_at is not None]
+        victim = (min(detached, key=lambda s: s.detached_at) if detached
+                  else next(iter(self._sessions.values())))
+        del self._sessions[victim.token]
+        if victim.sid is not None:
+            self._by_sid.pop(victim.sid, None)
+
+
+class SqliteSessionStore:
+    """SessionStore backed by a SQLite file shared between worker processes."""
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    token       TEXT PRIMARY KEY,
+                    info        TEXT NOT NULL,
+                    questions   TEXT,
+                    sid         TEXT UNIQUE,
+                    detached_at REAL,
+                    created_at  REAL NOT NULL
+                )""")
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    @staticmethod
+    def _row_to_session(row):
+        token, info, questions, sid, detached_at = row
+        session = Session(token, json.loads(info), sid)
+        session.questions = json.loads(questions) if questions else None
+        session.detached_at = detached_at
+        return session
+
+    def _select(self, where, arg):
+        row = self._db.execute(
+            "SELECT token, info, questions, sid, detached_at FROM sessions WHERE " + where,
+            (arg,)).fetchone()
+        return self._row_to_session(row) if row else None
+
+    def create(self, sid, info):
+        self._expire()
+        token = secrets.token_urlsafe(16)
+        with self._db:
+            self._db.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+            self._db.execute(
+                "INSERT INTO sessions (token, info, sid, created_at) VALUES (?, ?, ?, ?)",
+                (token, json.dumps(info), sid, time.time()))
+            excess = len(self) - SESSION_MAX
+            if excess > 0:
+                # Detached sessions go first (oldest disconnect), then the oldest created
+                self._db.execute(
+                    "DELETE FROM sessions WHERE token IN (SELECT token FROM sessions "
+                    "ORDER BY detached_at IS NULL, detached_at, created_at LIMIT ?)", (excess,))
+        return self._select("token = ?", token)
+
+    def get(self, sid):
+        return self._select("sid = ?", sid)
+
+    def set_questions(self, sid, questions):
+        with self._db:
+            self._db.execute("UPDATE sessions SET questions = ? WHERE sid = ?",
+                             (json.dumps(questions), sid))
+        return self.get(sid)
+
+    def attach(self, token, sid):
+        self._expire()
+        if not isinstance(token, str):
+            return None
+        with self._db:
+            self._db.execute("UPDATE sessions SET sid = NULL WHERE sid = ?", (sid,))
+            updated = self._db.execute(
+                "UPDATE sessions SET sid = ?, detached_at = NULL WHERE token = ?",
+                (sid, token)).rowcount
+        return self._select("token = ?", token) if updated else None
+
+    def detach(self, sid):
+        session = self.get(sid)
+        if session is not None:
+            session.sid, session.detached_at = None, time.time()
+            with self._db:
+                self._db.execute("UPDATE sessions SET sid = NULL, detached_at = ? WHERE token = ?",
+                                 (session.detached_at, session.token))
+        self._expire()
+        return session
+
+    def _expire(self):
+        with self._db:
+            self._db.execute("DELETE FROM sessions WHERE detached_at IS NOT NULL AND detached_at < ?",
+                             (time.time() - SESSION_GRACE_PERIOD,))
@@ -0,0 +1,225 @@
+# =============================================================================
+#  static_assets.py  —  In-memory, precompressed frontend serving
+#
+#  Replaces WSGIApp(static_files=...), which re-read every file from disk and
+#  sent it uncompressed with no validators.  Here every file under the mapped
+#  paths is read once, hashed and compressed (gzip, plus brotli when the
+#  `brotli` package is installed), then served from memory:
+#
+#    • strong ETag per representation ("<hash>", "<hash>-gz", "<hash>-br")
+#      and 304 Not Modified on a matching If-None-Match
+#    • HTML pages get ?v=<hash> appended to their local src/href references;
+#      requests carrying ?v= are immutable for STATIC_MAX_AGE, everything
+#      else (HTML, ES-module imports) is `no-cache` and revalidates cheaply
+#    • files are re-stat'ed at most every STATIC_CHECK_INTERVAL seconds and
+#      reloaded when they change on disk; pages re-render when a referenced
+#      asset's hash changes
+#  Mounted as a WSGI app (server.py) or through .asgi (server_async.py).
+# =============================================================================
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import posixpath
+import re
+import time
+from urllib.parse import parse_qs
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+from config import STATIC_CHECK_INTERVAL, STATIC_MAX_AGE, STATIC_MIN_COMPRESS
+
+log = logging.getLogger(__name__)
+
+_COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+_LOCAL_REF = re.compile(r'((?:src|href)=")(\.{0,2}/[^"?#:]+)(")')
+
+
+class _Asset:
+    __slots__ = ('path', 'url', 'ctype', 'stamp', 'checked', 'deps',
+                 'etag', 'variants')
+
+    def __init__(self, path, url):
+        self.path = path
+        self.url = url
+        self.ctype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.ctype.startswith('text/') or self.ctype == 'application/javascript':
+            self.ctype += '; charset=utf-8'
+        self.stamp = None     # (mtime_ns, size) of the loaded file
+        self.checked = 0.0
+        self.deps = {}        # HTML only: referenced url → etag baked into the page
+        self.etag = ''
+        self.variants = {}    # encoding ('identity'|'gzip'|'br') → (body, etag)
+
+    def set_body(self, body):
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.etag = f'"{digest}"'
+        self.variants = {'identity': (body, self.etag)}
+        if len(body) >= STATIC_MIN_COMPRESS and self.ctype.startswith(_COMPRESSIBLE):
+            gz = gzip.compress(body, 9, mtime=0)
+            if len(gz) < len(body):
+                self.variants['gzip'] = (gz, f'"{digest}-gz"')
+            if brotli is not None:
+                br = brotli.compress(body, quality=11)
+                if len(br) < len(body):
+                    self.variants['br'] = (br, f'"{digest}-br"')
+
+
+def _accepted(header):
+    """'gzip, br;q=0.8, deflate;q=0' → {'gzip', 'br', 'deflate'} minus q=0 entries."""
+    codings = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        if name and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            codings.add(name.strip().lower())
+    return codings
+
+
+class StaticAssets:
+    """WSGI app serving `static_files` ({url: path}, paths relative to base_dir)."""
+
+    def __init__(self, static_files, base_dir):
+        self._files = {}   # exact url → file path
+        self._dirs = []    # (url prefix, dir path), longest prefix first
+        for url, rel in static_files.items():
+            path = os.path.realpath(os.path.join(base_dir, rel))
+            if os.path.isdir(path):
+                self._dirs.append((url.rstrip('/'), path))
+            else:
+                self._files[url] = path
+        self._dirs.sort(key=lambda d: len(d[0]), reverse=True)
+        self._assets = {}  # url → _Asset
+
+        t0 = time.perf_counter()
+        for url in list(self._files) + [u for d in self._dirs for u in self._walk(*d)]:
+            self._get(url)
+        raw = sum(len(a.variants['identity'][0]) for a in self._assets.values())
+        packed = sum(min(len(b) for b, _ in a.variants.values()) for a in self._assets.values())
+        log.info(f"[STATIC] {len(self._assets)} files, {raw / 1024:.0f} KB → {packed / 1024:.0f} KB "
+                 f"compressed{'' if brotli else ' (gzip only)'} in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    @staticmethod
+    def _walk(prefix, root):
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                rel = os.path.relpath(os.path.join(dirpath, name), root)
+                yield f"{prefix}/{rel.replace(os.sep, '/')}"
+
+    def _resolve(self, url):
+        """Maps a request path to a file on disk (None if unmapped or escaping its dir)."""
+        if url in self._files:
+            return self._files[url]
+        for prefix, root in self._dirs:
+            if url.startswith(prefix + '/'):
+                path = os.path.realpath(os.path.join(root, url[len(prefix) + 1:]))
+                if path.startswith(root + os.sep):
+                    return path
+                return None
+        return None
+
+    def _get(self, url):
+        """Cached asset for `url`, reloading it if the file changed on disk."""
+        asset = self._assets.get(url)
+        now = time.monotonic()
+        if asset is not None and now - asset.checked < STATIC_CHECK_INTERVAL:
+            return asset
+
+        path = asset.path if asset is not None else self._resolve(url)
+        try:
+            st = os.stat(path) if path else None
+        except OSError:
+            st = None
+        if st is None or not os.path.isfile(path):
+            self._assets.pop(url, None)
+            return None
+
+        if asset is None:
+            asset = self._assets[url] = _Asset(path, url)
+        asset.checked = now
+        stamp = (st.st_mtime_ns, st.st_size)
+        stale_deps = any((dep := self._get(u)) is not None and dep.etag != etag
+                         for u, etag in asset.deps.items())
+        if stamp != asset.stamp or stale_deps:
+            with open(path, 'rb') as f:
+                body = f.read()
+            if asset.ctype.startswith('text/html'):
+                body = self._version_refs(asset, body)
+            asset.stamp = stamp
+            asset.set_body(body)
+        return asset
+
+    def _version_refs(self, page, body):
+        """Appends ?v=<hash> to local src/href references in an HTML page."""
+        page.deps = {}
+        base = page.url if page.url.endswith('/') else posixpath.dirname(page.url) + '/'
+
+        def repl(m):
+            url = posixpath.normpath(posixpath.join(base, m.group(2)))
+            dep = self._get(url) if url != page.url else None
+            if dep is None:
+                return m.group(0)
+            page.deps[url] = dep.etag
+            version = dep.etag.strip('"')[:10]
+            return f"{m.group(1)}{m.group(2)}?v={version}{m.group(3)}"
+
+        return _LOCAL_REF.sub(repl, body.decode('utf-8')).encode('utf-8')
+
+    def respond(self, method, path, query, accept_encoding, if_none_match):
+        """Server-agnostic core: returns (status line, header list, body)."""
+        if method not in ('GET', 'HEAD'):
+            return '405 Method Not Allowed', [('Allow', 'GET, HEAD'), ('Content-Length', '0')], b''
+
+        asset = self._get(path or '/')
+        if asset is None:
+            return '404 Not Found', [('Content-Type', 'text/plain'), ('Content-Length', '9')], b'Not Found'
+
+        versioned = 'v' in parse_qs(query)
+        headers = [('Cache-Control', f'public, max-age={STATIC_MAX_AGE}, immutable' if versioned
+                    else 'no-cache')]
+        if len(asset.variants) > 1:
+            headers.append(('Vary', 'Accept-Encoding'))
+
+        accepted = _accepted(accept_encoding)
+        encoding = next((e for e in ('br', 'gzip') if e in asset.variants and e in accepted), 'identity')
+        body, etag = asset.variants[encoding]
+        headers.append(('ETag', etag))
+
+        if if_none_match:
+            tags = {t.strip().removeprefix('W/') for t in if_none_match.split(',')}
+            if '*' in tags or not tags.isdisjoint(e for _, e in asset.variants.values()):
+                return '304 Not Modified', headers, b''
+
+        headers.append(('Content-Type', asset.ctype))
+        headers.append(('Content-Length', str(len(body))))
+        if encoding != 'identity':
+            headers.append(('Content-Encoding', encoding))
+        return '200 OK', headers, b'' if method == 'HEAD' else body
+
+    def __call__(self, environ, start_response):
+        """WSGI entry point (eventlet server)."""
+        status, headers, body = self.respond(
+            environ.get('REQUEST_METHOD', 'GET'), environ.get('PATH_INFO'),
+            environ.get('QUERY_STRING', ''), environ.get('HTTP_ACCEPT_ENCODING', ''),
+            environ.get('HTTP_IF_NONE_MATCH'))
+        start_response(status, headers)
+        return [body]
+
+    async def asgi(self, scope, receive, send):
+        """ASGI entry point (asyncio server) — same in-memory responses."""
+        if scope['type'] != 'http':
+            return
+        req = {k.decode('latin-1'): v.decode('latin-1') for k, v in scope.get('headers', ())}
+        status, headers, body = self.respond(
+            scope.get('method', 'GET'), scope.get('path'),
+            scope.get('query_string', b'').decode('latin-1'),
+            req.get('accept-encoding', ''), req.get('if-none-match'))
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,90 @@
+# =============================================================================
+#  pose.py  —  Compact skeleton stream for remote displays
+#
+#  Instead of full JPEG frames, 'pose_stream' carries the 33 landmarks of the
+#  tracked player, quantised to int16 per axis.  One packet is a few hundred
+#  bytes and is encoded once per tick for every subscriber (a Socket.IO room).
+#
+#  Wire format (little-endian, sent as a binary attachment):
+#      header : uint32 seq | uint8 joint_count | uint8 flags
+#      body   : joint_count × (int16 x, int16 y, int16 z)
+#               joint_count × uint8 visibility (0-255)
+#  Coordinates are normalised image units × POSE_STREAM_SCALE; joint_count is
+#  0 when no player is in view.
+# =============================================================================
+import struct
+
+from config import POSE_STREAM_SCALE
+
+POSE_ROOM = 'pose_stream'
+HEADER = struct.Struct('<IBB')
+FLAG_MIRRORED = 0x01
+
+_INT16_MAX = 32767
+
+
+def _q(v):
+    v = int(round(v * POSE_STREAM_SCALE))
+    return -_INT16_MAX if v < -_INT16_MAX else _INT16_MAX if v > _INT16_MAX else v
+
+
+def encode_pose(landmarks, seq, flags=0):
+    """Packs a landmark list (or None) into the binary wire format."""
+    if not landmarks:
+        return HEADER.pack(seq & 0xFFFFFFFF, 0, flags)
+    n = len(landmarks)
+    coords = []
+    vis = []
+    for lm in landmarks:
+        coords += (_q(lm.x), _q(lm.y), _q(lm.z or 0.0))
+        v = lm.visibility if lm.visibility is not None else 1.0
+        vis.append(max(0, min(255, int(v * 255))))
+    return HEADER.pack(seq & 0xFFFFFFFF, n, flags) + struct.pack(f'<{n * 3}h{n}B', *coords, *vis)
+
+
+def decode_pose(payload):
+    """Inverse of encode_pose: returns (seq, flags, [(x, y, z, visibility), ...])."""
+    seq, n, flags = HEADER.unpack_from(payload)
+    if n == 0:
+        return seq, flags, []
+    values = struct.unpack_from(f'<{n * 3}h{n}B', payload, HEADER.size)
+    coords, vis = values[:n * 3], values[n * 3:]
+    s = float(POSE_STREAM_SCALE)
+    joints = [
+        (coords[i * 3] / s, coords[i * 3 + 1] / s, coords[i * 3 + 2] / s, vis[i] / 255.0)
+        for i in range(n)
+    ]
+    return seq, flags, joints
+
+
+class PoseStream:
+    """
+    Broadcasts quantised landmarks to the 'pose_stream' room.  `server` is the
+    GameServer: its awaitable emit / enter_room / leave_room hooks work in
+    both server modes.
+    """
+
+    def __init__(self, server):
+        self._server = server
+        self._subscribers = set()
+        self._seq = 0
+
+    @property
+    def active(self):
+        return bool(self._subscribers)
+
+    async def subscribe(self, sid):
+        self._subscribers.add(sid)
+        await self._server.enter_room(sid, POSE_ROOM)
+
+    async def unsubscribe(self, sid):
+        if sid in self._subscribers:
+            self._subscribers.discard(sid)
+            await self._server.leave_room(sid, POSE_ROOM)
+
+    async def publish(self, landmarks, mirrored=False):
+        if not self._subscribers:
+            return
+        self._seq += 1
+        packet = encode_pose(landmarks, self._seq, FLAG_MIRRORED if mirrored else 0)
+        await self._server.emit('pose_stream', packet, room=POSE_ROOM)
@@ -0,0 +1,150 @@
+# =============================================================================
+#  video.py  —  Spectator video stream (binary JPEG over Socket.IO)
+#
+#  Viewers (e.g. Motion_tracking.py) emit 'subscribe_video' and receive
+#  'video_frame' events whose payload is raw JPEG bytes — sent as a binary
+#  Socket.IO attachment, not base64, so there is no 33 % inflation.
+#
+#  Cost model:
+#    • No subscribers  → publish() returns immediately, nothing is encoded.
+#    • N subscribers   → each frame is encoded once per quality level in use,
+#                        not once per viewer.
+#    • Encoding runs on a tpool thread from a separate green thread, so the
+#      game loop only pays for a small resize/flip into a reused buffer.
+#
+#  Every frame is acknowledged by the viewer.  A viewer with too many
+#  unacknowledged frames is skipped (never queued) and moved to a lower
+#  (quality, fps) level; fast acks move it back up.
+# =============================================================================
+import time
+from functools import partial
+
+import eventlet
+from eventlet import tpool
+
+from config import (
+    VIDEO_STREAM_WIDTH, VIDEO_QUALITY_LEVELS, VIDEO_MAX_IN_FLIGHT,
+    VIDEO_ACK_SLOW, VIDEO_ACK_TIMEOUT, VIDEO_UPGRADE_ACKS,
+)
+
+
+class _Viewer:
+    """Per-subscriber flow-control state."""
+    __slots__ = ('level', 'in_flight', 'last_sent', 'healthy_acks', 'last_change')
+
+    def __init__(self):
+        self.level = 0
+        self.in_flight = 0
+        self.last_sent = 0.0
+        self.healthy_acks = 0
+        self.last_change = 0.0
+
+    def due(self, now):
+        if self.in_flight >= VIDEO_MAX_IN_FLIGHT:
+            if now - self.last_sent > VIDEO_ACK_TIMEOUT:
+                self.in_flight = 0      # acks lost — start afresh
+            else:
+                self.degrade(now)
+                return False
+        max_fps = VIDEO_QUALITY_LEVELS[self.level][1]
+        return now - self.last_sent >= 1.0 / max_fps
+
+    def degrade(self, now):
+        if self.level < len(VIDEO_QUALITY_LEVELS) - 1 and now - self.last_change > 1.0:
+            self.level += 1
+            self.healthy_acks = 0
+            self.last_change = now
+
+    def acked(self, rtt, now):
+        self.in_flight = max(0, self.in_flight - 1)
+        if rtt > VIDEO_ACK_SLOW:
+            self.degrade(now)
+            return
+        self.healthy_acks += 1
+        if self.healthy_acks >= VIDEO_UPGRADE_ACKS and self.level > 0:
+            self.level -= 1
+            self.healthy_acks = 0
+            self.last_change = now
+
+
+class SpectatorVideoStream:
+    """Fans one encoded camera frame out to every subscribed viewer."""
+
+    def __init__(self, sio, width=VIDEO_STREAM_WIDTH):
+        self._sio = sio
+        self.width = width
+        self._viewers = {}
+        self._busy = False
+        self._small = None      # resized frame buffer
+        self._mirrored = None   # flipped frame buffer
+
+    @property
+    def active(self):
+        return bool(self._viewers)
+
+    def subscribe(self, sid):
+        self._viewers[sid] = _Viewer()
+
+    def unsubscribe(self, sid):
+        self._viewers.pop(sid, None)
+
+    def publish(self, bgr, mirror=True):
+        """Called once per game-loop tick with the latest captured frame."""
+        if not self._viewers or self._busy or bgr is None:
+            return
+        now = time.monotonic()
+        due = [sid for sid, v in self._viewers.items() if v.due(now)]
+        if not due:
+            return
+
+        import cv2  # already loaded by the vision pipeline; kept off server import
+
+        h, w = bgr.shape[:2]
+        out_w = min(self.width, w)
+        out_h = int(h * out_w / w)
+        if self._small is None or self._small.shape[:2] != (out_h, out_w):
+            self._small = cv2.resize(bgr, (out_w, out_h), interpolation=cv2.INTER_AREA)
+            self._mirrored = self._small.copy()
+        else:
+            cv2.resize(bgr, (out_w, out_h), dst=self._small, interpolation=cv2.INTER_AREA)
+        frame = self._small
+        if mirror:
+            cv2.flip(self._small, 1, dst=self._mirrored)
+            frame = self._mirrored
+
+        self._busy = True
+        eventlet.spawn_n(self._encode_and_send, frame, due, now)
+
+    def _encode_and_send(self, frame, sids, now):
+        import cv2
+        try:
+            by_level = {}
+            for sid in sids:
+                viewer = self._viewers.get(sid)
+                if viewer is not None:
+                    by_level.setdefault(viewer.level, []).append(sid)
+
+            for level, level_sids in by_level.items():
+                quality = VIDEO_QUALITY_LEVELS[level][0]
+                ok, jpg = tpool.execute(
+                    cv2.imencode, '.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality]
+                )
+                if not ok:
+                    continue
+                payload = jpg.tobytes()
+                for sid in level_sids:
+                    viewer = self._viewers.get(sid)
+                    if viewer is None:
+                        continue
+                    viewer.in_flight += 1
+                    viewer.last_sent = now
+                    self._sio.emit('video_frame', payload, to=sid,
+                                   callback=partial(self._on_ack, sid, time.monotonic()))
+        finally:
+            self._busy = False
+
+    def _on_ack(self, sid, sent_at, *args):
+        viewer = self._viewers.get(sid)
+        if viewer is not None:
+            now = time.monotonic()
+            viewer.acked(now - sent_at, now)
@@ -0,0 +1,6 @@
+# Tests import modules the way the servers do: rooted at backend/.
+#   cd backend && python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+import pytest
+
+from motion_logic import answer_gesture
+from motion_logic.answer_gesture import AnswerGestureRecognizer
+
+UP = answer_gesture.ANSWER_ARM_THRESHOLD + 20
+DOWN = answer_gesture.ANSWER_RELEASE_THRESHOLD - 10
+BETWEEN = (answer_gesture.ANSWER_ARM_THRESHOLD + answer_gesture.ANSWER_RELEASE_THRESHOLD) / 2
+DWELL = answer_gesture.ANSWER_DWELL
+
+
+def arms(l_arm=DOWN, r_arm=DOWN, **conf):
+    return {'l_arm': l_arm, 'r_arm': r_arm, **conf}
+
+
+def feed(recognizer, telemetry, start, duration, step=1 / 30):
+    events, t = [], start
+    while t < start + duration:
+        event = recognizer.update(telemetry, t)
+        if event:
+            events.append((t, event))
+        t += step
+    return events
+
+
+def test_right_arm_answers_a_once_after_the_dwell():
+    rec = AnswerGestureRecognizer()
+    (t, event), = feed(rec, arms(r_arm=UP, r_arm_conf=0.8), 0.0, 3 * DWELL)
+    assert event['choice'] == 'A' and event['confidence'] == 0.8
+    assert DWELL <= t < DWELL + 1 / 15
+    assert event['dwell_ms'] == int(t * 1000)
+
+
+def test_latch_holds_until_both_arms_drop_below_release():
+    rec = AnswerGestureRecognizer()
+    assert feed(rec, arms(l_arm=UP), 0.0, 2 * DWELL)[0][1]['choice'] == 'B'
+    # Dipping only into the hysteresis band does not re-arm
+    assert feed(rec, arms(l_arm=BETWEEN), 1.0, 0.2) == []
+    assert feed(rec, arms(l_arm=UP), 1.2, 2 * DWELL) == []
+    rec.update(arms(), 2.0)
+    assert feed(rec, arms(l_arm=UP), 2.1, 2 * DWELL)[0][1]['choice'] == 'B'
+
+
+@pytest.mark.parametrize('telemetry', [
+    arms(l_arm=UP, r_arm=UP),                    # both raised: ambiguous
+    arms(r_arm=UP, r_arm_conf=0.1),              # raised, but barely seen
+    arms(r_arm=BETWEEN),                         # never crossed the raise threshold
+])
+def test_ambiguous_or_unsure_raises_never_answer(telemetry):
+    assert feed(AnswerGestureRecognizer(), telemetry, 0.0, 4 * DWELL) == []
+
+
+def test_switching_arms_restarts_the_dwell():
+    rec = AnswerGestureRecognizer()
+    assert feed(rec, arms(r_arm=UP), 0.0, DWELL * 0.8) == []
+    (t, event), = feed(rec, arms(l_arm=UP), DWELL * 0.8, 2 * DWELL)
+    assert event['choice'] == 'B' and t >= DWELL * 1.8 - 1e-9
+
+
+def test_reset_clears_the_latch():
+    rec = AnswerGestureRecognizer()
+    feed(rec, arms(r_arm=UP), 0.0, 2 * DWELL)
+    rec.reset()
+    assert len(feed(rec, arms(r_arm=UP), 1.0, 2 * DWELL)) == 1
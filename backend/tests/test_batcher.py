@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import eventlet
+import pytest
+
+from questions.batcher import AsyncBatcher, GreenBatcher
+from questions.gemini import QUESTIONS_PER_TOPIC, build_batch_request, parse_batch_response
+
+
+class Fetch:
+    """Records each call's {topic: count}; answers with one marker per question."""
+
+    def __init__(self, drop=(), fail=False):
+        self.calls, self.drop, self.fail = [], drop, fail
+
+    def __call__(self, counts):
+        self.calls.append(dict(counts))
+        if self.fail:
+            raise ConnectionError("gemini down")
+        return {t: [t] * n for t, n in counts.items() if t not in self.drop}
+
+
+def run_async(batcher, topics):
+    async def main():
+        return await asyncio.gather(*(batcher.request(t) for t in topics), return_exceptions=True)
+    return asyncio.run(main())
+
+
+def run_green(batcher, topics):
+    def request(topic):
+        try:
+            return batcher.request(topic)
+        except Exception as e:
+            return e
+    return [t.wait() for t in [eventlet.spawn(request, topic) for topic in topics]]
+
+
+def async_batcher(fetch, **kwargs):
+    async def afetch(counts):
+        await asyncio.sleep(0)
+        return fetch(counts)
+    return AsyncBatcher(afetch, **kwargs)
+
+
+MODES = [(async_batcher, run_async), (GreenBatcher, run_green)]
+
+
+@pytest.mark.parametrize('make, run', MODES)
+def test_requests_in_one_window_share_a_call_and_repeated_topics_merge(make, run):
+    fetch = Fetch()
+    results = run(make(fetch, window=0.01, max_requests=10), ['cats', 'dogs', 'cats'])
+    assert fetch.calls == [{'cats': 2 * QUESTIONS_PER_TOPIC, 'dogs': QUESTIONS_PER_TOPIC}]
+    assert [len(r) for r in results] == [2 * QUESTIONS_PER_TOPIC, QUESTIONS_PER_TOPIC, 2 * QUESTIONS_PER_TOPIC]
+    assert results[1][0] == 'dogs'
+
+
+@pytest.mark.parametrize('make, run', MODES)
+def test_a_full_batch_is_sent_without_waiting_for_the_window(make, run):
+    fetch = Fetch()
+    batcher = make(fetch, window=30, max_requests=2)
+    results = run(batcher, ['a', 'b', 'c', 'd'])
+    assert fetch.calls == [{'a': QUESTIONS_PER_TOPIC, 'b': QUESTIONS_PER_TOPIC},
+                           {'c': QUESTIONS_PER_TOPIC, 'd': QUESTIONS_PER_TOPIC}]
+    assert (batcher.calls, batcher.requests) == (2, 4) and all(isinstance(r, list) for r in results)
+
+
+@pytest.mark.parametrize('make, run', MODES)
+def test_failures_reach_only_the_affected_waiters(make, run):
+    results = run(make(Fetch(drop=('b',)), window=0.01), ['a', 'b'])
+    assert isinstance(results[0], list)
+    assert isinstance(results[1], ValueError) and "'b'" in str(results[1])
+
+    results = run(make(Fetch(fail=True), window=0.01), ['a', 'b'])
+    assert all(isinstance(r, ConnectionError) for r in results)
+
+
+def test_batch_response_maps_ids_back_to_topics():
+    counts = {'cats': 15, 'dogs': 30}
+    _, _, payload = build_batch_request(counts)
+    prompt = payload['contents'][0]['parts'][0]['text']
+    assert '"id": 2, "topic": "dogs", "count": 30' in prompt
+
+    entries = [{'id': 2, 'questions': ['d']}, {'id': 1, 'questions': 'not a list'},
+               {'id': 9, 'questions': ['x']}, {'id': 2, 'questions': ['dup']}]
+    text = '```json\n' + json.dumps(entries) + '\n```'
+    data = {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+    assert parse_batch_response(data, counts) == {'dogs': ['d']}
@@ -0,0 +1,71 @@
+import random
+import statistics
+
+import pytest
+
+from config import CALIB_THRESHOLD_MAX, CALIB_THRESHOLD_MIN
+from motion_logic.calibration import BackgroundRecalibrator, NoiseCalibrator, P2Quantile, RunningStats
+
+
+def test_welford_matches_the_two_pass_statistics():
+    rng = random.Random(1)
+    xs = [rng.gauss(0.004, 0.001) for _ in range(500)]
+    stats = RunningStats()
+    for x in xs:
+        stats.add(x)
+    assert stats.n == 500
+    assert stats.mean == pytest.approx(statistics.fmean(xs), rel=1e-12)
+    assert stats.std == pytest.approx(statistics.stdev(xs), rel=1e-9)
+    assert RunningStats().variance == 0.0
+
+
+@pytest.mark.parametrize('p', [0.25, 0.5, 0.9])
+def test_p2_tracks_the_quantile_of_a_stream(p):
+    rng = random.Random(7)
+    est = P2Quantile(p)
+    for _ in range(5000):
+        est.add(rng.random())
+    assert est.value() == pytest.approx(p, abs=0.03)
+
+
+def test_p2_before_five_samples_uses_the_exact_order_statistic():
+    est = P2Quantile(0.5)
+    assert est.value() is None
+    for x in (3.0, 1.0, 2.0):
+        est.add(x)
+    assert est.value() == 2.0
+
+
+def test_one_outlier_barely_moves_the_noise_ceiling():
+    rng = random.Random(3)
+    deltas = [abs(rng.gauss(0.0, 0.002)) for _ in range(90)]
+    clean, spiked = NoiseCalibrator(sigmas=3, multiplier=1), NoiseCalibrator(sigmas=3, multiplier=1)
+    for i, d in enumerate(deltas):
+        clean.add(d)
+        spiked.add(d * 100 if i == 45 else d)
+    assert spiked.noise_level() < 2 * clean.noise_level()
+    assert max(deltas) * 100 > 10 * spiked.noise_level()
+
+
+def test_threshold_is_clamped_to_the_configured_range():
+    quiet, loud = NoiseCalibrator(multiplier=1), NoiseCalibrator(multiplier=1)
+    assert quiet.threshold() is None
+    for _ in range(20):
+        quiet.add(0.0)
+        loud.add(1.0)
+    assert quiet.threshold() == CALIB_THRESHOLD_MIN
+    assert loud.threshold() == CALIB_THRESHOLD_MAX
+
+
+def test_background_window_blends_into_the_live_threshold():
+    bg = BackgroundRecalibrator(window=10, blend=0.5)
+    fresh = NoiseCalibrator()
+    for _ in range(9):
+        fresh.add(0.005)
+        assert bg.observe(0.005, current_threshold=CALIB_THRESHOLD_MAX) is None
+    fresh.add(0.005)
+    blended = bg.observe(0.005, current_threshold=CALIB_THRESHOLD_MAX)
+    assert blended == pytest.approx((CALIB_THRESHOLD_MAX + fresh.threshold()) / 2)
+    # The window restarts after each blend; window 0 disables refinement
+    assert bg.observe(0.005, current_threshold=blended) is None
+    assert BackgroundRecalibrator(window=0).observe(0.005, 0.01) is None
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import game_server
+from game_server import GameServer, run_blocking
+from sessions import SessionStore
+
+
+LOCAL = {'REMOTE_ADDR': '127.0.0.1'}
+REMOTE = {'REMOTE_ADDR': '203.0.113.7'}
+
+
+class StopLoop(Exception):
+    pass
+
+
+class RecordingServer(GameServer):
+    """Blocking hooks, like server.py's, that record every emit."""
+
+    def __init__(self, tmp_path, **kwargs):
+        super().__init__(str(tmp_path), SessionStore(), config_path=str(tmp_path / 'config.json'), **kwargs)
+        self.emitted = []
+        self.frames = 0
+
+    async def emit(self, event, data, to=None, room=None):
+        self.emitted.append((event, data, to or room))
+
+    async def enter_room(self, sid, room):
+        pass
+
+    async def leave_room(self, sid, room):
+        pass
+
+    async def sleep(self, seconds):
+        if self.pipeline is not None and self.frames >= 1:
+            raise StopLoop
+
+    async def run_in_pipeline(self, fn):
+        return fn()
+
+    async def request_llm(self, topic):
+        raise TimeoutError("no LLM in tests")
+
+    def events(self, name):
+        return [(data, target) for event, data, target in self.emitted if event == name]
+
+
+class FakePipeline:
+    timing = (0.0, 0.0, 0.0)
+    frame_bgr = None
+
+    def __init__(self, during_read=None):
+        self.during_read = during_read
+        self.seen = []
+
+    def read(self):
+        if self.during_read:
+            self.during_read()
+        self.seen.append(game_server.LOOP_SLEEP)
+        return True, [None]
+
+
+@pytest.fixture(autouse=True)
+def restore_loop_sleep(monkeypatch):
+    monkeypatch.setattr(game_server, 'LOOP_SLEEP', game_server.LOOP_SLEEP)
+
+
+def test_run_blocking_returns_the_result_and_refuses_to_suspend():
+    async def answer():
+        return 42
+
+    assert run_blocking(answer()) == 42
+    with pytest.raises(RuntimeError):
+        run_blocking(asyncio.sleep(0))
+
+
+def test_score_submission_broadcasts_the_board(tmp_path):
+    game = RecordingServer(tmp_path)
+    run_blocking(game.connect('sid1', {}))
+    run_blocking(game.submit_score('sid1', {'time_ms': 61000, 'time_str': '01:01'}))
+    (board, target), = game.events('leaderboard_update')
+    assert target is None and board[0]['time_str'] == '01:01'
+    assert game.events('server_status') == [(game.server_status, 'sid1')]
+
+
+def test_failed_generation_falls_back_to_the_bank_or_reports_an_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(game_server, 'DEV_SKIP_AI_QUESTIONS', False)
+    monkeypatch.setattr(game_server.gemini, 'API_KEY', 'test-key')
+    game = RecordingServer(tmp_path)
+    run_blocking(game.request_questions('sid1', {'name': 'Ada', 'topic': 'planets'}))
+    assert game.events('questions_error')
+    assert game.player_registry['sid1']['name'] == 'Ada'
+
+
+def test_only_operators_may_update_the_config(tmp_path, monkeypatch):
+    game = RecordingServer(tmp_path)
+    old = game_server.LOOP_SLEEP
+    run_blocking(game.connect('lan', REMOTE))
+    run_blocking(game.connect('proxied', {'REMOTE_ADDR': '127.0.0.1', 'asgi.scope': {'client': ('203.0.113.7', 5000)}}))
+    for sid in ('lan', 'proxied', 'never-connected'):
+        run_blocking(game.update_config(sid, {'LOOP_SLEEP': old + 0.01}))
+    assert len(game.events('config_error')) == 3
+    assert game_server.LOOP_SLEEP == old and not (tmp_path / 'config.json').exists()
+
+    monkeypatch.setattr(game_server, 'OPERATOR_TOKEN', 'sesame')
+    run_blocking(game.connect('local-no-token', LOCAL))
+    run_blocking(game.connect('wrong', REMOTE, {'operator_token': 'open'}))
+    run_blocking(game.connect('remote-op', REMOTE, {'operator_token': 'sesame'}))
+    assert game.operators == {'remote-op'}
+    run_blocking(game.update_config('remote-op', {'LOOP_SLEEP': old + 0.01}))
+    assert game_server.LOOP_SLEEP == pytest.approx(old + 0.01)
+    run_blocking(game.disconnect('remote-op'))
+    assert game.operators == set()
+
+
+def test_config_update_waits_for_the_gap_between_frames(tmp_path):
+    game = RecordingServer(tmp_path)
+    run_blocking(game.connect('op', LOCAL))
+    old = game_server.LOOP_SLEEP
+    update = lambda: run_blocking(game.update_config('op', {'LOOP_SLEEP': old + 0.01}))
+    game.pipeline = FakePipeline(during_read=update)
+
+    def read_and_count():
+        result = FakePipeline.read(game.pipeline)
+        game.frames += 1
+        return result
+    game.pipeline.read = read_and_count
+
+    with pytest.raises(StopLoop):
+        run_blocking(game.game_loop())
+    assert game.pipeline.seen == [old]                   # unchanged during the read
+    assert game_server.LOOP_SLEEP == pytest.approx(old + 0.01)
+    assert game.events('config_updated')
+
+
+def test_async_update_during_an_executor_read_is_applied_after_it(tmp_path):
+    """server_async.py's shape: read() on another thread while the loop handles events."""
+    game = RecordingServer(tmp_path)
+    run_blocking(game.connect('op', LOCAL))
+    old = game_server.LOOP_SLEEP
+    reading = threading.Event()
+
+    def slow_read():
+        reading.set()
+        time.sleep(0.05)
+        seen = game_server.LOOP_SLEEP        # what a module global read mid-frame sees
+        game.frames += 1
+        return True, [None], seen
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        game.runtime_config.deferred = True
+        read = loop.run_in_executor(None, slow_read)
+        await loop.run_in_executor(None, reading.wait)
+        await game.update_config('op', {'LOOP_SLEEP': old + 0.02})
+        ok, _, seen = await read
+        game.runtime_config.apply_pending()
+        return seen
+
+    assert asyncio.run(main()) == old
+    assert game_server.LOOP_SLEEP == pytest.approx(old + 0.02)
+
+
+def test_pose_stream_packets_go_through_the_server_hooks(tmp_path):
+    from streaming.pose import POSE_ROOM, decode_pose
+    game = RecordingServer(tmp_path)
+    run_blocking(game.pose_stream.publish(None))
+    assert not game.events('pose_stream')                  # nobody subscribed yet
+    run_blocking(game.subscribe_pose('viewer'))
+    run_blocking(game.pose_stream.publish(None, mirrored=True))
+    (packet, room), = game.events('pose_stream')
+    assert room == POSE_ROOM and decode_pose(packet) == (1, 1, [])
@@ -0,0 +1,51 @@
+import json
+import logging
+
+from logs import JsonFormatter, RateLimiter, TextFormatter
+
+
+def record(msg, t, lineno=10, level=logging.INFO, **extra):
+    rec = logging.LogRecord('server', level, 'server.py', lineno, msg, None, None)
+    rec.created = t
+    for key, value in extra.items():
+        setattr(rec, key, value)
+    return rec
+
+
+def test_changing_fstring_messages_under_one_key_are_limited():
+    limiter = RateLimiter(burst=5, window=10.0)
+    allowed = [limiter.allow(record(f"frame {i} took {i * 3} ms", t=i * 0.1, rate_key='frame'))
+               for i in range(20)]
+    assert allowed == [True] * 5 + [False] * 15
+
+
+def test_summary_rides_on_the_first_record_after_the_window():
+    limiter = RateLimiter(burst=5, window=10.0)
+    for i in range(20):
+        limiter.allow(record(f"value {i}", t=i * 0.1, rate_key='value'))
+    late = record("value 99", t=12.0, rate_key='value')
+    assert limiter.allow(late)
+    assert late.suppressed == 15
+    assert TextFormatter().format(late) == "value 99  (+15 similar suppressed)"
+    assert json.loads(JsonFormatter().format(late))['suppressed'] == 15
+
+
+def test_rate_key_groups_call_sites_and_other_keys_are_independent():
+    limiter = RateLimiter(burst=2, window=10.0)
+    keyed = [limiter.allow(record(f"switch {i}", t=i, lineno=100 + i, rate_key='tier_switch'))
+             for i in range(4)]
+    assert keyed == [True, True, False, False]
+    assert limiter.allow(record("other", t=5, lineno=7, rate_key='other'))
+
+
+def test_a_signup_burst_without_rate_key_is_never_limited():
+    limiter = RateLimiter(burst=5, window=10.0)
+    lines = [record(f"✅ CLIENT CONNECTED: sid{i}", t=i * 0.01, lineno=190) for i in range(40)]
+    lines += [record(f"Generation failed for sid{i}", t=1.0, lineno=300, level=logging.ERROR)
+              for i in range(40)]
+    assert all(limiter.allow(rec) for rec in lines)
+
+
+def test_burst_zero_disables_limiting():
+    limiter = RateLimiter(burst=0, window=10.0)
+    assert all(limiter.allow(record("same", t=0.0, rate_key='same')) for _ in range(50))
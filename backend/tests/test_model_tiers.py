@@ -0,0 +1,33 @@
+from vision.model_tiers import PoseModelPool, TierController, build_ladder
+
+
+def test_ladder_steps_down_models_then_input_sizes():
+    ladder = build_ladder(['lite', 'full', 'heavy'], max_tier='heavy', input_sizes=(256, 192, 160))
+    assert ladder == [('heavy', 256), ('full', 256), ('lite', 256), ('lite', 192), ('lite', 160)]
+
+
+def test_ladder_without_roi_has_only_model_rungs():
+    ladder = build_ladder(['lite', 'full'], max_tier='heavy', input_sizes=(256,))
+    assert ladder == [('full', 256), ('lite', 256)]
+    assert build_ladder([], input_sizes=(256,)) == []
+
+
+def test_controller_steps_down_over_budget_and_back_up_with_headroom():
+    ctl = TierController([('full', 256), ('lite', 256)], budget_ms=20, headroom=0.5,
+                         window=3, cooldown=1.0, enabled=True)
+    assert [ctl.observe(30, now=10.0) for _ in range(2)] == [None, None]
+    switch = ctl.observe(30, now=10.0)
+    assert switch['direction'] == 'down' and ctl.rung == ('lite', 256)
+    for _ in range(3):
+        assert ctl.observe(5, now=10.5) is None     # still cooling down
+    switch = [ctl.observe(5, now=12.0) for _ in range(3)][-1]
+    assert switch['direction'] == 'up' and ctl.rung == ('full', 256)
+
+
+def test_preload_builds_each_tier_once_before_any_get(tmp_path):
+    built = []
+    pool = PoseModelPool(str(tmp_path), lambda path: built.append(path) or object())
+    pool.preload(['full', 'lite', 'lite'])
+    assert len(built) == 2
+    pool.get('lite')
+    assert len(built) == 2
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from config import TRACK_MAX_DISTANCE, TRACK_MAX_MISSED
+from vision.pose_tracker import PoseTracker, box_iou, torso_box
+
+
+def person(cx, cy=0.5, w=0.1, h=0.2):
+    """33 landmarks whose shoulders/hips span a w×h torso box centred on (cx, cy)."""
+    lms = [SimpleNamespace(x=cx, y=cy) for _ in range(33)]
+    for i, (dx, dy) in zip((11, 12, 23, 24), ((-1, -1), (1, -1), (-1, 1), (1, 1))):
+        lms[i] = SimpleNamespace(x=cx + dx * w / 2, y=cy + dy * h / 2)
+    return lms
+
+
+def test_torso_box_and_iou():
+    a = torso_box(person(0.5))
+    assert a == (0.45, 0.4, 0.55, 0.6)
+    assert box_iou(a, a) == 1.0
+    assert box_iou(a, torso_box(person(0.9))) == 0.0
+    assert 0.3 < box_iou(a, torso_box(person(0.53))) < 0.6
+
+
+def test_slot_stays_on_its_player_when_detection_order_flips():
+    tracker = PoseTracker()
+    player, bystander = person(0.5), person(0.8)
+    assert tracker.update([bystander, player]) == [player]
+    for x in (0.51, 0.52, 0.53):
+        player, bystander = person(x), person(0.8 - (x - 0.5))
+        assert tracker.update([player, bystander]) == [player]
+        assert tracker.update([bystander, player]) == [player]
+
+
+def test_centroid_fallback_follows_a_fast_move_without_overlap():
+    tracker = PoseTracker()
+    tracker.update([person(0.5)])
+    jump = 0.5 + TRACK_MAX_DISTANCE * 0.9
+    moved = person(jump)
+    assert box_iou(torso_box(person(0.5)), torso_box(moved)) == 0.0
+    assert tracker.update([moved]) == [moved]
+    (slot,) = tracker.slots
+    assert slot == 1
+
+
+def test_slot_survives_missed_frames_then_is_released():
+    tracker = PoseTracker()
+    tracker.update([person(0.5)])
+    for _ in range(TRACK_MAX_MISSED):
+        assert tracker.update([]) == [None]
+    assert tracker.slots == [1]
+    back = person(0.5)
+    assert tracker.update([back]) == [back] and tracker.slots == [1]
+
+    for _ in range(TRACK_MAX_MISSED + 1):
+        tracker.update([])
+    assert tracker.slots == [None]
+    newcomer = person(0.2)
+    assert tracker.update([newcomer]) == [newcomer] and tracker.slots == [2]
+
+
+def test_duo_slots_claim_the_track_nearest_their_lane():
+    tracker = PoseTracker(lane_centers=(0.25, 0.75))
+    left, right, middle = person(0.3), person(0.7), person(0.5)
+    assert tracker.update([right, middle, left]) == [left, right]
+    # A bystander walking in between never displaces a locked player
+    left, right, middle = person(0.31), person(0.69), person(0.49)
+    assert tracker.update([middle, left, right]) == [left, right]
@@ -0,0 +1,47 @@
+import pytest
+
+from config import QUESTION_BATCH_SIZE
+from questions.bank import QuestionBank
+from questions.service import QuestionService
+
+
+def item(text):
+    return {'text': text, 'correct_answer': 'yes', 'wrong_answer': 'no'}
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = QuestionService(str(tmp_path))
+    service.bank.add([('Planets', item(f"Is planet {i} round?")) for i in range(4)] +
+                     [('Cooking', item(f"Is recipe {i} tasty?")) for i in range(30)])
+    return service
+
+
+def test_search_returns_only_real_matches(tmp_path):
+    bank = QuestionBank(str(tmp_path / 'bank.db'))
+    bank.add([('Planets', item("Is Mars red?")), ('Cooking', item("Is salt salty?"))])
+    assert [q['text'] for q in bank.search('planets', 40)] == ["Is Mars red?"]
+    assert bank.search('volcanoes', 40) == []
+    assert bank.search('!!', 40) == []
+
+
+def test_sample_skips_excluded_texts(tmp_path):
+    bank = QuestionBank(str(tmp_path / 'bank.db'))
+    bank.add(('t', item(f"Question {i}?")) for i in range(5))
+    texts = {q['text'] for q in bank.sample(10, exclude=["Question 0?"])}
+    assert texts == {f"Question {i}?" for i in range(1, 5)}
+
+
+def test_random_rows_only_fill_one_batch(service):
+    questions = service.from_bank('planets')
+    planets = [q for q in questions if 'planet' in q['text']]
+    assert len(questions) == QUESTION_BATCH_SIZE
+    assert len(planets) == 4
+    # Only on-topic rows are cached as spares for 'planets'
+    assert sorted(q['text'] for q in service.pool._cache['planets'].values()) == [
+        f"Is planet {i} round?" for i in range(4)]
+
+
+def test_a_well_stocked_topic_gets_no_random_rows(service):
+    questions = service.from_bank('cooking recipe')
+    assert all('recipe' in q['text'] for q in questions)
@@ -0,0 +1,68 @@
+import pytest
+
+from config import QUESTION_BATCH_SIZE, QUESTION_MIN_BATCH
+from questions.pool import QuestionPool, normalize_text, question_key, validate_item
+
+
+def raw(text, correct='yes', wrong='no'):
+    return {'text': text, 'correct_answer': correct, 'wrong_answer': wrong}
+
+
+def batch(start, count, topic='q'):
+    return [raw(f"{topic} number {i}?") for i in range(start, start + count)]
+
+
+def test_near_duplicates_share_a_key():
+    assert question_key("What is 7×8?") == question_key("what is 7 x 8") == question_key("WHAT IS 7*8 ?")
+    assert question_key("What is 7×8?") != question_key("What is 7×9?")
+    assert normalize_text("A) Paris") == 'paris'
+
+
+def test_degenerate_items_are_rejected():
+    assert validate_item(raw("Capital of France?", "A) Paris", "b. Lyon")) == {
+        'text': "Capital of France?", 'correct': "Paris", 'wrong': "Lyon"}
+    for item in (raw("Same?", "Paris", "a) PARIS"), raw("", "x", "y"), raw("?!", "x", "y"),
+                 raw("x" * 1000), {'text': 'no answers'}, "not a dict"):
+        assert validate_item(item) is None
+
+
+def test_batch_drops_in_batch_duplicates_and_caches_the_surplus():
+    pool = QuestionPool()
+    items = batch(0, QUESTION_BATCH_SIZE + 3) + [raw("q number 0 ?"), raw("Same?", "a", "A")]
+    questions, stats = pool.build_batch('Space', items)
+    assert [q['text'] for q in questions] == [f"q number {i}?" for i in range(QUESTION_BATCH_SIZE)]
+    assert stats == {'received': len(items), 'invalid': 1, 'duplicate': 1, 'topped_up': 0, 'filler': 0}
+
+    # The next short batch is topped up with the 3 unseen spares before any repeats
+    questions, stats = pool.build_batch(' space! ', batch(100, QUESTION_BATCH_SIZE - 3))
+    assert stats['topped_up'] == 3
+    assert [q['text'] for q in questions[-3:]] == [f"q number {i}?" for i in range(QUESTION_BATCH_SIZE, QUESTION_BATCH_SIZE + 3)]
+
+
+def test_served_questions_are_not_repeated_until_the_cache_runs_dry():
+    pool = QuestionPool()
+    first, _ = pool.build_batch('art', batch(0, QUESTION_BATCH_SIZE))
+    again, stats = pool.build_batch('art', batch(0, QUESTION_BATCH_SIZE))
+    # Every item was already served: it comes back only as a recycled top-up
+    assert stats['duplicate'] == QUESTION_BATCH_SIZE and stats['topped_up'] == QUESTION_BATCH_SIZE
+    assert again == first
+    # Other topics keep their own history
+    _, stats = pool.build_batch('music', batch(0, QUESTION_BATCH_SIZE))
+    assert stats['duplicate'] == 0
+
+
+def test_filler_plugs_the_gap_but_is_never_cached_for_the_topic():
+    pool = QuestionPool()
+    filler = batch(0, QUESTION_BATCH_SIZE, topic='other')
+    questions, stats = pool.build_batch('art', batch(0, 4, topic='art'), filler=filler + [raw("art number 0?")])
+    assert len(questions) == QUESTION_BATCH_SIZE and stats['filler'] == QUESTION_BATCH_SIZE - 4
+    assert [q['text'] for q in pool._cache['art'].values()] == [f"art number {i}?" for i in range(4)]
+    # Served filler is remembered, so the next short batch doesn't repeat it
+    questions, stats = pool.build_batch('art', [], filler=batch(0, 2 * QUESTION_BATCH_SIZE, topic='other'))
+    assert stats['topped_up'] == 4 and stats['duplicate'] == QUESTION_BATCH_SIZE - 4
+    assert not {q['text'] for q in questions} & {f['text'] for f in filler[:QUESTION_BATCH_SIZE - 4]}
+
+
+def test_short_batch_without_spares_fails():
+    with pytest.raises(ValueError, match=f"need {QUESTION_MIN_BATCH}"):
+        QuestionPool().build_batch('x', batch(0, QUESTION_MIN_BATCH - 1))
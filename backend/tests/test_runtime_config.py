@@ -0,0 +1,66 @@
+import json
+import types
+
+import pytest
+
+import runtime_config
+from runtime_config import ConfigError, RuntimeConfig, validate
+
+
+@pytest.fixture
+def rc(tmp_path):
+    rc = RuntimeConfig(str(tmp_path / 'config.json'))
+    rc.module = types.SimpleNamespace(**rc.defaults)
+    rc.bind(rc.module)
+    return rc
+
+
+def test_validate_coerces_types_and_checks_ranges():
+    assert validate({'STARTUP_STEPS_REQUIRED': 3.0, 'LOOP_SLEEP': 0}) == {
+        'STARTUP_STEPS_REQUIRED': 3, 'LOOP_SLEEP': 0.0}
+    for bad in ({'STARTUP_STEPS_REQUIRED': 2.5}, {'LOOP_SLEEP': True}, {'LOOP_SLEEP': '0.1'},
+                {'LOOP_SLEEP': 0.9}, {'CAMERA_INDEX': 1}):
+        with pytest.raises(ConfigError):
+            validate(bad)
+
+
+def test_validate_keeps_paired_thresholds_strictly_ordered():
+    ok = {'CENTER_LEFT_LIMIT': 0.3, 'TURN_LEFT_TRIGGER': 0.4,
+          'TURN_RIGHT_TRIGGER': 0.6, 'CENTER_RIGHT_LIMIT': 0.7}
+    assert validate(ok) == ok
+    for lower, upper in runtime_config._ORDERING:
+        with pytest.raises(ConfigError, match=f"{lower}.*{upper}"):
+            validate({lower: 0.05, upper: 0.05})
+    # one side of a pair alone is not checked against anything
+    assert validate({'TURN_LEFT_TRIGGER': 0.9}) == {'TURN_LEFT_TRIGGER': 0.9}
+
+
+def test_update_is_validated_against_the_merged_config(rc):
+    right = rc.values['TURN_RIGHT_TRIGGER']
+    with pytest.raises(ConfigError):
+        rc.update({'TURN_LEFT_TRIGGER': right})
+    assert rc.module.TURN_LEFT_TRIGGER == rc.defaults['TURN_LEFT_TRIGGER']
+
+
+def test_update_persists_only_overrides_then_applies(rc):
+    changed = rc.update({'LOOP_SLEEP': 0.02, 'ARM_DEADZONE': rc.defaults['ARM_DEADZONE']})
+    assert changed == {'LOOP_SLEEP': 0.02}
+    assert rc.module.LOOP_SLEEP == 0.02
+    assert json.loads(open(rc.path).read()) == {'LOOP_SLEEP': 0.02}
+    assert not rc.changed_on_disk()
+
+
+def test_failed_write_leaves_the_old_values_live(rc, tmp_path):
+    rc.path = str(tmp_path / 'missing-dir' / 'config.json')
+    with pytest.raises(OSError):
+        rc.update({'LOOP_SLEEP': 0.02})
+    assert rc.values['LOOP_SLEEP'] == rc.defaults['LOOP_SLEEP']
+    assert rc.module.LOOP_SLEEP == rc.defaults['LOOP_SLEEP']
+
+
+def test_deferred_updates_wait_for_apply_pending(rc):
+    rc.deferred = True
+    rc.update({'LOOP_SLEEP': 0.02}, persist=False)
+    assert rc.module.LOOP_SLEEP == rc.defaults['LOOP_SLEEP']
+    rc.apply_pending()
+    assert rc.module.LOOP_SLEEP == 0.02
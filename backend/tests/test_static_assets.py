@@ -0,0 +1,70 @@
+import gzip
+
+import pytest
+
+import static_assets
+from static_assets import StaticAssets
+
+SCRIPT = b"export const answer = 42;\n" * 100
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_assets, 'brotli', None)   # gzip only, installed or not
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'app.js').write_bytes(SCRIPT)
+    (tmp_path / 'index.html').write_text('<script src="/js/app.js"></script>')
+    return StaticAssets({'/': 'index.html', '/js': 'js'}, str(tmp_path))
+
+
+def header(headers, name):
+    return dict(headers).get(name)
+
+
+def test_gzip_when_accepted_identity_otherwise(assets):
+    status, headers, body = assets.respond('GET', '/js/app.js', '', 'gzip, deflate', None)
+    assert status == '200 OK'
+    assert header(headers, 'Content-Encoding') == 'gzip'
+    assert header(headers, 'Vary') == 'Accept-Encoding'
+    assert gzip.decompress(body) == SCRIPT
+
+    status, headers, body = assets.respond('GET', '/js/app.js', '', 'gzip;q=0', None)
+    assert header(headers, 'Content-Encoding') is None
+    assert body == SCRIPT
+    assert header(headers, 'Content-Length') == str(len(SCRIPT))
+
+
+def test_etag_per_representation_and_304(assets):
+    _, plain, _ = assets.respond('GET', '/js/app.js', '', '', None)
+    _, packed, _ = assets.respond('GET', '/js/app.js', '', 'gzip', None)
+    etag = header(plain, 'ETag')
+    assert header(packed, 'ETag') == etag[:-1] + '-gz"'
+
+    status, headers, body = assets.respond('GET', '/js/app.js', '', 'gzip', etag)
+    assert status == '304 Not Modified' and body == b''
+    assert header(headers, 'ETag') == header(packed, 'ETag')
+    assert assets.respond('GET', '/js/app.js', '', '', f'W/{etag}')[0] == '304 Not Modified'
+    assert assets.respond('GET', '/js/app.js', '', '', '"stale"')[0] == '200 OK'
+
+
+def test_only_a_v_parameter_makes_a_response_immutable(assets):
+    cache = lambda query: header(assets.respond('GET', '/js/app.js', query, '', None)[1], 'Cache-Control')
+    assert 'immutable' in cache('v=0123456789')
+    assert 'immutable' in cache('dev=1&v=0123456789')
+    assert cache('dev=1') == 'no-cache'
+    assert cache('') == 'no-cache'
+
+
+def test_html_references_carry_the_asset_hash(assets):
+    _, headers, body = assets.respond('GET', '/', '', '', None)
+    _, js_headers, _ = assets.respond('GET', '/js/app.js', '', '', None)
+    version = header(js_headers, 'ETag').strip('"')[:10]
+    assert body == f'<script src="/js/app.js?v={version}"></script>'.encode()
+    assert header(headers, 'Cache-Control') == 'no-cache'
+
+
+def test_head_unmapped_and_method_errors(assets):
+    status, headers, body = assets.respond('HEAD', '/js/app.js', '', '', None)
+    assert status == '200 OK' and body == b'' and header(headers, 'Content-Length') == str(len(SCRIPT))
+    assert assets.respond('GET', '/js/../../etc/passwd', '', '', None)[0] == '404 Not Found'
+    assert assets.respond('POST', '/', '', '', None)[0] == '405 Method Not Allowed'
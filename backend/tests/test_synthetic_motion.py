@@ -0,0 +1,87 @@
+import pytest
+
+from config import ANSWER_DWELL, CALIB_FRAMES_NEEDED, MIRROR_INPUT, SYNTHETIC_FPS
+from tools.simulate_motion import simulate
+from vision.landmarks import mirror_landmarks
+from vision.pipeline import SyntheticPipeline
+from vision.synthetic import RAMP
+
+FRAME = 1.0 / SYNTHETIC_FPS
+CALIBRATED_AT = CALIB_FRAMES_NEEDED * FRAME
+
+
+def events(timeline, kind):
+    return [(t, detail) for t, k, detail in timeline if k == kind]
+
+
+def test_calibrates_on_the_idle_lead_in():
+    timeline = simulate("idle:3")
+    (t, _), = events(timeline, 'calibrated')
+    assert t == pytest.approx(CALIBRATED_AT, abs=2 * FRAME)
+    assert [s for _, s in events(timeline, 'status')] == ['CALIBRATING', 'IDLE']
+
+
+def test_walk_starts_within_a_second_and_stops_with_the_script():
+    timeline = simulate("idle:3, walk:4@120, idle:2")
+    status = events(timeline, 'status')
+    assert [s for _, s in status] == ['CALIBRATING', 'IDLE', 'WALKING', 'IDLE']
+    walking_at, stopped_at = status[2][0], status[3][0]
+    assert 3.0 < walking_at < 4.0
+    assert 7.0 <= stopped_at < 7.5
+    # 120 steps/min for 4 s, minus the steps it takes to be believed
+    assert 6 <= events(timeline, 'step')[-1][1] <= 8
+
+
+def test_lean_turns_toward_the_players_side():
+    timeline = simulate("idle:3, lean_left:2, idle:1, lean_right:2, idle:1")
+    left, right = ('LEFT', 'RIGHT') if MIRROR_INPUT else ('RIGHT', 'LEFT')
+    turns = events(timeline, 'turn')
+    assert [d for _, d in turns] == ['CENTER', left, 'CENTER', right, 'CENTER']
+    for (t_on, _), start in zip((turns[1], turns[3]), (3.0, 6.0)):
+        assert start < t_on < start + RAMP
+    assert all('WALKING' != s for _, s in events(timeline, 'status'))
+
+
+def test_raised_arm_answers_once_after_the_dwell():
+    timeline = simulate("idle:3, raise_right:1.5, idle:1, raise_left:1.5, idle:1")
+    answers = events(timeline, 'answer')
+    first, second = ('B', 'A') if MIRROR_INPUT else ('A', 'B')
+    assert [d.split()[0] for _, d in answers] == [first, second]
+    for (t, _), start in zip(answers, (3.0, 5.5)):
+        assert start + ANSWER_DWELL <= t < start + RAMP + ANSWER_DWELL + 2 * FRAME
+
+
+def test_occluded_player_is_lost_and_found_again():
+    timeline = simulate("idle:3, walk:4@120, occlude:1, walk:2@120, idle:2")
+    assert [s for _, s in events(timeline, 'status')] == [
+        'CALIBRATING', 'IDLE', 'WALKING', 'NO PLAYER', 'IDLE', 'WALKING', 'IDLE']
+    assert events(timeline, 'status')[3][0] == pytest.approx(7.0, abs=FRAME)
+
+
+def test_pipeline_crops_and_maps_detections_back_to_the_full_frame():
+    pipeline = SyntheticPipeline(script="idle:1, lean_left:1", seed=2, realtime=False, loop=False)
+    pipeline.load_model()
+    pipeline.open_camera()
+    pipeline.frame_skipper.mode = 'off'
+    cropped = 0
+    while True:
+        crop = pipeline.roi_tracker.roi
+        ok, players = pipeline.read()
+        if not ok:
+            break
+        cropped += crop is not None
+        expected = pipeline.scene.poses[0]
+        if MIRROR_INPUT:
+            expected = mirror_landmarks(expected)
+        got = [v for lm in players[0] for v in (lm.x, lm.y)]
+        assert got == pytest.approx([v for lm in expected for v in (lm.x, lm.y)], abs=1e-9)
+    assert cropped == 2 * SYNTHETIC_FPS - 1     # every frame after the first
+
+
+def test_detector_misses_a_player_outside_the_crop():
+    pipeline = SyntheticPipeline(script="idle:1", seed=0, realtime=False, loop=False)
+    pipeline.load_model()
+    pipeline.open_camera()
+    pipeline.read()
+    pipeline.roi_tracker._roi = (0, 0, 40, 40)  # top-left corner, away from the torso
+    assert pipeline._infer_poses(pipeline.frame_bgr, 0.0) == []
@@ -0,0 +1,33 @@
+import numpy as np
+
+from tools.tune_motion import SPACE, on_bounds, score_turn, split_units
+
+
+def features(n=100, calibrated_at=10):
+    t = np.arange(n) / 30
+    nose = np.where((t > 1) & (t < 2), 0.3, 0.5)
+    return {'t': t, 'calibrated_at': calibrated_at, 'active': np.arange(n) >= calibrated_at,
+            'nose_x': nose, 'turn': np.where(nose < 0.4, -1, 0)}
+
+
+def test_single_recording_is_split_into_calibrated_time_chunks():
+    assert split_units([features()], 3) == [(0, 0, 40), (0, 40, 70), (0, 70, 100)]
+    assert split_units([features(50), features(80)], 3) == [(0, 0, 50), (1, 0, 80)]
+
+
+def test_windows_partition_the_whole_recording_score():
+    f = features()
+    p = {'TURN_LEFT_TRIGGER': np.array([0.35, 0.45]), 'TURN_RIGHT_TRIGGER': np.array([0.6, 0.6])}
+    (whole,) = score_turn(f, p, [(0, 100)])
+    parts = score_turn(f, p, [(0, 40), (40, 70), (70, 100)])
+    assert np.array_equal(sum(s['turn_acc'][0] for s in parts), whole['turn_acc'][0])
+    assert sum(s['turn_acc'][1] for s in parts) == whole['turn_acc'][1]
+    # The lean starts in the first chunk, so its latency is scored there only
+    assert [len(s['turn_ms']) for s in parts] == [1, 0, 0]
+
+
+def test_only_changed_winners_on_a_bound_are_flagged():
+    space = SPACE['walk']
+    base = {'STARTUP_STEPS_REQUIRED': 3, 'STEP_COOLDOWN': 0.1, 'MOMENTUM_GAIN': 0.2}
+    best = {'STARTUP_STEPS_REQUIRED': 1, 'STEP_COOLDOWN': 0.1, 'MOMENTUM_GAIN': 0.25}
+    assert on_bounds(best, space, base) == [('STARTUP_STEPS_REQUIRED', 1, 1)]
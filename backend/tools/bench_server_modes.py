@@ -0,0 +1,159 @@
+# =============================================================================
+#  bench_server_modes.py  —  eventlet vs asyncio event-handling latency
+#
+#  Starts server.py and server_async.py in turn on a spare port, connects
+#  --clients concurrent Socket.IO clients, and has each one fire acknowledged
+#  events back-to-back for --duration seconds.  The ack round-trip is the
+#  event-handling latency; server CPU is read from /proc.
+#
+#  Run from backend/:
+#      python -m tools.bench_server_modes --clients 200 --duration 15
+#  Output (one block per mode):
+#      mode      event               n     p50     p95     p99     max  (ms)
+#  Without a camera/model both servers sit in the ERROR stage, so this
+#  measures the Socket.IO + handler path only, not capture contention.
+# =============================================================================
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = {'eventlet': 'server.py', 'asyncio': 'server_async.py'}
+
+# event → (weight, payload)
+EVENT_MIX = {
+    'get_config':          (6, None),
+    'request_leaderboard': (3, None),
+    'request_questions':   (1, {'name': 'Bench', 'classId': 'B1', 'topic': 'math'}),
+}
+
+
+def percentile(sorted_samples, q):
+    if not sorted_samples:
+        return float('nan')
+    i = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[i]
+
+
+def cpu_seconds(pid):
+    """utime + stime of a process from /proc (None where /proc is unavailable)."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def launch_server(script, port, env=None, overrides=None):
+    """
+    Starts a server script from backend/ with SERVER_PORT (plus any other
+    config `overrides`) patched in; waits until it serves HTTP.
+    """
+    patches = ''.join(f"config.{name} = {value!r}; "
+                      for name, value in {'SERVER_PORT': port, **(overrides or {})}.items())
+    code = (f"import config; {patches}import runpy; "
+            f"runpy.run_path({script!r}, run_name='__main__')")
+    proc = subprocess.Popen([sys.executable, '-c', code], cwd=BACKEND_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            env={**os.environ, **(env or {})})
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{script} exited with code {proc.returncode}")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"{script} did not start within 30s")
+
+
+async def _client_worker(url, clock, latencies, errors, start_gate):
+    import socketio
+
+    client = socketio.AsyncClient(reconnection=False)
+    names = list(EVENT_MIX)
+    weights = [EVENT_MIX[n][0] for n in names]
+    try:
+        await client.connect(url, transports=['websocket'])
+    except Exception:
+        errors['connect'] = errors.get('connect', 0) + 1
+        return
+    await start_gate.wait()
+    try:
+        while time.monotonic() < clock['deadline']:
+            event = random.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                await client.call(event, EVENT_MIX[event][1], timeout=10)
+            except Exception:
+                errors[event] = errors.get(event, 0) + 1
+                continue
+            latencies.setdefault(event, []).append((time.perf_counter() - t0) * 1000)
+    finally:
+        await client.disconnect()
+
+
+async def run_load(url, clients, duration):
+    """Returns ({event: [latency_ms]}, {event|'connect': error_count}, wall seconds)."""
+    latencies, errors = {}, {}
+    clock = {'deadline': 0.0}
+    start_gate = asyncio.Event()
+    workers = []
+    for _ in range(clients):  # connect everyone first, then release them together
+        workers.append(asyncio.create_task(_client_worker(url, clock, latencies, errors, start_gate)))
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(1.0)
+
+    t0 = time.monotonic()
+    clock['deadline'] = t0 + duration
+    start_gate.set()
+    await asyncio.gather(*workers)
+    return latencies, errors, time.monotonic() - t0
+
+
+def report(mode, latencies, errors, wall, cpu):
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n── {mode}: {total} events in {wall:.1f}s → {total / wall:.0f} ev/s"
+          + (f", server CPU {cpu / wall * 100:.0f}%" if cpu is not None else ""))
+    print(f"  {'event':<22}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for event, samples in sorted(latencies.items()):
+        samples.sort()
+        print(f"  {event:<22}{len(samples):>7}"
+              + ''.join(f"{percentile(samples, q):>9.1f}" for q in (0.5, 0.95, 0.99))
+              + f"{samples[-1]:>9.1f}")
+    if errors:
+        print(f"  errors: {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='eventlet vs asyncio event-handling latency')
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of load per mode')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        proc = launch_server(MODES[mode], args.port)
+        try:
+            cpu0 = cpu_seconds(proc.pid)
+            latencies, errors, wall = asyncio.run(
+                run_load(f'http://127.0.0.1:{args.port}', args.clients, args.duration))
+            cpu1 = cpu_seconds(proc.pid)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        report(mode, latencies, errors, wall,
+               None if cpu0 is None or cpu1 is None else cpu1 - cpu0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+# =============================================================================
+#  load_test.py  —  Synthetic multi-client load against the Socket.IO backend
+#
+#  Answers "how many dashboards, leaderboard viewers and concurrent quiz
+#  players can one server take?" before an event.  The tool
+#    • runs a stub Gemini endpoint (GEMINI_API_URL) that answers every
+#      generateContent call (single- or multi-topic) after --llm-delay seconds,
+#    • starts server.py / server_async.py with FRAME_SOURCE='synthetic'
+#      (no camera or model) and a throw-away leaderboard file,
+#    • spreads the simulated clients over --procs processes, one asyncio
+#      loop each, so the load generator is not the bottleneck,
+#  then reports telemetry delivery per client, ack latency percentiles per
+#  event and server CPU.
+#
+#  Run from backend/:
+#      python -m tools.load_test --mix dashboard=200,viewer=50,player=20
+#      python -m tools.load_test --mode asyncio --llm-delay 2.5 --procs 4
+#  Roles are defined in ROLES below.  Every client receives telemetry, as
+#  the real game and leaderboard pages do.
+# =============================================================================
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tools.bench_server_modes import MODES, cpu_seconds, launch_server, percentile
+
+# role → (mean seconds between events per client, {event: (weight, payload)})
+ROLES = {
+    'dashboard': (10.0, {'get_config': (1, None)}),
+    'viewer':    (2.0,  {'request_leaderboard': (1, None)}),
+    'player':    (5.0,  {'request_questions': (2, {'name': 'Load', 'classId': 'LT', 'topic': 'Space'}),
+                         'submit_score':      (1, {'time_ms': 61234, 'time_str': '01:01.234'})}),
+}
+TELEMETRY_EVENT = 'telemetry'
+
+
+# ── Stub Gemini ───────────────────────────────────────────────────────────────
+class _StubGeminiHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    counter = itertools.count()
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        time.sleep(self.delay)
+        n = next(self.counter)  # unique texts, so the question pool never de-dups them
+
+        def items(tag, count):
+            return [{'text': f'Load test {n}{tag}: what is {n} plus {i}?',
+                     'correct_answer': str(n + i), 'wrong_answer': str(n + i + 1)}
+                    for i in range(count)]
+
+        prompt = request['contents'][0]['parts'][0]['text'] if request else ''
+        topics = [line[len('Topics: '):] for line in prompt.splitlines() if line.startswith('Topics: ')]
+        if topics:  # questions/gemini.py build_batch_request()
+            answer = [{'id': t['id'], 'questions': items(f"/{t['id']}", t['count'])}
+                      for t in json.loads(topics[0])]
+        else:
+            answer = items('', 15)
+        body = json.dumps({'candidates': [{'content': {'parts': [{'text': json.dumps(answer)}]}}]})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def start_stub_gemini(delay):
+    """Serves Gemini-shaped responses on an ephemeral port; returns the HTTP server."""
+    handler = type('StubGeminiHandler', (_StubGeminiHandler,), {'delay': delay})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, name='stub-gemini', daemon=True).start()
+    return server
+
+
+# ── Simulated clients ─────────────────────────────────────────────────────────
+async def _client(role, url, start_at, end_at, rate_scale, result):
+    import socketio
+
+    client = socketio.AsyncClient(reconnection=False)
+    arrivals = []
+    client.on(TELEMETRY_EVENT, lambda data: arrivals.append(time.time()))
+    try:
+        await client.connect(url, transports=['websocket'])
+    except Exception:
+        result['errors']['connect'] = result['errors'].get('connect', 0) + 1
+        return
+
+    interval, mix = ROLES[role]
+    interval /= rate_scale
+    names = list(mix)
+    weights = [mix[n][0] for n in names]
+    latencies, errors = result['latencies'], result['errors']
+    try:
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        next_event = start_at + random.uniform(0.0, interval)  # spread the first events
+        while True:
+            await asyncio.sleep(max(0.0, next_event - time.time()))
+            if time.time() >= end_at:
+                break
+            event = random.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                await client.call(event, mix[event][1], timeout=30)
+            except Exception:
+                errors[event] = errors.get(event, 0) + 1
+            else:
+                latencies.setdefault(event, []).append((time.perf_counter() - t0) * 1000)
+            next_event = time.time() + random.uniform(0.5, 1.5) * interval
+    finally:
+        window = [t for t in arrivals if start_at <= t < end_at]
+        gaps = [b - a for a, b in zip(window, window[1:])]
+        result['telemetry'].append((role, len(window), max(gaps, default=end_at - start_at)))
+        await client.disconnect()
+
+
+def run_shard(url, roles, start_at, end_at, rate_scale):
+    """One load-generator process: runs `roles` clients, returns picklable results."""
+    result = {'latencies': {}, 'errors': {}, 'telemetry': []}
+
+    async def main():
+        tasks = []
+        for role in roles:
+            tasks.append(asyncio.create_task(_client(role, url, start_at, end_at, rate_scale, result)))
+            await asyncio.sleep(0.005)  # stagger the connection storm
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    return result
+
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+def parse_mix(text):
+    """'dashboard=200,viewer=50' → {'dashboard': 200, 'viewer': 50}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        role, _, count = part.partition('=')
+        if role not in ROLES:
+            raise argparse.ArgumentTypeError(f"unknown role {role!r} (choose from {', '.join(ROLES)})")
+        mix[role] = int(count or 1)
+    return mix
+
+
+def merge(results):
+    merged = {'latencies': {}, 'errors': {}, 'telemetry': []}
+    for r in results:
+        for event, samples in r['latencies'].items():
+            merged['latencies'].setdefault(event, []).extend(samples)
+        for event, n in r['errors'].items():
+            merged['errors'][event] = merged['errors'].get(event, 0) + n
+        merged['telemetry'].extend(r['telemetry'])
+    return merged
+
+
+def report(mode, mix, duration, results, cpu, llm_calls):
+    print(f"\n── {mode}: {sum(mix.values())} clients "
+          f"({', '.join(f'{r} {n}' for r, n in mix.items())}), {duration:.0f}s"
+          + (f", server CPU {cpu / duration * 100:.0f}%" if cpu is not None else ""))
+
+    telemetry = results['telemetry']
+    if telemetry:
+        rates = sorted(n / duration for _, n, _ in telemetry)
+        gaps = sorted(g * 1000 for _, _, g in telemetry)
+        print(f"  telemetry  per client: p50 {percentile(rates, 0.5):.1f}/s  "
+              f"p5 {percentile(rates, 0.05):.1f}/s  min {rates[0]:.1f}/s  "
+              f"(best {rates[-1]:.1f}/s ≈ emit rate)")
+        print(f"             longest gap: p50 {percentile(gaps, 0.5):.0f} ms  "
+              f"p99 {percentile(gaps, 0.99):.0f} ms  max {gaps[-1]:.0f} ms")
+
+    print(f"  {'event':<22}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for event, samples in sorted(results['latencies'].items()):
+        samples.sort()
+        print(f"  {event:<22}{len(samples):>7}"
+              + ''.join(f"{percentile(samples, q):>9.1f}" for q in (0.5, 0.95, 0.99))
+              + f"{samples[-1]:>9.1f}")
+    questions = len(results['latencies'].get('request_questions', ()))
+    if questions:
+        print(f"  stub Gemini calls: {llm_calls} for {questions} request_questions")
+    if results['errors']:
+        print(f"  errors: {results['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic multi-client load test')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('dashboard=100,viewer=30,player=10'),
+                        help='role=count,... (roles: ' + ', '.join(ROLES) + ')')
+    parser.add_argument('--duration', type=float, default=20.0, help='measured seconds')
+    parser.add_argument('--rate-scale', type=float, default=1.0,
+                        help='multiplies every role\'s event rate')
+    parser.add_argument('--llm-delay', type=float, default=1.5, help='stub Gemini latency (s)')
+    parser.add_argument('--mode', choices=list(MODES), default='eventlet')
+    parser.add_argument('--procs', type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help='load-generator processes')
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    roles = [role for role, n in args.mix.items() for _ in range(n)]
+    random.shuffle(roles)
+    shards = [roles[i::args.procs] for i in range(args.procs) if roles[i::args.procs]]
+
+    stub = start_stub_gemini(args.llm_delay)
+    with tempfile.TemporaryDirectory(prefix='motion-load-') as tmp:
+        env = {'GEMINI_API_KEY': 'load-test',
+               'GEMINI_API_URL': f'http://127.0.0.1:{stub.server_port}/generateContent'}
+        overrides = {'FRAME_SOURCE': 'synthetic', 'DEV_SKIP_AI_QUESTIONS': False,
+                     'LEADERBOARD_FILE': os.path.join(tmp, 'leaderboard.json')}
+        proc = launch_server(MODES[args.mode], args.port, env, overrides)
+        try:
+            ramp = 2.0 + 0.01 * max(len(s) for s in shards)  # time for every client to connect
+            start_at = time.time() + ramp
+            end_at = start_at + args.duration
+            url = f'http://127.0.0.1:{args.port}'
+            with multiprocessing.get_context('spawn').Pool(len(shards)) as pool:
+                pending = pool.starmap_async(
+                    run_shard, [(url, s, start_at, end_at, args.rate_scale) for s in shards])
+                time.sleep(max(0.0, start_at - time.time()))
+                cpu0 = cpu_seconds(proc.pid)
+                time.sleep(max(0.0, end_at - time.time()))
+                cpu1 = cpu_seconds(proc.pid)
+                results = merge(pending.get())
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+            stub.shutdown()
+
+    report(args.mode, args.mix, args.duration, results,
+           None if cpu0 is None or cpu1 is None else cpu1 - cpu0,
+           next(stub.RequestHandlerClass.counter))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+# =============================================================================
+#  record_motion.py  —  Record labelled landmark sessions for tune_motion.py
+#
+#  A recording is what PlayerTracker sees for player 1, frame by frame, plus
+#  what it *should* report.  Labels come from a prompt script in the
+#  vision/synthetic.py syntax ("idle:4, walk:8@120, lean_left:2, ..."):
+#
+#      --source camera     the script is shown as cues ("▶ WALK (8s)") and
+#                          the person in front of the camera follows it;
+#                          frames come from the real PosePipeline
+#      --source synthetic  a SyntheticPipeline plays the script itself, in
+#                          virtual time (fast, reproducible per --seed)
+#
+#  Saved as .npz (default: backend/recordings/<timestamp>.npz):
+#      t        (N,)        seconds since the first frame
+#      pose     (N, 33, 5)  x, y, z, visibility, presence — output space
+#                           (after MIRROR_INPUT); NaN rows = no player
+#      walk     (N,) bool   should be WALKING
+#      turn     (N,) int8   -1 LEFT, 0 CENTER, 1 RIGHT
+#      answer   (N,) int8   0 none, 1 "A", 2 "B" — arm held up for an answer
+#      meta     JSON str    source, script, fps, mirrored
+#
+#  Run from backend/:
+#      python -m tools.record_motion --source camera --script "idle:4, walk:10, idle:3, lean_left:3, ..."
+#      python -m tools.record_motion --source synthetic --seed 3 --out recordings/synthetic-3.npz
+# =============================================================================
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from config import MIRROR_INPUT, SYNTHETIC_FPS, SYNTHETIC_SCRIPT
+from vision.landmarks import Landmark, NUM_LANDMARKS
+from vision.synthetic import PoseGenerator, parse_script
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORDINGS_DIR = os.path.join(BACKEND_DIR, 'recordings')
+TURN_CODES = {'LEFT': -1, 'CENTER': 0, 'RIGHT': 1}
+ANSWER_CODES = {None: 0, 'A': 1, 'B': 2}
+LEAD_IN = 3.0   # camera: countdown before recording starts
+
+
+def labels_for(motion, mirrored=MIRROR_INPUT):
+    """
+    (walk, turn, answer) codes PlayerTracker should produce for a script
+    motion.  Sides in the script are the player's own; mirroring swaps which
+    telemetry arm / lean direction they end up as (AnswerGestureRecognizer:
+    r_arm → "A", l_arm → "B").
+    """
+    if motion == 'walk':
+        return True, 0, 0
+    if motion in ('lean_left', 'lean_right'):
+        left = (motion == 'lean_left') == mirrored
+        return False, TURN_CODES['LEFT' if left else 'RIGHT'], 0
+    if motion in ('raise_left', 'raise_right'):
+        telemetry_left = (motion == 'raise_right') == mirrored
+        return False, 0, ANSWER_CODES['B' if telemetry_left else 'A']
+    return False, 0, 0
+
+
+def pose_array(landmarks):
+    """Landmark list (or None) → (33, 5) float32 row; NaN when there is no pose."""
+    if landmarks is None:
+        return np.full((NUM_LANDMARKS, 5), np.nan, dtype=np.float32)
+    return np.array([(lm.x, lm.y, lm.z or 0.0,
+                      1.0 if lm.visibility is None else lm.visibility,
+                      1.0 if getattr(lm, 'presence', None) is None else lm.presence)
+                     for lm in landmarks], dtype=np.float32)
+
+
+def poses(recording):
+    """Yields each frame as a Landmark list (None for no player)."""
+    for row in recording['pose']:
+        if np.isnan(row[0, 0]):
+            yield None
+        else:
+            yield [Landmark(float(x), float(y), float(z), float(v), float(p))
+                   for x, y, z, v, p in row]
+
+
+def save_recording(path, frames, meta):
+    """frames: list of (t, landmarks | None, (walk, turn, answer))."""
+    if not frames:
+        raise ValueError("Nothing recorded")
+    labels = np.array([f[2] for f in frames], dtype=np.int8)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez_compressed(
+        path,
+        t=np.array([f[0] for f in frames], dtype=np.float64),
+        pose=np.stack([pose_array(f[1]) for f in frames]),
+        walk=labels[:, 0].astype(bool),
+        turn=labels[:, 1],
+        answer=labels[:, 2],
+        meta=json.dumps(meta),
+    )
+
+
+def load_recording(path):
+    with np.load(path) as data:
+        recording = {key: data[key] for key in ('t', 'pose', 'walk', 'turn', 'answer')}
+        recording['meta'] = json.loads(str(data['meta']))
+    recording['path'] = path
+    return recording
+
+
+def record_synthetic(script, fps, seed):
+    from vision.pipeline import SyntheticPipeline
+
+    pipeline = SyntheticPipeline(script=script, seed=seed, realtime=False, loop=False, fps=fps)
+    pipeline.load_model()
+    pipeline.open_camera()
+    frames = []
+    while True:
+        ok, players = pipeline.read()
+        if not ok:
+            return frames
+        t = pipeline.scene.t
+        frames.append((t, players[0], labels_for(pipeline.scene.segment_at(t)[0])))
+
+
+def record_camera(script):
+    from vision.pipeline import PosePipeline
+
+    pipeline = PosePipeline(os.path.join(BACKEND_DIR, 'models'))
+    pipeline.load_model()
+    pipeline.open_camera()
+    cues = PoseGenerator(script, loop=False)   # only used for its timeline
+
+    for remaining in range(int(LEAD_IN), 0, -1):
+        print(f"   starting in {remaining}…  first: {cues.segments[0][0].upper()}", flush=True)
+        time.sleep(1.0)
+
+    frames = []
+    current = None
+    started = time.monotonic()
+    while True:
+        ok, players = pipeline.read()
+        t = time.monotonic() - started
+        segment = cues.segment_at(t)
+        if segment is None:
+            break
+        if not ok:
+            continue
+        if segment[0] != current or segment[2] < 1.0 / SYNTHETIC_FPS:
+            current = segment[0]
+            print(f"▶ {current.upper().replace('_', ' ')}  ({segment[3]:.0f}s)", flush=True)
+        frames.append((t, players[0], labels_for(current)))
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record a labelled landmark session')
+    parser.add_argument('--source', choices=('camera', 'synthetic'), default='synthetic')
+    parser.add_argument('--script', default=SYNTHETIC_SCRIPT, help='prompt script (vision/synthetic.py syntax)')
+    parser.add_argument('--fps', type=float, default=SYNTHETIC_FPS, help='synthetic frame rate')
+    parser.add_argument('--seed', type=int, default=0, help='synthetic jitter seed')
+    parser.add_argument('--out', default=None, help='.npz path (default: recordings/<timestamp>.npz)')
+    args = parser.parse_args()
+
+    try:
+        parse_script(args.script)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.source == 'camera':
+        frames = record_camera(args.script)
+    else:
+        frames = record_synthetic(args.script, args.fps, args.seed)
+
+    out = args.out or os.path.join(RECORDINGS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.npz')
+    meta = {'source': args.source, 'script': args.script, 'fps': args.fps,
+            'seed': args.seed if args.source == 'synthetic' else None, 'mirrored': MIRROR_INPUT}
+    try:
+        save_recording(out, frames, meta)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    seen = sum(1 for f in frames if f[1] is not None)
+    print(f"✅ Saved {len(frames)} frames ({seen} with a player, {frames[-1][0]:.1f}s) → {out}")
+
+
+if __name__ == '__main__':
+    main()
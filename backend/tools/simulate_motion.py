@@ -0,0 +1,106 @@
+# =============================================================================
+#  simulate_motion.py  —  Run the motion state machine on scripted poses
+#
+#  Feeds a SyntheticPipeline (vision/synthetic.py's scripted players through
+#  the real ROI / frame-skip / tracking chain) into the same per-tick path as
+#  game_loop() — PlayerTracker.update → AnswerGestureRecognizer — with
+#  virtual time, so a minute of play takes a fraction of a second and needs
+#  no camera, model or jogging.  Prints a timeline of what the game would see
+#  (status / turn changes, steps, quiz answers) and a summary.
+#
+#  Run from backend/:
+#      python -m tools.simulate_motion
+#      python -m tools.simulate_motion --script "idle:3, walk:10@160, raise_left:2" --seed 1
+#      python -m tools.simulate_motion --jsonl > telemetry.jsonl   # every tick
+# =============================================================================
+import argparse
+import json
+import sys
+import time
+
+from config import SYNTHETIC_FPS, SYNTHETIC_SCRIPT
+from motion_logic.tracker import PlayerTracker
+from vision.pipeline import SyntheticPipeline
+
+
+def simulate(script, fps=SYNTHETIC_FPS, seed=0, duration=None, on_tick=None):
+    """
+    Runs player 1's tracker over the script in virtual time.
+    Returns a list of (t, kind, detail) timeline events.
+    """
+    pipeline = SyntheticPipeline(script=script, seed=seed, realtime=False,
+                                 loop=duration is not None, fps=fps)
+    pipeline.load_model()
+    pipeline.open_camera()
+    calibrated = []
+    tracker = PlayerTracker(on_calibrated=lambda tr: calibrated.append(tr.bounce_threshold))
+    timeline = []
+    last = {'status': None, 'turn': None, 'segment': None}
+    steps = 0
+
+    while True:
+        ok, players = pipeline.read()
+        t = pipeline.scene.t
+        if not ok or (duration is not None and t >= duration):
+            break
+        segment = pipeline.scene.segment_at(t)[0]
+        if segment != last['segment']:
+            timeline.append((t, 'script', segment))
+            last['segment'] = segment
+
+        telemetry = tracker.update(players[0], t)
+        answer = tracker.answer_recognizer.update(telemetry, t)
+        if on_tick:
+            on_tick(t, telemetry)
+
+        if calibrated:
+            timeline.append((t, 'calibrated', f"bounce threshold {calibrated.pop():.4f}"))
+        for key in ('status', 'turn'):
+            if telemetry[key] != last[key]:
+                timeline.append((t, key, telemetry[key]))
+                last[key] = telemetry[key]
+        if telemetry['steps'] != steps:
+            steps = telemetry['steps']
+            timeline.append((t, 'step', steps))
+        if answer:
+            timeline.append((t, 'answer', f"{answer['choice']} (dwell {answer['dwell_ms']} ms)"))
+    return timeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run PlayerTracker on a synthetic motion script')
+    parser.add_argument('--script', default=SYNTHETIC_SCRIPT, help='see vision/synthetic.py')
+    parser.add_argument('--fps', type=float, default=SYNTHETIC_FPS)
+    parser.add_argument('--seed', type=int, default=0, help='jitter seed (runs are reproducible)')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='seconds to run, looping the script (default: one pass)')
+    parser.add_argument('--jsonl', action='store_true', help='print every tick\'s telemetry instead')
+    args = parser.parse_args()
+
+    def print_tick(t, telemetry):
+        sys.stdout.write(json.dumps({'t': round(t, 3), **telemetry}) + '\n')
+
+    started = time.perf_counter()
+    try:
+        timeline = simulate(args.script, args.fps, args.seed, args.duration,
+                            on_tick=print_tick if args.jsonl else None)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - started
+    if args.jsonl:
+        return
+
+    steps = 0
+    for t, kind, detail in timeline:
+        if kind == 'step':
+            steps = detail  # collapsed into the summary; too chatty per step
+            continue
+        print(f"{t:8.2f}s  {kind:<11}{detail}")
+    simulated = timeline[-1][0] if timeline else 0.0
+    answers = [d for _, k, d in timeline if k == 'answer']
+    print(f"\n{steps} steps, {len(answers)} answers; simulated {simulated:.1f}s "
+          f"in {elapsed * 1000:.0f} ms ({simulated / max(elapsed, 1e-9):.0f}× real time)")
+
+
+if __name__ == '__main__':
+    main()
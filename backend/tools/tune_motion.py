@@ -0,0 +1,707 @@
+# =============================================================================
+#  tune_motion.py  —  Parameter sweep for the walk / turn / arm thresholds
+#
+#  Replays labelled recordings (tools/record_motion.py) through the motion
+#  logic for thousands of candidate configs and prints the best one as
+#  config.json overrides, with accuracy and latency scores against the
+#  current config.
+#
+#  How it stays fast
+#  ─────────────────
+#  • Everything that does not depend on a tuned parameter — landmark
+#    filtering, the lock zone, calibration noise, shoulder deltas, nose x,
+#    raw arm lift — is extracted once per recording.
+#  • Each candidate batch is then evaluated as numpy arrays shaped
+#    (candidates, frames): turn and arm angles are pure broadcasts; the walk
+#    and answer state machines step through the frames once, updating all
+#    candidates per step.
+#  • The three parameter groups only affect their own outputs, so they are
+#    searched independently (sum, not product, of the grid sizes), and the
+#    batches are spread over a process pool.
+#
+#  Search: --search grid (--points per parameter) or random (--samples per
+#  group), then --refine rounds that zoom in around the best candidate.
+#  BOUNCE_THRESHOLD is only the pre-calibration default — the calibrated
+#  threshold is noise × CALIB_NOISE_MULTIPLIER, so the multiplier is what is
+#  tuned.  Background recalibration is left out of the replay (it only
+#  moves the threshold after CALIB_BACKGROUND_FRAMES idle frames).
+#
+#  Scores (frames up to calibration and within SETTLE s of a label change
+#  are not scored; latency misses count as the whole segment):
+#      walk    WALKING accuracy, speed accuracy (1 − |momentum − walking|),
+#              start latency (→ WALKING), stop latency (→ momentum < 0.1)
+#      turn    turn accuracy, lean → turn latency
+#      answer  answer F1 (one event of the right choice per raise), latency
+#  group score = accuracy − --latency-weight × latency (s)
+#
+#  Held-out check: the search is repeated with one unit left out — each
+#  recording in turn, or for a single recording each of --folds time chunks
+#  — and current vs tuned are scored on the unit it never saw.  --apply
+#  refuses (unless --force) when tuned loses there, or when a winner sits on
+#  a search-range bound (the real optimum may lie outside the range).
+#
+#  Run from backend/:
+#      python -m tools.tune_motion recordings/*.npz
+#      python -m tools.tune_motion recordings/*.npz --search random --samples 5000 --apply
+#      python -m tools.tune_motion recordings/*.npz --groups turn --param TURN_LEFT_TRIGGER=0.35:0.45
+# =============================================================================
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from runtime_config import SCHEMA, ConfigError, RuntimeConfig, validate
+from tools.record_motion import load_recording, poses
+
+SETTLE = 0.5          # s after a label change that is not scored
+STOP_MOMENTUM = 0.1   # momentum below which the character counts as stopped
+
+# group → {name: (low, high)}; types and hard bounds come from runtime_config.SCHEMA
+SPACE = {
+    'walk': {
+        'STARTUP_STEPS_REQUIRED': (1, 6),
+        'STOP_TIMEOUT':           (0.2, 1.5),
+        'STEP_COOLDOWN':          (0.1, 0.6),
+        'MOMENTUM_GAIN':          (0.05, 0.4),
+        'MOMENTUM_DECAY':         (0.8, 0.99),
+        'CALIB_NOISE_MULTIPLIER': (1.0, 3.0),
+    },
+    'turn': {
+        'TURN_LEFT_TRIGGER':      (0.32, 0.48),
+        'TURN_RIGHT_TRIGGER':     (0.52, 0.68),
+    },
+    'answer': {
+        'ARM_LIFT_OFFSET':        (0.2, 0.6),
+        'ARM_DEADZONE':           (0.1, 0.5),
+        'ARM_ANGLE_MULTIPLIER':   (150.0, 330.0),
+        'ANSWER_ARM_THRESHOLD':   (45.0, 90.0),
+        'ANSWER_DWELL':           (0.1, 0.6),
+    },
+}
+# Non-tuned settings each group's replay reads (current values are used)
+FIXED = {
+    'walk': ('CALIB_THRESHOLD_MIN', 'CALIB_THRESHOLD_MAX'),
+    'turn': (),
+    'answer': ('ANSWER_RELEASE_THRESHOLD', 'ANSWER_MIN_CONFIDENCE'),
+}
+
+
+# ─── Feature extraction (once per recording, parameter-independent) ──────────
+def extract_features(recording, base):
+    """
+    Runs the parameter-independent half of PlayerTracker.update() over a
+    recording (`base` = current config values, also bound to the modules).
+    """
+    from motion_logic.calibration import NoiseCalibrator
+    from motion_logic.landmark_filter import LandmarkFilter, joint_confidence
+
+    n = len(recording['t'])
+    active = np.zeros(n, dtype=bool)
+    delta = np.zeros(n)
+    down = np.zeros(n, dtype=bool)
+    nose_x = np.full(n, 0.5)
+    lift = np.zeros((2, n))       # shoulder.y − wrist.y, left / right
+    conf = np.zeros((2, n))       # telemetry l_arm_conf / r_arm_conf
+
+    landmark_filter = LandmarkFilter()
+    calibrator = NoiseCalibrator()
+    prev_y = 0
+    calibration_frames = 0
+    calibrated_at = n
+    noise = None
+    for i, landmarks in enumerate(poses(recording)):
+        if not landmarks:
+            continue
+        landmarks = landmark_filter.apply(landmarks)
+        x = landmarks[0].x - 0.5 + 0.5   # same arithmetic as the tracker (center_x = 0.5)
+        calibrating = noise is None
+        if (x < (base['CENTER_LEFT_LIMIT'] if calibrating else 0.1)
+                or x > (base['CENTER_RIGHT_LIMIT'] if calibrating else 0.9)):
+            continue
+        shoulder_y = (landmarks[11].y + landmarks[12].y) / 2
+        d = abs(shoulder_y - prev_y)
+        if calibrating:
+            calibration_frames += 1
+            calibrator.add(d)
+            if calibration_frames > base['CALIB_FRAMES_NEEDED']:
+                noise = calibrator.noise_level()
+                calibrated_at = i + 1
+        else:
+            active[i] = True
+            delta[i] = d
+            down[i] = shoulder_y > prev_y
+            nose_x[i] = x
+            lift[0, i] = landmarks[11].y - landmarks[15].y
+            lift[1, i] = landmarks[12].y - landmarks[16].y
+            conf[0, i] = round(joint_confidence(landmarks, 11, 15), 2)
+            conf[1, i] = round(joint_confidence(landmarks, 12, 16), 2)
+        prev_y = shoulder_y
+
+    return {
+        'name': os.path.basename(recording['path']),
+        't': recording['t'], 'active': active, 'delta': delta, 'down': down,
+        'nose_x': nose_x, 'lift': lift, 'conf': conf,
+        'noise': noise, 'calibrated_at': calibrated_at,
+        'walk': recording['walk'], 'turn': recording['turn'].astype(np.int64),
+        'answer': recording['answer'].astype(np.int64),
+    }
+
+
+# ─── Vectorised replay: params are {name: (C,) array} ─────────────────────────
+def replay_walk(f, p):
+    """(walking (C, N) bool, momentum (C, N)) — WalkState for every candidate at once."""
+    t, active, delta, down = f['t'], f['active'], f['delta'], f['down']
+    gain, decay = p['MOMENTUM_GAIN'], p['MOMENTUM_DECAY']
+    cooldown, stop_timeout = p['STEP_COOLDOWN'], p['STOP_TIMEOUT']
+    startup = p['STARTUP_STEPS_REQUIRED']
+    c = len(gain)
+    walking_out = np.zeros((c, len(t)), dtype=bool)
+    momentum_out = np.zeros((c, len(t)))
+    if f['noise'] is None:
+        return walking_out, momentum_out
+    threshold = np.clip(f['noise'] * p['CALIB_NOISE_MULTIPLIER'],
+                        p['CALIB_THRESHOLD_MIN'], p['CALIB_THRESHOLD_MAX'])
+
+    momentum = np.zeros(c)
+    last_step = np.zeros(c)
+    consecutive = np.zeros(c, dtype=np.int64)
+    walking = np.zeros(c, dtype=bool)
+    for i in range(f['calibrated_at'], len(t)):
+        if active[i]:
+            now = t[i]
+            bounce = delta[i] > threshold
+            step = bounce & (now - last_step > cooldown) if down[i] else np.zeros(c, dtype=bool)
+            momentum = np.where(bounce, momentum + gain, momentum * decay)
+            consecutive += step
+            last_step = np.where(step, now, last_step)
+            walking |= step & (consecutive >= startup)
+            stop = ~bounce & (now - last_step > stop_timeout)
+            consecutive[stop] = 0
+            walking &= ~stop
+            np.clip(momentum, 0, 1, out=momentum)
+            walking_out[:, i] = walking
+        momentum_out[:, i] = momentum
+    return walking_out, momentum_out
+
+
+def replay_turn(f, p):
+    """(C, N) turn codes — calculate_turn_signal() as a broadcast."""
+    nose = f['nose_x'][None, :]
+    turn = np.where(nose < p['TURN_LEFT_TRIGGER'][:, None], -1,
+                    np.where(nose > p['TURN_RIGHT_TRIGGER'][:, None], 1, 0))
+    return turn * f['active']
+
+
+def arm_angles(f, p, side):
+    """(C, N) telemetry arm angle — calculate_arm_angle() as a broadcast."""
+    raw = f['lift'][side][None, :] + p['ARM_LIFT_OFFSET'][:, None]
+    angle = np.floor(np.clip(raw * p['ARM_ANGLE_MULTIPLIER'][:, None], 0, 180))
+    return np.where(raw < p['ARM_DEADZONE'][:, None], 0, angle) * f['active']
+
+
+def replay_answer(f, p):
+    """(C, N) fired answer codes (0 = none) — AnswerGestureRecognizer for every candidate."""
+    t = f['t']
+    l_arm, r_arm = arm_angles(f, p, 0), arm_angles(f, p, 1)
+    threshold = p['ANSWER_ARM_THRESHOLD'][:, None]
+    min_conf = p['ANSWER_MIN_CONFIDENCE'][:, None]
+    left = (l_arm > threshold) & (f['conf'][0][None, :] >= min_conf)
+    right = (r_arm > threshold) & (f['conf'][1][None, :] >= min_conf)
+    choice = np.where(left & ~right, 2, np.where(right & ~left, 1, 0))
+    release = p['ANSWER_RELEASE_THRESHOLD']
+    dwell = p['ANSWER_DWELL']
+
+    c = len(dwell)
+    fired = np.zeros((c, len(t)), dtype=np.int64)
+    candidate = np.zeros(c, dtype=np.int64)
+    since = np.zeros(c)
+    latched = np.zeros(c, dtype=bool)
+    for i in range(len(t)):
+        free = ~latched
+        latched &= ~((l_arm[:, i] < release) & (r_arm[:, i] < release))
+        now_choice = choice[:, i]
+        switched = free & (now_choice != 0) & (now_choice != candidate)
+        since = np.where(switched, t[i], since)
+        candidate = np.where(free, now_choice, candidate)
+        fire = free & (now_choice != 0) & (t[i] - since >= dwell)
+        fired[fire, i] = now_choice[fire]
+        candidate[fire] = 0
+        latched |= fire
+    return fired
+
+
+# ─── Scoring ──────────────────────────────────────────────────────────────────
+def _runs(labels, start):
+    """[(first, end, value)] runs of equal labels from index `start` on."""
+    edges = np.flatnonzero(np.diff(labels[start:])) + start + 1
+    bounds = [start, *edges.tolist(), len(labels)]
+    return [(a, b, labels[a]) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def _scored(f, labels):
+    """Frames after calibration and at least SETTLE s past a label change."""
+    t = f['t']
+    mask = np.zeros(len(t), dtype=bool)
+    for a, b, _ in _runs(labels, f['calibrated_at']):
+        mask[a:b] = t[a:b] - t[a] >= SETTLE
+    return mask
+
+
+def _latency(f, hits, a, b):
+    """Seconds from frame a to the first hit in [a, b) per candidate; misses cost b − a."""
+    window = hits[:, a:b]
+    first = window.argmax(axis=1)
+    t = f['t']
+    return np.where(window.any(axis=1), t[a + first] - t[a], t[b - 1] - t[a])
+
+
+def _windowed(f, labels, windows):
+    """Per (lo, hi) window: (scored-frame mask, [label runs starting inside it])."""
+    mask = _scored(f, labels)
+    runs = _runs(labels, f['calibrated_at'])
+    out = []
+    for lo, hi in windows:
+        inside = np.zeros(len(labels), dtype=bool)
+        inside[lo:hi] = True
+        out.append((mask & inside, [r for r in runs if lo <= r[0] < hi]))
+    return out
+
+
+def score_walk(f, p, windows):
+    walking, momentum = replay_walk(f, p)
+    label = f['walk']
+    out = []
+    for mask, runs in _windowed(f, label.astype(np.int64), windows):
+        sums = {
+            'walk_acc': ((walking == label)[:, mask].sum(axis=1), mask.sum()),
+            'speed_acc': ((1 - np.abs(momentum - label))[:, mask].sum(axis=1), mask.sum()),
+            'start_ms': [], 'stop_ms': [],
+        }
+        for a, b, value in runs:
+            if value:
+                sums['start_ms'].append(_latency(f, walking, a, b))
+            elif a > f['calibrated_at'] and label[a - 1]:
+                sums['stop_ms'].append(_latency(f, momentum < STOP_MOMENTUM, a, b))
+        out.append(sums)
+    return out
+
+
+def score_turn(f, p, windows):
+    turn = replay_turn(f, p)
+    label = f['turn']
+    out = []
+    for mask, runs in _windowed(f, label, windows):
+        sums = {'turn_acc': ((turn == label)[:, mask].sum(axis=1), mask.sum()), 'turn_ms': []}
+        for a, b, value in runs:
+            if value:
+                sums['turn_ms'].append(_latency(f, turn == value, a, b))
+        out.append(sums)
+    return out
+
+
+def score_answer(f, p, windows):
+    fired = replay_answer(f, p)
+    out = []
+    for (lo, hi), (_, runs) in zip(windows, _windowed(f, f['answer'], windows)):
+        sums = {'hits': 0, 'raises': 0, 'events': (fired[:, lo:hi] != 0).sum(axis=1), 'answer_ms': []}
+        for a, b, value in runs:
+            if value:
+                sums['raises'] += 1
+                sums['hits'] = sums['hits'] + (fired[:, a:b] == value).any(axis=1)
+                sums['answer_ms'].append(_latency(f, fired == value, a, b))
+        out.append(sums)
+    return out
+
+
+SCORERS = {'walk': score_walk, 'turn': score_turn, 'answer': score_answer}
+
+
+def finalize(group, per_recording, latency_weight):
+    """Combines per-recording sums into {metric: (C,) array}, including 'score'."""
+    def ratio(key):
+        num = sum(s[key][0] for s in per_recording)
+        den = sum(s[key][1] for s in per_recording)
+        return num / den if den else None
+
+    def mean_ms(key):
+        values = [v for s in per_recording for v in s[key]]
+        return np.mean(values, axis=0) * 1000 if values else None
+
+    if group == 'walk':
+        m = {'walk_acc': ratio('walk_acc'), 'speed_acc': ratio('speed_acc'),
+             'start_ms': mean_ms('start_ms'), 'stop_ms': mean_ms('stop_ms')}
+        accuracy = [m['walk_acc'], m['speed_acc']]
+        latency = [m['start_ms'], m['stop_ms']]
+    elif group == 'turn':
+        m = {'turn_acc': ratio('turn_acc'), 'turn_ms': mean_ms('turn_ms')}
+        accuracy, latency = [m['turn_acc']], [m['turn_ms']]
+    else:
+        raises = sum(s['raises'] for s in per_recording)
+        hits = sum(s['hits'] for s in per_recording)
+        events = sum(s['events'] for s in per_recording)
+        if raises:
+            precision = np.where(events > 0, hits / np.maximum(events, 1), 0.0)
+            recall = hits / raises
+            m = {'answer_f1': np.where(precision + recall > 0,
+                                       2 * precision * recall / np.maximum(precision + recall, 1e-9), 0.0)}
+        else:
+            m = {'answer_f1': None}
+        m['answer_ms'] = mean_ms('answer_ms')
+        accuracy, latency = [m['answer_f1']], [m['answer_ms']]
+
+    accuracy = [a for a in accuracy if a is not None]
+    latency = [x for x in latency if x is not None]
+    if not accuracy:
+        return None   # nothing in the recordings exercises this group
+    m['score'] = np.mean(accuracy, axis=0) - latency_weight * (np.mean(latency, axis=0) / 1000 if latency else 0)
+    return m
+
+
+# ─── Process pool ─────────────────────────────────────────────────────────────
+_features = None
+
+
+def _init_worker(features):
+    global _features
+    _features = features
+
+
+def evaluate(group, params, units):
+    """Scores one candidate batch ({name: (C,) array}) on each (recording, lo, hi) unit."""
+    out = []
+    for r, f in enumerate(_features):
+        windows = [(lo, hi) for rr, lo, hi in units if rr == r]
+        if windows:
+            out.extend(SCORERS[group](f, params, windows))
+    return out
+
+
+def split_units(features, folds):
+    """
+    Hold-out units: one per recording, or — with a single recording — `folds`
+    contiguous time chunks of its calibrated part.
+    """
+    if len(features) > 1:
+        return [(r, 0, len(f['t'])) for r, f in enumerate(features)]
+    n, start = len(features[0]['t']), features[0]['calibrated_at']
+    edges = np.linspace(start, n, folds + 1).round().astype(int).tolist()
+    edges[0] = 0
+    return [(0, lo, hi) for lo, hi in zip(edges, edges[1:]) if lo < hi]
+
+
+# ─── Search ───────────────────────────────────────────────────────────────────
+def parse_range(text):
+    """'NAME=lo:hi' → (NAME, (lo, hi))."""
+    name, _, spec = text.partition('=')
+    name = name.strip()
+    if name not in SCHEMA or not any(name in names for names in SPACE.values()):
+        tunable = ', '.join(n for names in SPACE.values() for n in names)
+        raise ValueError(f"{name} is not tunable here (one of: {tunable})")
+    lo, _, hi = spec.partition(':')
+    return name, (float(lo), float(hi))
+
+
+def sample(space, search, points, samples, rng):
+    """{name: (low, high)} → {name: (C,) array} of candidates."""
+    names = list(space)
+    axes = []
+    for name in names:
+        kind, lo_bound, hi_bound = SCHEMA[name]
+        lo, hi = space[name]
+        if search == 'grid':
+            axis = np.linspace(lo, hi, points)
+        else:
+            axis = rng.uniform(lo, hi, samples)
+        if kind is int:
+            axis = np.round(axis)
+        axes.append(axis)
+    if search == 'grid':
+        axes = [a.ravel() for a in np.meshgrid(*(np.unique(a) for a in axes), indexing='ij')]
+    return dict(zip(names, axes))
+
+
+def keep_valid(candidates, base):
+    """Drops candidates runtime_config.validate() would reject (ordering, bounds)."""
+    names = list(candidates)
+    keep = []
+    for i in range(len(candidates[names[0]])):
+        try:
+            validate({**base, **{n: candidates[n][i].item() for n in names}})
+            keep.append(i)
+        except ConfigError:
+            pass
+    return {n: candidates[n][keep] for n in names}
+
+
+def zoom(space, best):
+    """Halves each range around the best value, staying inside the original range."""
+    out = {}
+    for name, (lo, hi) in space.items():
+        half = (hi - lo) / 4
+        center = min(hi - half, max(lo + half, best[name]))
+        out[name] = (center - half, center + half)
+    return out
+
+
+def with_fixed(group, candidates, base):
+    """Fills the group's other parameters with their current values."""
+    size = len(next(iter(candidates.values())))
+    params = {name: np.full(size, float(base[name])) for name in (*FIXED[group], *SPACE[group])}
+    params.update(candidates)
+    return params
+
+
+def run_group(pool, group, space, base, args, rng, units):
+    """Returns (baseline metrics, best metrics, best {name: value}, candidates tried) on `units`."""
+    baseline = with_fixed(group, {n: np.array([base[n]]) for n in SPACE[group]}, base)
+    baseline_m = finalize(group, pool.apply(evaluate, (group, baseline, units)), args.latency_weight)
+    if baseline_m is None:
+        return None
+
+    best_m, best, tried = baseline_m, {n: base[n] for n in SPACE[group]}, 0
+    for _ in range(args.refine + 1):
+        candidates = keep_valid(sample(space, args.search, args.points, args.samples, rng), base)
+        size = len(next(iter(candidates.values())))
+        if not size:
+            break
+        tried += size
+        chunk = max(16, -(-size // (args.procs * 4)))
+        batches = [with_fixed(group, {n: a[i:i + chunk] for n, a in candidates.items()}, base)
+                   for i in range(0, size, chunk)]
+        results = pool.starmap(evaluate, [(group, b, units) for b in batches])
+        for batch, per_recording in zip(batches, results):
+            m = finalize(group, per_recording, args.latency_weight)
+            i = int(np.argmax(m['score']))
+            if m['score'][i] > best_m['score'][0]:
+                best_m = {k: None if v is None else np.atleast_1d(v)[i:i + 1] for k, v in m.items()}
+                best = {n: SCHEMA[n][0](batch[n][i].item()) for n in candidates}
+        space = zoom(space, {**{n: base[n] for n in space}, **best})
+    return baseline_m, best_m, best, tried
+
+
+def held_out(pool, group, base, args, units):
+    """
+    Tunes on all units but one and scores current vs tuned on the one left
+    out, for each unit in turn → (mean current score, mean tuned score, folds
+    used), or None when no fold has labels for this group on both sides.
+    """
+    scores = []
+    for k, unit in enumerate(units):
+        fit = units[:k] + units[k + 1:]
+        result = run_group(pool, group, dict(SPACE[group]), base, args,
+                           np.random.default_rng(args.seed + k + 1), fit)
+        if result is None:
+            continue
+        best = result[2]
+        pair = with_fixed(group, {n: np.array([base[n], best[n]], dtype=float) for n in SPACE[group]}, base)
+        m = finalize(group, pool.apply(evaluate, (group, pair, [unit])), args.latency_weight)
+        if m is not None:
+            scores.append(m['score'])
+    if not scores:
+        return None
+    current, tuned = np.mean(scores, axis=0)
+    return float(current), float(tuned), len(scores)
+
+
+def on_bounds(best, space, base):
+    """Tuned parameters (changed from `base`) whose winner sits on a search-range bound."""
+    hits = []
+    for name, value in best.items():
+        lo, hi = space[name]
+        if SCHEMA[name][0] is int:
+            lo, hi = round(lo), round(hi)
+        tol = 1e-3 * (hi - lo)
+        if value != base[name] and (abs(value - lo) <= tol or abs(value - hi) <= tol):
+            hits.append((name, value, lo if abs(value - lo) <= tol else hi))
+    return hits
+
+
+# ─── Verification against the real tracker ────────────────────────────────────
+def verify(recordings, features, base):
+    """Replays the current config through PlayerTracker and compares frame by frame."""
+    import motion_logic.calibration as calibration
+    from motion_logic.tracker import PlayerTracker
+
+    saved = calibration.CALIB_BACKGROUND_FRAMES
+    calibration.CALIB_BACKGROUND_FRAMES = 0   # the replay leaves background refinement out
+    params = {}
+    for group in SPACE:
+        params.update(with_fixed(group, {n: np.array([base[n]]) for n in SPACE[group]}, base))
+    problems = []
+    try:
+        for recording, f in zip(recordings, features):
+            tracker = PlayerTracker()
+            walking, momentum = replay_walk(f, params)
+            turn = replay_turn(f, params)
+            fired = replay_answer(f, params)
+            codes = {'LEFT': -1, 'CENTER': 0, 'RIGHT': 1}
+            for i, (t, landmarks) in enumerate(zip(f['t'], poses(recording))):
+                telemetry = tracker.update(landmarks, t)
+                answer = tracker.answer_recognizer.update(telemetry, t)
+                expected = (telemetry['status'] == 'WALKING', telemetry['momentum'],
+                            codes[telemetry['turn']], {None: 0, 'A': 1, 'B': 2}[answer and answer['choice']])
+                got = (bool(walking[0, i]), round(float(momentum[0, i]), 2), int(turn[0, i]), int(fired[0, i]))
+                if expected != got:
+                    problems.append(f"{f['name']} frame {i} (t={t:.2f}s): tracker {expected}, replay {got}")
+                    break
+    finally:
+        calibration.CALIB_BACKGROUND_FRAMES = saved
+    return problems
+
+
+# ─── Report ───────────────────────────────────────────────────────────────────
+def _fmt(value):
+    if value is None:
+        return '—'
+    value = float(np.atleast_1d(value)[0])
+    return f"{value:.0f}" if abs(value) >= 100 else f"{value:.3f}"
+
+
+def report(results, best_config, args, elapsed, tried):
+    print(f"\n{'metric':<14}{'current':>10}{'best':>10}")
+    for group, (baseline_m, best_m, best, _) in results.items():
+        print(f"── {group} " + '─' * 20)
+        for key in baseline_m:
+            print(f"  {key:<12}{_fmt(baseline_m[key]):>10}{_fmt(best_m[key]):>10}")
+        for name in best:
+            print(f"  {name} = {best_config[name]}")
+    print(f"\n{tried} candidates in {elapsed:.1f}s on {args.procs} processes "
+          f"(latency weight {args.latency_weight}/s)")
+    print("\nconfig.json:")
+    print(json.dumps(best_config, indent=2, sort_keys=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep motion thresholds over labelled recordings')
+    parser.add_argument('recordings', nargs='+', help='.npz files from tools/record_motion.py')
+    parser.add_argument('--groups', default=','.join(SPACE), help='comma list of ' + ', '.join(SPACE))
+    parser.add_argument('--search', choices=('grid', 'random'), default='grid')
+    parser.add_argument('--points', type=int, default=4, help='grid points per parameter')
+    parser.add_argument('--samples', type=int, default=2000, help='random candidates per group and round')
+    parser.add_argument('--refine', type=int, default=2, help='zoom-in rounds around the best candidate')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=LO:HI',
+                        help='override one search range (repeatable)')
+    parser.add_argument('--latency-weight', type=float, default=0.25,
+                        help='score lost per second of mean latency')
+    parser.add_argument('--procs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verify', action='store_true',
+                        help='first check the replay against PlayerTracker on the current config')
+    parser.add_argument('--out', help='also write the best config.json overrides here')
+    parser.add_argument('--folds', type=int, default=3,
+                        help='time chunks held out in turn when given a single recording')
+    parser.add_argument('--apply', action='store_true', help='merge the result into backend/config.json')
+    parser.add_argument('--force', action='store_true',
+                        help='--apply even if a winner sits on a search bound or loses on held-out data')
+    args = parser.parse_args()
+
+    if args.folds < 2:
+        parser.error("--folds must be at least 2")
+    groups = [g.strip() for g in args.groups.split(',') if g.strip()]
+    unknown = [g for g in groups if g not in SPACE]
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(unknown)}")
+    try:
+        for text in args.param:
+            name, bounds = parse_range(text)
+            for group, names in SPACE.items():
+                if name in names:
+                    names[name] = bounds
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Current config (config.py + config.json) applied to the motion modules
+    runtime = RuntimeConfig()
+    try:
+        runtime.load()
+    except ConfigError as e:
+        sys.exit(f"❌ {e}")
+    import motion_logic.answer_gesture, motion_logic.calibration, motion_logic.gesture_detection
+    import motion_logic.landmark_filter, motion_logic.tracker, motion_logic.turning, motion_logic.walking
+    for module in (motion_logic.answer_gesture, motion_logic.calibration, motion_logic.gesture_detection,
+                   motion_logic.landmark_filter, motion_logic.tracker, motion_logic.turning,
+                   motion_logic.walking):
+        runtime.bind(module)
+    base = runtime.values
+
+    try:
+        recordings = [load_recording(path) for path in args.recordings]
+    except (OSError, KeyError, ValueError) as e:
+        sys.exit(f"❌ Could not load recording: {e}")
+    features = [extract_features(r, base) for r in recordings]
+    for f in features:
+        if f['noise'] is None:
+            print(f"⚠️  {f['name']}: calibration never completed — nothing to score")
+
+    if args.verify:
+        problems = verify(recordings, features, base)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit("❌ Replay does not match PlayerTracker — fix tune_motion.py before trusting it")
+        print(f"✅ Replay matches PlayerTracker on {len(recordings)} recording(s)")
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(args.seed)
+    results, holdout = {}, {}
+    tried = 0
+    units = split_units(features, args.folds)
+    with multiprocessing.get_context('spawn').Pool(args.procs, _init_worker, (features,)) as pool:
+        for group in groups:
+            result = run_group(pool, group, dict(SPACE[group]), base, args, rng, units)
+            if result is None:
+                print(f"⚠️  No labelled {group} segments in the recordings — skipped")
+                continue
+            results[group] = result
+            tried += result[3]
+            holdout[group] = held_out(pool, group, base, args, units)
+    elapsed = time.perf_counter() - started
+    if not results:
+        sys.exit("❌ Nothing to tune")
+
+    tuned = {}
+    for _, _, best, _ in results.values():
+        tuned.update({n: round(v, 4) if isinstance(v, float) else int(v) for n, v in best.items()})
+    try:
+        best_config = validate({**runtime.overrides, **tuned})
+    except ConfigError as e:
+        sys.exit(f"❌ Best candidate failed validation: {e}")
+    report(results, best_config, args, elapsed, tried)
+
+    # Held-out check: a config that only fits the data it was tuned on is not applied
+    split = 'leave-one-recording-out' if len(recordings) > 1 else f"{len(units)} time chunks, one held out at a time"
+    print(f"\nHeld-out score ({split}):")
+    warnings = []
+    for group in results:
+        if holdout[group] is None:
+            print(f"  {group:<8} —  no fold has {group} labels on both sides")
+            warnings.append(f"{group}: no held-out evidence")
+            continue
+        current, tuned_score, folds = holdout[group]
+        print(f"  {group:<8} current {current:.3f}  tuned {tuned_score:.3f}  ({folds} folds)")
+        if tuned_score < current:
+            warnings.append(f"{group}: tuned values score worse than the current ones on held-out data")
+    for group, (_, _, best, _) in results.items():
+        for name, value, bound in on_bounds(best, SPACE[group], base):
+            warnings.append(f"{name} = {value} sits on its search bound {bound} — widen it with "
+                            f"--param {name}=LO:HI or record more varied motion")
+    for warning in warnings:
+        print(f"⚠️  {warning}")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(best_config, f, indent=2, sort_keys=True)
+        print(f"\n✅ Written to {args.out}")
+    if args.apply:
+        if warnings and not args.force:
+            sys.exit("❌ Not applied because of the warnings above (--force to apply anyway)")
+        runtime.update(tuned)
+        print(f"\n✅ Merged into {runtime.path} (a running server reloads it)")
+
+
+if __name__ == '__main__':
+    main()
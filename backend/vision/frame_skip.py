@@ -0,0 +1,114 @@
+# =============================================================================
+#  frame_skip.py  —  Run pose inference on a subset of frames
+#
+#  Arm angles and lean change slowly compared with a 30 fps camera, so the
+#  detector does not need to see every frame.  FrameSkipper decides which
+#  ticks run the detector and fills the others with a constant-velocity
+#  extrapolation of the last two inferred poses, keeping telemetry at the
+#  full tick rate.  It works on the per-slot pose list produced by the
+#  PoseTracker (one entry per player, None when unseen).
+#
+#  Modes (FRAME_SKIP_MODE):
+#    'off'      — infer every frame
+#    'fixed'    — infer every FRAME_SKIP_N-th frame
+#    'adaptive' — 1 … FRAME_SKIP_MAX+1 ticks per inference, chosen from the
+#                 motion energy (mean joint speed) of the last two poses
+# =============================================================================
+from vision.landmarks import Landmark
+
+from config import (
+    FRAME_SKIP_MODE, FRAME_SKIP_N, FRAME_SKIP_MAX,
+    MOTION_ENERGY_LOW, MOTION_ENERGY_HIGH,
+)
+
+# Joints whose speed defines "motion energy": nose, shoulders, elbows, wrists
+_ENERGY_JOINTS = (0, 11, 12, 13, 14, 15, 16)
+
+
+class FrameSkipper:
+    """Schedules inference ticks and extrapolates landmarks in between."""
+
+    def __init__(self, mode=FRAME_SKIP_MODE, every=FRAME_SKIP_N, max_skip=FRAME_SKIP_MAX):
+        self.mode = mode
+        self.every = max(1, every)
+        self.max_skip = max(0, max_skip)
+        self.interval = 1          # ticks per inference currently in use
+        self.energy = 0.0          # normalised units / second (max over players)
+        self._last = None          # (t, [landmarks | None per slot]) of the latest inference
+        self._velocity = None      # per slot: per-joint (vx, vy, vz), or None
+        self._since_infer = 0
+
+    def reset(self):
+        self._last = None
+        self._velocity = None
+        self._since_infer = 0
+        self.interval = 1
+
+    def should_infer(self):
+        if self.mode == 'off' or self._velocity is None:
+            return True
+        return self._since_infer + 1 >= self.interval
+
+    def observe(self, poses, t):
+        """Records the per-slot result of a real inference tick."""
+        self._since_infer = 0
+        if not any(poses):
+            self._last = None
+            self._velocity = None
+            self.interval = 1
+            return
+
+        velocity = None
+        if self._last is not None and t > self._last[0] and len(self._last[1]) == len(poses):
+            t0, prev_poses = self._last
+            dt = t - t0
+            velocity = [
+                [((cur.x - old.x) / dt, (cur.y - old.y) / dt, (cur.z - old.z) / dt)
+                 for cur, old in zip(pose, prev)]
+                if pose and prev else None
+                for pose, prev in zip(poses, prev_poses)
+            ]
+            energies = [
+                sum((v[i][0] ** 2 + v[i][1] ** 2) ** 0.5 for i in _ENERGY_JOINTS) / len(_ENERGY_JOINTS)
+                for v in velocity if v is not None
+            ]
+            # A player seen for the first time is held still until the next inference
+            velocity = [
+                v if v is not None else ([(0.0, 0.0, 0.0)] * len(pose) if pose else None)
+                for v, pose in zip(velocity, poses)
+            ]
+            if energies:
+                self.energy = max(energies)
+            else:
+                velocity = None
+        self._velocity = velocity
+        self._last = (t, poses)
+        self.interval = self._pick_interval() if velocity is not None else 1
+
+    def predict(self, t):
+        """Extrapolates the last inferred poses to time t (None per untracked slot)."""
+        self._since_infer += 1
+        if self._last is None or self._velocity is None:
+            return None
+        t0, base_poses = self._last
+        dt = t - t0
+        return [
+            [Landmark(lm.x + vx * dt, lm.y + vy * dt, lm.z + vz * dt,
+                      lm.visibility, lm.presence)
+             for lm, (vx, vy, vz) in zip(base, vel)]
+            if vel is not None else None
+            for base, vel in zip(base_poses, self._velocity)
+        ]
+
+    def _pick_interval(self):
+        if self.mode == 'fixed':
+            return self.every
+        if self.mode != 'adaptive':
+            return 1
+        if self.energy >= MOTION_ENERGY_HIGH:
+            return 1
+        if self.energy <= MOTION_ENERGY_LOW:
+            return self.max_skip + 1
+        # Linear blend between the two energy limits
+        frac = (MOTION_ENERGY_HIGH - self.energy) / (MOTION_ENERGY_HIGH - MOTION_ENERGY_LOW)
+        return 1 + int(round(frac * self.max_skip))
@@ -0,0 +1,61 @@
+# =============================================================================
+#  landmarks.py  —  Lightweight landmark container + landmark-space transforms
+#
+#  MediaPipe returns its own NormalizedLandmark objects.  Pipeline stages that
+#  rewrite coordinates (mirroring, ROI mapping, interpolation) produce these
+#  slot-based copies instead — gesture_detection only reads .x / .y so both
+#  types are interchangeable downstream.
+# =============================================================================
+
+
+class Landmark:
+    """Minimal stand-in for mediapipe's NormalizedLandmark."""
+    __slots__ = ('x', 'y', 'z', 'visibility', 'presence')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, visibility=1.0, presence=1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+        self.presence = presence
+
+    def __repr__(self):
+        return f"Landmark(x={self.x:.3f}, y={self.y:.3f}, z={self.z:.3f}, vis={self.visibility:.2f})"
+
+
+NUM_LANDMARKS = 33
+
+# Index permutation that swaps every LEFT joint with its RIGHT counterpart.
+# Mirroring the image makes MediaPipe label the player's right arm as "left",
+# so mirroring in landmark space must swap the pairs as well as flip X.
+#   0 nose | 1-3 ↔ 4-6 eyes | 7 ↔ 8 ears | 9 ↔ 10 mouth | 11..32 body pairs
+MIRROR_INDEX = [0, 4, 5, 6, 1, 2, 3, 8, 7, 10, 9] + [
+    i + 1 if i % 2 == 1 else i - 1 for i in range(11, NUM_LANDMARKS)
+]
+
+
+def _value(v, default):
+    return default if v is None else v
+
+
+def copy_landmark(lm):
+    """Returns a Landmark copy of any object exposing x / y / z (+ optional scores)."""
+    return Landmark(
+        lm.x, lm.y, _value(lm.z, 0.0),
+        _value(getattr(lm, 'visibility', None), 1.0),
+        _value(getattr(lm, 'presence', None), 1.0),
+    )
+
+
+def mirror_landmarks(landmarks):
+    """
+    Horizontally mirrors a 33-joint pose: x → 1 - x and LEFT/RIGHT swapped.
+    Equivalent to running the detector on cv2.flip(frame, 1), without
+    touching a single pixel.
+    """
+    out = []
+    for src in MIRROR_INDEX:
+        lm = copy_landmark(landmarks[src])
+        lm.x = 1.0 - lm.x
+        out.append(lm)
+    return out
@@ -0,0 +1,130 @@
+# =============================================================================
+#  model_tiers.py  —  Pose model tiers + automatic downgrade under load
+#
+#  MediaPipe ships three pose models (lite / full / heavy).  PoseModelPool
+#  loads whichever .task files exist and TierController walks a quality
+#  "ladder" of (model, input size) rungs based on measured inference time:
+#
+#      heavy@256 → full@256 → lite@256 → lite@192 → lite@160
+#      (expensive)                                  (cheapest)
+#
+#  The input-size rungs only exist with ROI_ENABLED: without the crop the
+#  detector always sees the full frame, so the ladder is just the models.
+#  Every model on the ladder is loaded up front (PoseModelPool.preload), so a
+#  switch never builds a detector on the frame path.
+#
+#  Mean latency over the window above INFERENCE_BUDGET_MS steps one rung
+#  down; below budget × TIER_HEADROOM_RATIO steps one rung back up, never
+#  past the configured POSE_MODEL_TIER.
+# =============================================================================
+import os
+import time
+
+from config import (
+    POSE_MODEL_FILES, POSE_MODEL_TIER, AUTO_TIER_ENABLED,
+    INFERENCE_BUDGET_MS, TIER_HEADROOM_RATIO,
+    TIER_WINDOW_FRAMES, TIER_SWITCH_COOLDOWN, TIER_INPUT_SIZES,
+    ROI_INFERENCE_SIZE,
+)
+
+TIER_ORDER = ('heavy', 'full', 'lite')   # most → least expensive
+
+
+def build_ladder(available_tiers, max_tier=POSE_MODEL_TIER,
+                 input_sizes=(ROI_INFERENCE_SIZE,) + tuple(TIER_INPUT_SIZES)):
+    """Returns the list of (tier, input_size) rungs, most expensive first."""
+    start = TIER_ORDER.index(max_tier) if max_tier in TIER_ORDER else len(TIER_ORDER) - 1
+    tiers = [t for t in TIER_ORDER[start:] if t in available_tiers]
+    if not tiers:
+        return []
+    ladder = [(t, input_sizes[0]) for t in tiers]
+    ladder += [(tiers[-1], size) for size in input_sizes[1:]]
+    return ladder
+
+
+class TierController:
+    """Chooses a ladder rung from a rolling window of inference latencies."""
+
+    def __init__(self, ladder, budget_ms=INFERENCE_BUDGET_MS,
+                 headroom=TIER_HEADROOM_RATIO, window=TIER_WINDOW_FRAMES,
+                 cooldown=TIER_SWITCH_COOLDOWN, enabled=AUTO_TIER_ENABLED):
+        if not ladder:
+            raise ValueError("Tier ladder is empty — no pose models available.")
+        self.ladder = ladder
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.window = window
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self.index = 0
+        self._samples = []
+        self._last_switch = 0.0
+
+    @property
+    def rung(self):
+        return self.ladder[self.index]
+
+    def observe(self, latency_ms, now=None):
+        """
+        Records one inference latency.  Returns a metrics dict describing the
+        switch when the rung changes, otherwise None.
+        """
+        if not self.enabled:
+            return None
+        self._samples.append(latency_ms)
+        if len(self._samples) < self.window:
+            return None
+
+        samples = sorted(self._samples)
+        self._samples = []
+        mean = sum(samples) / len(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+        now = time.monotonic() if now is None else now
+        if now - self._last_switch < self.cooldown:
+            return None
+
+        if mean > self.budget_ms and self.index < len(self.ladder) - 1:
+            step = 1
+        elif mean < self.budget_ms * self.headroom and self.index > 0:
+            step = -1
+        else:
+            return None
+
+        old = self.rung
+        self.index += step
+        self._last_switch = now
+        return {
+            'direction': 'down' if step > 0 else 'up',
+            'from': old, 'to': self.rung,
+            'mean_ms': round(mean, 2), 'p95_ms': round(p95, 2),
+            'budget_ms': self.budget_ms,
+        }
+
+
+class PoseModelPool:
+    """Creates and caches one PoseLandmarker per model tier."""
+
+    def __init__(self, models_dir, create_detector, tiers=None):
+        self._create = create_detector
+        self._detectors = {}
+        self._tiers = tiers      # fixed tier list (no .task files needed), e.g. synthetic
+        self.paths = {
+            tier: os.path.join(models_dir or '', fname)
+            for tier, fname in POSE_MODEL_FILES.items()
+        }
+
+    def available_tiers(self):
+        if self._tiers is not None:
+            return list(self._tiers)
+        return [t for t, p in self.paths.items() if os.path.exists(p)]
+
+    def preload(self, tiers):
+        """Creates the detectors for `tiers` now (blocking — startup only)."""
+        for tier in dict.fromkeys(tiers):
+            self.get(tier)
+
+    def get(self, tier):
+        if tier not in self._detectors:
+            self._detectors[tier] = self._create(self.paths[tier])
+        return self._detectors[tier]
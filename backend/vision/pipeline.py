@@ -0,0 +1,227 @@
+# =============================================================================
+#  pipeline.py  —  Camera → pose landmarks pipeline
+#
+#  Owns every heavy dependency (cv2, mediapipe, numpy) so server.py can bind
+#  its socket before any of them are imported.  Startup is split into two
+#  independent blocking steps — load_model() and open_camera() — which the
+#  server runs in parallel on native threads.
+#
+#  Per tick, read() chains the stages added in vision/:
+#      capture + RGB (preprocess) → frame skip → ROI crop → tiered detector
+#      → map back to full frame → mirror → identity tracking / player slots
+#
+#  SyntheticPipeline runs that same chain with vision/synthetic.py's scene as
+#  the camera and its detector in place of MediaPipe (FRAME_SOURCE).
+# =============================================================================
+import logging
+import time
+
+import cv2
+import mediapipe as mp
+
+from vision.preprocess import FramePreprocessor
+from vision.landmarks import mirror_landmarks, copy_landmark
+from vision.roi import RoiTracker
+from vision.model_tiers import PoseModelPool, TierController, build_ladder
+from vision.frame_skip import FrameSkipper
+from vision.pose_tracker import PoseTracker
+from vision.synthetic import SyntheticDetector, SyntheticScene
+
+from config import (
+    CAMERA_INDEX, MIRROR_INPUT, ROI_ENABLED, ROI_INFERENCE_SIZE, FRAME_SKIP_MODE,
+    POSE_MODEL_FILES, POSE_MODEL_TIER, TIER_INPUT_SIZES,
+    PLAYER_MODE, MAX_POSES, DUO_LANE_CENTERS, SYNTHETIC_FPS, SYNTHETIC_SCRIPT,
+)
+
+log = logging.getLogger(__name__)
+
+BaseOptions = mp.tasks.BaseOptions
+PoseLandmarker = mp.tasks.vision.PoseLandmarker
+PoseLandmarkerOptions = mp.tasks.vision.PoseLandmarkerOptions
+VisionRunningMode = mp.tasks.vision.RunningMode
+
+
+# VIDEO mode tracks each pose from the previous frame's landmarks, in the
+# coordinates of the previous *input image*.  With ROI cropping that image
+# moves and rescales every tick (and jumps to the full frame when the player
+# is lost), so the tracker's prior points at the wrong pixels.  MediaPipe has
+# no reset for it short of rebuilding the landmarker (~100 ms, on the frame
+# path), so while cropping run IMAGE mode: the crop already does the job of
+# the tracking prior, and each frame is detected on its own.
+RUNNING_MODE = VisionRunningMode.IMAGE if ROI_ENABLED else VisionRunningMode.VIDEO
+
+
+def create_detector(model_path):
+    options = PoseLandmarkerOptions(
+        base_options=BaseOptions(model_asset_path=model_path),
+        running_mode=RUNNING_MODE,
+        num_poses=MAX_POSES,
+    )
+    return PoseLandmarker.create_from_options(options)
+
+
+class PosePipeline:
+    """
+    Produces per-player (mirrored, full-frame) landmark lists per camera tick.
+
+    detector_factory(model_path) builds one detector per tier (anything with
+    MediaPipe's detect / detect_for_video); `tiers` fixes the available tiers
+    instead of looking for .task files; `clock` stamps every tick.  The
+    defaults are the webcam setup — vision/synthetic.py swaps all three.
+    """
+
+    def __init__(self, models_dir, camera_index=CAMERA_INDEX,
+                 detector_factory=create_detector, tiers=None, clock=time.monotonic):
+        self.models_dir = models_dir
+        self.camera_index = camera_index
+        self.detector_factory = detector_factory
+        self.tiers = tiers
+        self.clock = clock
+        self.cap = None
+        self.preprocessor = None
+        self.detector = None
+        self.model_pool = None
+        self.tier_controller = None
+        self.active_tier = None
+        self.active_input_size = None
+        self.roi_tracker = None
+        self.frame_skipper = FrameSkipper(FRAME_SKIP_MODE)
+        self.pose_tracker = PoseTracker(DUO_LANE_CENTERS if PLAYER_MODE == 'duo' else (0.5,))
+        # Monotonic times of the last read(): (capture started, captured, landmarks ready)
+        self.timing = (0.0, 0.0, 0.0)
+        self._last_timestamp_ms = -1
+
+    # ── Startup steps (blocking — run off the hub) ────────────────────────────
+    def load_model(self):
+        self.model_pool = PoseModelPool(self.models_dir, self.detector_factory, self.tiers)
+        # Smaller input sizes only mean something when the ROI crop is resized
+        sizes = (ROI_INFERENCE_SIZE,) + tuple(TIER_INPUT_SIZES) if ROI_ENABLED else (ROI_INFERENCE_SIZE,)
+        ladder = build_ladder(self.model_pool.available_tiers(), input_sizes=sizes)
+        if not ladder:
+            raise FileNotFoundError(
+                f"No pose model found in {self.models_dir} "
+                f"(expected {POSE_MODEL_FILES[POSE_MODEL_TIER]})"
+            )
+        self.model_pool.preload(tier for tier, _ in ladder)
+        self.tier_controller = TierController(ladder)
+        self.active_tier, self.active_input_size = self.tier_controller.rung
+        self.detector = self.model_pool.get(self.active_tier)
+        if ROI_ENABLED:
+            self.roi_tracker = RoiTracker(self.active_input_size)
+        log.info(f"✅ Pose model: {self.active_tier} @ {self.active_input_size}px "
+                 f"({len(ladder)} rungs: {', '.join(f'{t}@{n}' for t, n in ladder)})")
+
+    def open_camera(self):
+        self.cap = cv2.VideoCapture(self.camera_index)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Camera {self.camera_index} could not be opened")
+        self.preprocessor = FramePreprocessor(self.cap)
+        log.info(f"✅ Camera {self.camera_index} opened")
+
+    @property
+    def frame_bgr(self):
+        """Latest raw (un-mirrored) camera frame — reused buffer, do not keep."""
+        return self.preprocessor.bgr if self.preprocessor else None
+
+    # ── Per-tick ──────────────────────────────────────────────────────────────
+    def read(self):
+        """
+        Returns (ok, players).  ok is False when the camera produced no
+        frame; players has one entry per player slot (1 in 'single' mode,
+        2 in 'duo'), each a landmark list or None when that player is unseen.
+        """
+        infer = self.frame_skipper.should_infer()
+        capture_start = self.clock()
+        ok, rgb_frame = self.preprocessor.read(convert=infer)
+        if not ok:
+            return False, None
+
+        now = self.clock()
+        if infer:
+            detections = self._infer_poses(rgb_frame, now)
+            if MIRROR_INPUT:
+                # Selfie view handled in landmark space instead of cv2.flip
+                detections = [mirror_landmarks(d) for d in detections]
+            players = self.pose_tracker.update(detections)
+            self.frame_skipper.observe(players, now)
+        else:
+            players = self.frame_skipper.predict(now) or [None] * len(self.pose_tracker.slots)
+        self.timing = (capture_start, now, self.clock())
+        return True, players
+
+    def reset_tracking(self):
+        """Forgets ROI, extrapolation and player locks (e.g. when the player changes)."""
+        if self.roi_tracker:
+            self.roi_tracker.reset()
+        self.frame_skipper.reset()
+        self.pose_tracker.reset()
+
+    def _infer_poses(self, rgb_frame, captured):
+        """Runs the detector on one RGB frame; returns every pose in full-frame coordinates."""
+        roi_tracker = self.roi_tracker
+        if roi_tracker:
+            infer_frame, roi = roi_tracker.prepare(rgb_frame)
+        else:
+            infer_frame, roi = rgb_frame, None
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=infer_frame)
+
+        infer_start = time.perf_counter()
+        if RUNNING_MODE == VisionRunningMode.VIDEO:
+            # Strictly increasing timestamps: monotonic capture time, so
+            # wall-clock (NTP) adjustments can never move it backwards
+            timestamp_ms = max(int(captured * 1000), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            detection_result = self.detector.detect_for_video(mp_image, timestamp_ms)
+        else:
+            detection_result = self.detector.detect(mp_image)
+        switch = self.tier_controller.observe((time.perf_counter() - infer_start) * 1000)
+        if switch:
+            self._apply_tier_switch(switch)
+
+        detections = []
+        for pose in detection_result.pose_landmarks or []:
+            if roi_tracker:
+                detections.append(roi_tracker.map_back(pose, roi))
+            else:
+                detections.append([copy_landmark(lm) for lm in pose])
+        if roi_tracker:
+            # The crop follows everyone detected, so a second player stays in view
+            roi_tracker.update([lm for pose in detections for lm in pose] or None)
+        return detections
+
+    def _apply_tier_switch(self, switch):
+        """Swaps the active detector / ROI input size after a TierController decision."""
+        (old_tier, old_size), (new_tier, new_size) = switch['from'], switch['to']
+        if new_tier != self.active_tier:
+            self.detector = self.model_pool.get(new_tier)
+        self.active_tier, self.active_input_size = new_tier, new_size
+        if self.roi_tracker:
+            self.roi_tracker.inference_size = new_size
+        arrow = "⬇️" if switch['direction'] == 'down' else "⬆️"
+        log.info(
+            f"[MODEL] {arrow} {old_tier}@{old_size} → {new_tier}@{new_size} "
+            f"(mean {switch['mean_ms']} ms, p95 {switch['p95_ms']} ms, budget {switch['budget_ms']} ms)",
+            extra={'rate_key': 'tier_switch'},  # a flapping ladder logs a burst, then a summary
+        )
+
+
+class SyntheticPipeline(PosePipeline):
+    """PosePipeline over a SyntheticScene: scripted players instead of webcam + model."""
+
+    def __init__(self, models_dir=None, script=SYNTHETIC_SCRIPT, seed=None, realtime=True, loop=True,
+                 fps=SYNTHETIC_FPS):
+        self.scene = SyntheticScene(script, seed=seed, realtime=realtime, loop=loop, fps=fps)
+        super().__init__(models_dir, camera_index=None,
+                         detector_factory=lambda _path: SyntheticDetector(self.scene, self._crop),
+                         tiers=('lite',), clock=self.scene.clock)
+
+    def _crop(self):
+        # The box prepare() cut this tick: update() only moves it after detection
+        return self.roi_tracker.roi if self.roi_tracker else None
+
+    def open_camera(self):
+        self.cap = self.scene
+        self.preprocessor = FramePreprocessor(self.scene)
+        log.info(f"✅ Synthetic frame source @ {self.scene.fps} fps "
+                 f"({self.scene.generators[0].duration:.0f}s script"
+                 f"{', looped' if self.scene.generators[0].loop else ''}; scripted detector)")
@@ -0,0 +1,147 @@
+# =============================================================================
+#  pose_tracker.py  —  Multi-person identity tracking + player slot locking
+#
+#  With num_poses > 1 MediaPipe returns poses in no particular order, so
+#  "pose_landmarks[0]" can jump to a bystander between frames.  PoseTracker
+#  gives every detection a persistent track id by matching torso boxes
+#  (shoulders + hips) frame to frame — IoU first, centroid distance as the
+#  fallback for fast moves — and then keeps each player slot locked to one
+#  track id for as long as that track survives.
+#
+#  Slots: 1 in PLAYER_MODE 'single', 2 in 'duo'.  A free slot claims the
+#  unassigned track nearest its lane centre (DUO_LANE_CENTERS / 0.5).
+# =============================================================================
+from config import (
+    TRACK_MIN_IOU, TRACK_MAX_DISTANCE, TRACK_MAX_MISSED,
+)
+
+_TORSO = (11, 12, 23, 24)   # shoulders + hips
+
+
+def torso_box(landmarks):
+    xs = [landmarks[i].x for i in _TORSO]
+    ys = [landmarks[i].y for i in _TORSO]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def box_iou(a, b):
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    if inter <= 0.0:
+        return 0.0
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _centroid(box):
+    return (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+
+
+class _Track:
+    __slots__ = ('id', 'box', 'landmarks', 'missed')
+
+    def __init__(self, track_id, landmarks):
+        self.id = track_id
+        self.landmarks = landmarks
+        self.box = torso_box(landmarks)
+        self.missed = 0
+
+
+class PoseTracker:
+    """Assigns persistent ids to detected poses and locks them to player slots."""
+
+    def __init__(self, lane_centers=(0.5,)):
+        self.lane_centers = tuple(lane_centers)
+        self._tracks = []
+        self._next_id = 1
+        self.slots = [None] * len(self.lane_centers)   # locked track id per slot
+
+    def reset(self):
+        self._tracks = []
+        self.slots = [None] * len(self.lane_centers)
+
+    def update(self, detections):
+        """
+        detections: list of landmark lists for this frame.
+        Returns one entry per slot — the locked player's landmarks, or None
+        if that player was not seen this frame.
+        """
+        self._match(detections)
+        self._release_dead_slots()
+        self._fill_free_slots()
+
+        by_id = {t.id: t for t in self._tracks}
+        out = []
+        for track_id in self.slots:
+            track = by_id.get(track_id)
+            out.append(track.landmarks if track is not None and track.missed == 0 else None)
+        return out
+
+    # ── internals ─────────────────────────────────────────────────────────────
+    def _match(self, detections):
+        boxes = [torso_box(d) for d in detections]
+        pairs = []
+        for ti, track in enumerate(self._tracks):
+            for di, box in enumerate(boxes):
+                iou = box_iou(track.box, box)
+                if iou >= TRACK_MIN_IOU:
+                    pairs.append((iou, ti, di))
+        pairs.sort(reverse=True)
+
+        used_t, used_d = set(), set()
+        for _, ti, di in pairs:
+            if ti not in used_t and di not in used_d:
+                used_t.add(ti)
+                used_d.add(di)
+                self._assign(self._tracks[ti], detections[di], boxes[di])
+
+        # Centroid fallback for unmatched tracks (fast lateral moves)
+        for ti, track in enumerate(self._tracks):
+            if ti in used_t:
+                continue
+            tx, ty = _centroid(track.box)
+            best, best_d = None, TRACK_MAX_DISTANCE
+            for di, box in enumerate(boxes):
+                if di in used_d:
+                    continue
+                cx, cy = _centroid(box)
+                d = ((cx - tx) ** 2 + (cy - ty) ** 2) ** 0.5
+                if d <= best_d:
+                    best, best_d = di, d
+            if best is not None:
+                used_t.add(ti)
+                used_d.add(best)
+                self._assign(track, detections[best], boxes[best])
+            else:
+                track.missed += 1
+
+        for di, det in enumerate(detections):
+            if di not in used_d:
+                self._tracks.append(_Track(self._next_id, det))
+                self._next_id += 1
+
+        self._tracks = [t for t in self._tracks if t.missed <= TRACK_MAX_MISSED]
+
+    @staticmethod
+    def _assign(track, landmarks, box):
+        track.landmarks = landmarks
+        track.box = box
+        track.missed = 0
+
+    def _release_dead_slots(self):
+        alive = {t.id for t in self._tracks}
+        self.slots = [tid if tid in alive else None for tid in self.slots]
+
+    def _fill_free_slots(self):
+        taken = set(tid for tid in self.slots if tid is not None)
+        for slot, track_id in enumerate(self.slots):
+            if track_id is not None:
+                continue
+            home = self.lane_centers[slot]
+            candidates = [t for t in self._tracks if t.id not in taken and t.missed == 0]
+            if not candidates:
+                continue
+            best = min(candidates, key=lambda t: abs(_centroid(t.box)[0] - home))
+            self.slots[slot] = best.id
+            taken.add(best.id)
@@ -0,0 +1,49 @@
+# =============================================================================
+#  preprocess.py  —  Allocation-free camera frame preprocessing
+#
+#  The naive path (cv2.flip → cv2.cvtColor) allocates two full-size frames
+#  per tick.  FramePreprocessor keeps one BGR capture buffer and one RGB
+#  buffer alive for the lifetime of the camera and writes into them with
+#  OpenCV's dst= arguments.  Mirroring is done afterwards in landmark space
+#  (see landmarks.mirror_landmarks), so no pixels are flipped at all.
+# =============================================================================
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    """Reads camera frames into reused buffers and converts BGR → RGB in place."""
+
+    def __init__(self, cap):
+        self._cap = cap
+        self._bgr = None
+        self._rgb = None
+
+    @property
+    def bgr(self):
+        """Last captured (un-mirrored) BGR frame, or None before the first read."""
+        return self._bgr
+
+    def read(self, convert=True):
+        """
+        Grabs the next frame into the capture buffer and converts it to RGB.
+        Returns (ok, rgb_frame).  rgb_frame is owned by the preprocessor and
+        is overwritten on the next call — copy it if you need to keep it.
+        With convert=False only the capture runs (rgb_frame is None) — used
+        on ticks where inference is skipped.
+        """
+        ok, frame = self._cap.read(self._bgr) if self._bgr is not None else self._cap.read()
+        if not ok or frame is None:
+            return False, None
+
+        # OpenCV re-allocates when the camera changes resolution; re-size
+        # the RGB buffer to match instead of failing on the next cvtColor.
+        if frame is not self._bgr:
+            self._bgr = frame
+        if not convert:
+            return True, None
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty_like(frame)
+
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return True, self._rgb
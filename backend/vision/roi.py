@@ -0,0 +1,111 @@
+# =============================================================================
+#  roi.py  —  Region-of-interest tracking for pose inference
+#
+#  Once a player is found, the next frame only needs the pixels around them.
+#  RoiTracker crops the RGB frame to a padded box around the previous pose
+#  (a zero-copy numpy view), downscales it into a reused buffer at the
+#  inference resolution, and maps the detector's normalised landmarks back
+#  into full-frame coordinates so telemetry is unchanged.  When the pose is
+#  lost for ROI_LOST_FRAMES ticks it falls back to the whole frame.
+# =============================================================================
+import cv2
+import numpy as np
+
+from vision.landmarks import Landmark
+
+from config import (
+    ROI_INFERENCE_SIZE, ROI_PADDING, ROI_MIN_FRACTION,
+    ROI_LOST_FRAMES, ROI_MIN_VISIBILITY,
+)
+
+
+class RoiTracker:
+    """Crops + downscales frames around the last known pose."""
+
+    def __init__(self, inference_size=ROI_INFERENCE_SIZE):
+        self.inference_size = inference_size
+        self._roi = None          # (x0, y0, w, h) in full-frame pixels, None = full frame
+        self._lost = 0
+        self._buffer = None       # reused resize target
+        self._frame_shape = None
+
+    @property
+    def roi(self):
+        return self._roi
+
+    def reset(self):
+        self._roi = None
+        self._lost = 0
+
+    def prepare(self, rgb):
+        """
+        Returns (inference_image, roi) for this frame.  roi is the crop box
+        that map_back() needs; inference_image is C-contiguous and owned by
+        the tracker (overwritten on the next call).
+        """
+        h, w = rgb.shape[:2]
+        self._frame_shape = (h, w)
+        roi = self._roi if self._roi is not None else (0, 0, w, h)
+        x0, y0, rw, rh = roi
+        crop = rgb[y0:y0 + rh, x0:x0 + rw]
+
+        scale = self.inference_size / max(rw, rh)
+        if scale >= 1.0:
+            # Already small enough — just make the view contiguous for MediaPipe.
+            return np.ascontiguousarray(crop), roi
+
+        out_w = max(1, int(round(rw * scale)))
+        out_h = max(1, int(round(rh * scale)))
+        if self._buffer is None or self._buffer.shape[:2] != (out_h, out_w):
+            self._buffer = np.empty((out_h, out_w, rgb.shape[2]), dtype=rgb.dtype)
+        cv2.resize(crop, (out_w, out_h), dst=self._buffer, interpolation=cv2.INTER_AREA)
+        return self._buffer, roi
+
+    def map_back(self, landmarks, roi):
+        """Converts crop-normalised landmarks into full-frame normalised landmarks."""
+        fh, fw = self._frame_shape
+        x0, y0, rw, rh = roi
+        sx, sy = rw / fw, rh / fh
+        ox, oy = x0 / fw, y0 / fh
+        return [
+            Landmark(
+                ox + lm.x * sx,
+                oy + lm.y * sy,
+                (lm.z or 0.0) * sx,
+                1.0 if lm.visibility is None else lm.visibility,
+                1.0 if lm.presence is None else lm.presence,
+            )
+            for lm in landmarks
+        ]
+
+    def update(self, landmarks):
+        """
+        Feeds back the full-frame landmarks of this tick (or None if no pose
+        was found) to position next frame's crop.
+        """
+        if landmarks is None or self._frame_shape is None:
+            self._lost += 1
+            if self._lost >= ROI_LOST_FRAMES:
+                self._roi = None
+            return
+
+        xs = [lm.x for lm in landmarks if lm.visibility >= ROI_MIN_VISIBILITY]
+        ys = [lm.y for lm in landmarks if lm.visibility >= ROI_MIN_VISIBILITY]
+        if len(xs) < 2:
+            self.update(None)
+            return
+        self._lost = 0
+
+        fh, fw = self._frame_shape
+        min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+        pad_x = max((max_x - min_x) * ROI_PADDING, ROI_MIN_FRACTION / 2)
+        pad_y = max((max_y - min_y) * ROI_PADDING, ROI_MIN_FRACTION / 2)
+
+        x0 = int(max(0.0, min_x - pad_x) * fw)
+        x1 = int(min(1.0, max_x + pad_x) * fw)
+        y0 = int(max(0.0, min_y - pad_y) * fh)
+        y1 = int(min(1.0, max_y + pad_y) * fh)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            self._roi = None
+            return
+        self._roi = (x0, y0, x1 - x0, y1 - y0)
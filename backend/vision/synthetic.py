@@ -0,0 +1,314 @@
+# =============================================================================
+#  synthetic.py  —  Scripted pose generator + synthetic camera / detector
+#
+#  PoseGenerator produces 33-joint landmark lists (MediaPipe layout, camera
+#  space, i.e. what the detector would return) for a scripted sequence
+#  of motions:
+#
+#      idle:3, walk:6@120, lean_left:2, raise_right:1.5, occlude:1@left_arm
+#
+#  Each segment is  motion:seconds[@arg].  Motions (see MOTIONS):
+#      idle                  stand still (per-joint Gaussian jitter only)
+#      walk[@steps_per_min]  jog in place — shoulders bob once per step
+#      lean_left / lean_right[@dx]   upper body shifted sideways by dx
+#      raise_left / raise_right      one arm straight up
+#      occlude[@part]        part = player (no detection), left_arm,
+#                            right_arm, arms or legs (low visibility)
+#  Sides are the player's own, as MediaPipe labels them; with MIRROR_INPUT
+#  the pipeline mirrors afterwards exactly as it does camera detections.
+#  Transitions ramp over RAMP seconds so nothing teleports.
+#
+#  FRAME_SOURCE = 'synthetic' makes the server build a SyntheticPipeline
+#  (vision/pipeline.py): a regular PosePipeline whose webcam and detector are
+#  a SyntheticScene — SYNTHETIC_SCRIPT, looped, paced to SYNTHETIC_FPS — so
+#  ROI cropping, frame skipping, tiers and identity tracking all run as they
+#  do on camera frames.  SyntheticDetector reports each player only if their
+#  torso is inside the crop it is handed, in that crop's coordinates, like
+#  MediaPipe would.  tools/simulate_motion.py runs the same pipeline in
+#  virtual time (realtime=False), far faster than real time.
+# =============================================================================
+import itertools
+import logging
+import math
+import random
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from vision.landmarks import Landmark, NUM_LANDMARKS
+from config import (
+    MIRROR_INPUT, PLAYER_MODE, DUO_LANE_CENTERS, MAX_POSES,
+    SYNTHETIC_FPS, SYNTHETIC_SCRIPT,
+)
+
+log = logging.getLogger(__name__)
+
+FRAME_SIZE = (480, 640)  # (height, width) of the generated BGR frame
+JITTER = 0.001           # σ of per-joint noise (about MediaPipe's standing jitter)
+RAMP = 0.25              # seconds to blend into / out of lean, raise and walk
+WALK_BOB = 0.025         # shoulder bob amplitude while jogging in place
+KNEE_LIFT = 0.06         # knee raise at the top of each step
+OCCLUDED_VISIBILITY = 0.05
+
+# Standing pose in camera (un-mirrored) space for a player centred at x=0.5.
+# MediaPipe LEFT joints are the player's left, i.e. image right (larger x).
+_STANDING = {
+    0: (0.50, 0.22),                                        # nose
+    1: (0.51, 0.20), 2: (0.52, 0.20), 3: (0.53, 0.20),      # left eye inner/eye/outer
+    4: (0.49, 0.20), 5: (0.48, 0.20), 6: (0.47, 0.20),      # right eye
+    7: (0.55, 0.21), 8: (0.45, 0.21),                       # ears
+    9: (0.51, 0.25), 10: (0.49, 0.25),                      # mouth
+    11: (0.58, 0.35), 12: (0.42, 0.35),                     # shoulders
+    13: (0.61, 0.48), 14: (0.39, 0.48),                     # elbows
+    15: (0.62, 0.60), 16: (0.38, 0.60),                     # wrists
+    17: (0.63, 0.63), 18: (0.37, 0.63),                     # pinkies
+    19: (0.62, 0.64), 20: (0.38, 0.64),                     # index fingers
+    21: (0.61, 0.62), 22: (0.39, 0.62),                     # thumbs
+    23: (0.55, 0.62), 24: (0.45, 0.62),                     # hips
+    25: (0.55, 0.78), 26: (0.45, 0.78),                     # knees
+    27: (0.55, 0.93), 28: (0.45, 0.93),                     # ankles
+    29: (0.56, 0.95), 30: (0.44, 0.95),                     # heels
+    31: (0.54, 0.97), 32: (0.46, 0.97),                     # foot index
+}
+# Arm straight up: elbow / wrist / hand joints, per side
+_RAISED = {
+    13: (0.60, 0.24), 15: (0.60, 0.13), 17: (0.61, 0.10), 19: (0.60, 0.09), 21: (0.59, 0.11),
+    14: (0.40, 0.24), 16: (0.40, 0.13), 18: (0.39, 0.10), 20: (0.40, 0.09), 22: (0.41, 0.11),
+}
+_UPPER_BODY = range(0, 23)
+_ARM = {'left': (13, 15, 17, 19, 21), 'right': (14, 16, 18, 20, 22)}
+_PARTS = {
+    'left_arm':  _ARM['left'],
+    'right_arm': _ARM['right'],
+    'arms':      _ARM['left'] + _ARM['right'],
+    'legs':      tuple(range(25, 33)),
+}
+_KNEE = {'left': 25, 'right': 26}
+
+# motion → default @arg
+MOTIONS = {
+    'idle': None,
+    'walk': 120.0,          # steps per minute
+    'lean_left': 0.15,      # dx, normalised
+    'lean_right': 0.15,
+    'raise_left': None,
+    'raise_right': None,
+    'occlude': 'player',
+}
+
+
+def parse_script(text):
+    """'walk:6@120, idle:2' → [('walk', 6.0, 120.0), ('idle', 2.0, None)] (ValueError if malformed)."""
+    segments = []
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        spec, _, arg = part.partition('@')
+        motion, _, seconds = spec.partition(':')
+        motion = motion.strip()
+        if motion not in MOTIONS:
+            raise ValueError(f"Unknown motion {motion!r} (expected one of {', '.join(MOTIONS)})")
+        default = MOTIONS[motion]
+        if not arg:
+            arg = default
+        elif motion == 'occlude':
+            arg = arg.strip()
+            if arg != 'player' and arg not in _PARTS:
+                raise ValueError(f"Unknown occlusion part {arg!r}")
+        else:
+            arg = float(arg)
+        duration = float(seconds or 1.0)
+        if duration <= 0:
+            raise ValueError(f"Segment {part!r} must last > 0 s")
+        segments.append((motion, duration, arg))
+    if not segments:
+        raise ValueError("Empty motion script")
+    return segments
+
+
+class PoseGenerator:
+    """
+    Deterministic (per seed) landmark source for a motion script.
+
+    Sample with non-decreasing t (the walk phase is integrated between
+    calls); frames(fps) does that in virtual time.  pose_at() returns None
+    inside an occlude@player segment, like a frame with no detection.
+    """
+
+    def __init__(self, script, center_x=0.5, jitter=JITTER, seed=None, loop=True):
+        self.segments = parse_script(script) if isinstance(script, str) else list(script)
+        self.center_x = center_x
+        self.jitter = jitter
+        self.loop = loop
+        self.rng = random.Random(seed)
+        self.duration = sum(d for _, d, _ in self.segments)
+        self._walk_phase = 0.0     # integrated step phase, so cadence changes stay smooth
+        self._walk_t = 0.0
+
+    def segment_at(self, t):
+        """(motion, arg, seconds into segment, segment length) at time t; None past the end."""
+        if self.loop:
+            t %= self.duration
+        elif t >= self.duration:
+            return None
+        for motion, duration, arg in self.segments:
+            if t < duration:
+                return motion, arg, t, duration
+            t -= duration
+        return None
+
+    def frames(self, fps=SYNTHETIC_FPS, duration=None):
+        """Yields (t, landmarks | None) every 1/fps s of virtual time."""
+        end = duration if duration is not None else (None if self.loop else self.duration)
+        for i in itertools.count():
+            t = i / fps
+            if end is not None and t >= end:
+                return
+            yield t, self.pose_at(t)
+
+    def pose_at(self, t):
+        current = self.segment_at(t)
+        if current is None:
+            return None
+        motion, arg, into, length = current
+        blend = min(1.0, into / RAMP, (length - into) / RAMP)  # 0 → 1 → 0 across the segment
+
+        if motion == 'occlude' and arg == 'player':
+            return None
+
+        points = [list(_STANDING[i]) for i in range(NUM_LANDMARKS)]
+        visibility = [1.0] * NUM_LANDMARKS
+
+        if motion == 'walk':
+            self._advance_walk(t, arg)
+            bob = WALK_BOB * blend * math.sin(2 * math.pi * self._walk_phase)
+            for i in range(0, 25):  # head, arms and hips ride the bob
+                points[i][1] += bob
+            # Alternate knees: one lift per step
+            side = 'left' if int(self._walk_phase) % 2 == 0 else 'right'
+            lift = KNEE_LIFT * blend * max(0.0, -math.sin(2 * math.pi * self._walk_phase))
+            points[_KNEE[side]][1] -= lift
+        elif motion in ('lean_left', 'lean_right'):
+            # Player's left is image right (camera space)
+            dx = arg * blend * (1 if motion == 'lean_left' else -1)
+            for i in _UPPER_BODY:
+                points[i][0] += dx
+            for i in (23, 24):
+                points[i][0] += dx / 2
+        elif motion in ('raise_left', 'raise_right'):
+            for i in _ARM[motion.split('_')[1]]:
+                sx, sy = _STANDING[i]
+                rx, ry = _RAISED[i]
+                points[i] = [sx + (rx - sx) * blend, sy + (ry - sy) * blend]
+        elif motion == 'occlude':
+            for i in _PARTS[arg]:
+                visibility[i] = OCCLUDED_VISIBILITY
+
+        dx = self.center_x - 0.5
+        gauss = self.rng.gauss
+        return [Landmark(x + dx + gauss(0.0, self.jitter), y + gauss(0.0, self.jitter),
+                         0.0, vis, vis)
+                for (x, y), vis in zip(points, visibility)]
+
+    def _advance_walk(self, t, cadence):
+        # Integrate phase (steps) since the previous sample; restart after a pause
+        dt = t - self._walk_t
+        if not 0.0 < dt < 0.5:
+            dt = 0.0
+        self._walk_phase += dt * cadence / 60.0
+        self._walk_t = t
+
+
+# Same shape as MediaPipe's PoseLandmarkerResult, as far as the pipeline reads it
+DetectionResult = namedtuple('DetectionResult', 'pose_landmarks')
+_TORSO = (11, 12, 23, 24)
+
+
+class SyntheticScene:
+    """
+    What the camera sees: one PoseGenerator per player lane, sampled once per
+    captured frame.  Quacks like cv2.VideoCapture (read / isOpened / release)
+    and holds the camera-space poses of the last frame for SyntheticDetector.
+    """
+
+    def __init__(self, script=SYNTHETIC_SCRIPT, seed=None, realtime=True, loop=True,
+                 fps=SYNTHETIC_FPS):
+        lanes = DUO_LANE_CENTERS if PLAYER_MODE == 'duo' else (0.5,)
+        # Generators work in camera space; lanes are in (mirrored) output space
+        self.generators = [
+            PoseGenerator(script, 1.0 - x if MIRROR_INPUT else x,
+                          seed=None if seed is None else seed + i, loop=loop)
+            for i, x in enumerate(lanes)
+        ]
+        self.fps = fps
+        self.realtime = realtime
+        self.frame_index = 0
+        self.t = 0.0           # script time of the last captured frame
+        self.poses = []        # camera-space pose (or None) per lane at self.t
+        self._next_frame_at = 0.0
+
+    def clock(self):
+        """Pipeline clock: wall time when paced like a camera, else script time."""
+        return time.monotonic() if self.realtime else self.t
+
+    def segment_at(self, t):
+        return self.generators[0].segment_at(t)
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def read(self, frame=None):
+        """cv2.VideoCapture.read(): renders into `frame` when it fits; (False, None) past the end."""
+        t = self.frame_index / self.fps
+        if self.segment_at(t) is None:
+            return False, None
+        if self.realtime:
+            # Pace like a camera: block until the next frame is "captured"
+            now = time.monotonic()
+            if self._next_frame_at > now:
+                time.sleep(self._next_frame_at - now)
+            self._next_frame_at = max(now, self._next_frame_at) + 1.0 / self.fps
+        self.frame_index += 1
+        self.t = t
+        self.poses = [generator.pose_at(t) for generator in self.generators]
+
+        if frame is None or frame.shape != FRAME_SIZE + (3,):
+            frame = np.empty(FRAME_SIZE + (3,), dtype=np.uint8)
+        frame[:] = 32
+        bar = self.frame_index * 8 % FRAME_SIZE[1]
+        frame[:, bar:bar + 16] = 200  # moving bar so every JPEG differs
+        return True, frame
+
+
+class SyntheticDetector:
+    """
+    Stands in for a PoseLandmarker: returns the scene's current poses as the
+    model would see them through `crop()` — the (x0, y0, w, h) pixel box the
+    pipeline fed it, None for the full frame.  Players whose torso centre is
+    outside the crop are not found.
+    """
+
+    def __init__(self, scene, crop=lambda: None):
+        self.scene = scene
+        self.crop = crop
+
+    def detect(self, image):
+        fh, fw = FRAME_SIZE
+        x0, y0, cw, ch = self.crop() or (0, 0, fw, fh)
+        found = []
+        for pose in self.scene.poses:
+            if pose is None:
+                continue
+            cx = sum(pose[i].x for i in _TORSO) / len(_TORSO) * fw
+            cy = sum(pose[i].y for i in _TORSO) / len(_TORSO) * fh
+            if not (x0 <= cx < x0 + cw and y0 <= cy < y0 + ch):
+                continue
+            found.append([Landmark((lm.x * fw - x0) / cw, (lm.y * fh - y0) / ch,
+                                   lm.z * fw / cw, lm.visibility, lm.presence)
+                          for lm in pose])
+        return DetectionResult(found[:MAX_POSES])
+
+    def detect_for_video(self, image, timestamp_ms):
+        return self.detect(image)
@@ -148,6 +148,13 @@ const input = new InputAdapter((data) => {
         }
     }
     if (data.status === "CALIBRATING") _wasCalibrating = true;
+}, (serverStatus) => {
+    // Backend is up but the camera / pose model are still starting
+    if (serverStatus.stage === "READY") return;
+    uiIds.status.textContent = serverStatus.stage === "ERROR"
+        ? "CAMERA ERROR"
+        : "STARTING CAMERA...";
+    uiIds.indicator.className = "disconnected";
 });
 
 // Character
@@ -197,7 +204,7 @@ const holographicTutorial = new HolographicTutorial(
 );
 
 // --- PERSONALIZATION MANAGER ---
-const _sharedSocket = io(CONFIG.SOCKET_URL);
+const _sharedSocket = io(CONFIG.SOCKET_URL, CONFIG.SOCKET_OPTIONS);
 
 const personalizationManager = new PersonalizationManager(
     _sharedSocket,
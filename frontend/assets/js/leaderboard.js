@@ -15,7 +15,7 @@ function escapeHTML(str) {
 }
 
 // Connect to the same socket URL used by the game
-const socket = io(CONFIG.SOCKET_URL);
+const socket = io(CONFIG.SOCKET_URL, CONFIG.SOCKET_OPTIONS);
 
 let refreshInterval;
 
@@ -11,7 +11,13 @@
  *   → emit  : 'request_questions'  { name, classId, topic }
  *   ← listen: 'questions_ready'    Array<{text,optA,optB,answer}>  (10 items)
  *   ← listen: 'questions_error'    { message: string }
+ *   ← listen: 'session_token'      { token, grace }  — kept in sessionStorage
+ *   → emit  : 'resume_session'     { token }  on every (re)connect
+ *   ← listen: 'session_resumed'    { name, classId, topic, questions }
+ *   ← listen: 'session_expired'    {}
  */
+const SESSION_KEY = 'motionlink_session';
+
 export class PersonalizationManager {
 
     /**
@@ -32,6 +38,8 @@ export class PersonalizationManager {
         this._topicInput = document.getElementById('perso-topic');
         this._btn = document.getElementById('perso-init-btn');
         this._status = document.getElementById('perso-status');
+
+        this._started = false;  // set once questions are applied and the game starts
     }
 
     /** Wire up the form and socket listeners. Call once after construction. */
@@ -48,10 +56,38 @@ export class PersonalizationManager {
         this._socket.on('questions_error', (payload) => {
             this._onError(payload?.message || 'Unknown error from server.');
         });
+
+        // ── Session resumption: a reconnect re-attaches the server-side player
+        // entry and question set instead of asking Gemini again.
+        this._socket.on('session_token', ({ token }) => {
+            sessionStorage.setItem(SESSION_KEY, token);
+        });
+
+        this._socket.on('connect', () => this._resume());
+        if (this._socket.connected) this._resume();
+
+        this._socket.on('session_resumed', (session) => {
+            console.log(`[PersonalizationManager] Session resumed for "${session.name}".`);
+            // Mid-game reconnect: nothing to redo.  Page reload: skip the form.
+            if (this._started || !Array.isArray(session.questions)) return;
+            this._nameInput.value = session.name;
+            this._classInput.value = session.classId;
+            this._topicInput.value = session.topic;
+            this._onQuestionsReady(session.questions);
+        });
+
+        this._socket.on('session_expired', () => {
+            sessionStorage.removeItem(SESSION_KEY);
+        });
     }
 
     // ─── Private ─────────────────────────────────────────────────────────────
 
+    _resume() {
+        const token = sessionStorage.getItem(SESSION_KEY);
+        if (token) this._socket.emit('resume_session', { token });
+    }
+
     _handleSubmit() {
         const name = this._nameInput.value.trim();
         const classId = this._classInput.value.trim();
@@ -72,12 +108,14 @@ export class PersonalizationManager {
     }
 
     _onQuestionsReady(questions) {
+        if (this._started) return;
         if (!Array.isArray(questions) || questions.length < 9) {
             this._onError('Received invalid question data (too few questions). Please retry.');
             return;
         }
 
         console.log(`[PersonalizationManager] ✅ Received ${questions.length} questions.`);
+        this._started = true;
 
         // Split 10 questions: first 5 → easy, last 5 → hard
         const half = Math.ceil(questions.length / 2);
@@ -12,10 +12,17 @@ export const CONFIG = {
     // ── Network ───────────────────────────────────────────────────────────────
     // If the game is loaded via file://, fallback to localhost. Otherwise use the actual hostname.
     SOCKET_URL: window.location.protocol === "file:" ? "http://localhost:5000" : window.location.origin,
+    // Websocket straight away: long-polling requests are not sticky when the
+    // backend runs as several workers (python -m cluster.run).
+    SOCKET_OPTIONS: { transports: ["websocket"] },
+    // Reply to telemetry frames the backend marks 'trace' once they are
+    // rendered, so it can measure capture → render latency (backend/latency.py)
+    LATENCY_ECHO: true,
 
     // ── Gesture thresholds ────────────────────────────────────────────────────
     ARM_RAISE_THRESHOLD: 60,   // l_arm / r_arm value above which arm is "raised"
     ARM_COOLDOWN_FRAMES: 20,   // Grace frames after quiz starts before arm triggers
+    ARM_MIN_CONFIDENCE: 0.5,   // l_arm_conf / r_arm_conf below this → raise ignored
 
     // ── Quiz ──────────────────────────────────────────────────────────────────
     QUIZ_TIMER_START: 30,   // Seconds on the countdown clock
@@ -1,20 +1,30 @@
 import { CONFIG } from "./config.js";
 
 export class InputAdapter {
-    constructor(onTelemetry) {
+    constructor(onTelemetry, onServerStatus) {
         this.momentum = 0;
         this.turn = "CENTER";
         this.l_arm = 0;
         this.r_arm = 0;
         this.l_wave = 0;
         this.r_wave = 0;
+        // Per-angle confidence (0-1) from the backend's visibility filter
+        this.l_arm_conf = 1;
+        this.r_arm_conf = 1;
+
+        // Latest debounced quiz answer from the backend recognizer (consumed once)
+        this._pendingAnswer = null;
+
+        // Backend startup stage: STARTING → LOADING → READY (or ERROR)
+        this.serverStage = "STARTING";
 
         // Keyboard shadow values — take priority over socket telemetry while held
         this._keyMomentum = 0;
         this._keyTurn = "CENTER";
 
         console.log(`InputAdapter: Attempting connection to ${CONFIG.SOCKET_URL}...`);
-        const socket = io(CONFIG.SOCKET_URL);
+        const socket = io(CONFIG.SOCKET_URL, CONFIG.SOCKET_OPTIONS);
+        this._socket = socket;
 
         socket.on("connect", () => {
             console.log("✅ InputAdapter: Connected to Server! ID:", socket.id);
@@ -28,6 +38,11 @@ export class InputAdapter {
             console.warn("⚠️ InputAdapter: Disconnected.");
         });
 
+        socket.on("server_status", (data) => {
+            this.serverStage = data.stage;
+            if (onServerStatus) onServerStatus(data);
+        });
+
         socket.on("telemetry", (data) => {
             // Keyboard overrides server telemetry for movement and turn.
             // This prevents socket events with momentum=0 from stopping the
@@ -39,8 +54,25 @@ export class InputAdapter {
             this.r_arm = data.r_arm;
             this.l_wave = data.l_wave;
             this.r_wave = data.r_wave;
+            this.l_arm_conf = data.l_arm_conf ?? 1;
+            this.r_arm_conf = data.r_arm_conf ?? 1;
 
             if (onTelemetry) onTelemetry(data);
+
+            // Latency tracing: echo sampled frames after the next render
+            if (data.trace && CONFIG.LATENCY_ECHO) {
+                const received = performance.now();
+                requestAnimationFrame(() => {
+                    socket.emit("telemetry_echo", {
+                        seq: data.seq,
+                        client_ms: Math.round((performance.now() - received) * 10) / 10,
+                    });
+                });
+            }
+        });
+
+        socket.on("answer_gesture", (data) => {
+            if (data.player === 1) this._pendingAnswer = data;
         });
 
         // KEYBOARD CONTROLS (Dev Mode)
@@ -52,8 +84,8 @@ export class InputAdapter {
             if (key === "q") this.l_wave = 1;
             if (key === "e") this.r_wave = 1;
             // Z/X = dev arm-raise simulation (used to answer quiz: Z→Option A, X→Option B)
-            if (key === "x") this.l_arm = 75;
-            if (key === "z") this.r_arm = 75;
+            if (key === "x") { this.l_arm = 75; this.l_arm_conf = 1; this._pendingAnswer = { choice: "B", confidence: 1 }; }
+            if (key === "z") { this.r_arm = 75; this.r_arm_conf = 1; this._pendingAnswer = { choice: "A", confidence: 1 }; }
 
             if (onTelemetry) onTelemetry(this);
         });
@@ -71,4 +103,17 @@ export class InputAdapter {
             if (onTelemetry) onTelemetry(this);
         });
     }
+
+    // Quiz mode: ask the backend for debounced 'answer_gesture' events
+    setAnswerSubscription(active) {
+        this._pendingAnswer = null;
+        this._socket.emit(active ? "subscribe_answers" : "unsubscribe_answers");
+    }
+
+    // Returns the pending answer gesture (or null) and clears it
+    takeAnswerGesture() {
+        const gesture = this._pendingAnswer;
+        this._pendingAnswer = null;
+        return gesture;
+    }
 }
@@ -97,12 +97,14 @@ export class QuizManager {
         }
 
         this._armCooldown = this._ARM_COOLDOWN_FRAMES;
+        this.input.setAnswerSubscription(true);
 
         // Draw the next question from the no-repeat deck
         this.currentQuestion = this._drawQuestion();
         if (this.currentQuestion === null) {
             // No questions available — reset active so the door can retrigger
             this.active = false;
+            this.input.setAnswerSubscription(false);
             console.warn('[QuizManager] No questions in deck — skipping quiz.');
             return;
         }
@@ -130,19 +132,19 @@ export class QuizManager {
     update() {
         if (!this.active || this.gameManager.gameState !== "AT_DOOR") return;
 
-        // Decrement arm cooldown (grace period after quiz starts / after walking)
+        // Decrement arm cooldown (grace period after quiz starts / after walking).
+        // Gestures completed during the grace period are discarded, not queued.
         if (this._armCooldown > 0) {
             this._armCooldown--;
+            this.input.takeAnswerGesture();
             return;
         }
 
-        const leftRaised = this.input.l_arm > CONFIG.ARM_RAISE_THRESHOLD;
-        const rightRaised = this.input.r_arm > CONFIG.ARM_RAISE_THRESHOLD;
-
-        if (leftRaised) {
-            this._answer("B");
-        } else if (rightRaised) {
-            this._answer("A");
+        // The backend recognizer already applies hysteresis and dwell; low-confidence
+        // gestures (wrist off-screen / occluded) can't answer
+        const gesture = this.input.takeAnswerGesture();
+        if (gesture && gesture.confidence >= CONFIG.ARM_MIN_CONFIDENCE) {
+            this._answer(gesture.choice);
         }
     }
 
@@ -173,6 +175,7 @@ export class QuizManager {
         clearInterval(this.interval);
         this.interval = null;
         this.active = false;
+        this.input.setAnswerSubscription(false);
         this._overlay.classList.add("hidden");
     }
 }